@@ -3,19 +3,30 @@
 """
 AutoGPT Weather Assistant - Tool Calling Example
 Demonstrates: Autonomous agents, command-based tools, experimental features
+
+The agent loop is the shared AutoGPTAgent (framework-comparisons/autogpt_agent.py): all tool
+calls of one model response run concurrently, so "Seattle and Miami" costs two LLM round trips,
+not one pair per city; steps are bounded by max steps and a wall-clock deadline and reported
+with LLM latency, tool latency and tokens. By default the answer is streamed token by token
+(also while the post-tool completion is generated) and time to first token is reported per
+query; --no-stream waits for the complete answer. The conversation history is windowed to a
+token budget (older turns folded into a summary), so a turn costs the same tokens early and
+late in a long session.
 """
 
 from dotenv import load_dotenv
+import argparse
 import os
-import json
+import sys
 
 # AutoGPT setup - note this is a simplified adaptation
 # Full AutoGPT requires more setup; this shows the conceptual approach
-try:
-    from openai import OpenAI
-except ImportError:
-    print("OpenAI package not installed. Install with: pip install openai")
-    exit(1)
+
+# Shared LLM clients, agent loop and stream printer live in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import format_pool_stats
+from autogpt_agent import AutoGPTAgent
+from stream_printer import StreamPrinter
 
 # Load environment variables
 load_dotenv()
@@ -53,98 +64,42 @@ class WeatherCommand:
         return f"Unknown command: {command_name}"
 
     def get_commands_schema(self) -> list:
-        """Get OpenAI function calling schema for commands."""
+        """Get OpenAI tools schema for commands."""
         schemas = []
         for cmd_name, cmd_info in self.commands.items():
             schema = {
-                "name": cmd_name,
-                "description": cmd_info["description"],
-                "parameters": {
-                    "type": "object",
-                    "properties": cmd_info["parameters"],
-                    "required": cmd_info.get("required", [])
+                "type": "function",
+                "function": {
+                    "name": cmd_name,
+                    "description": cmd_info["description"],
+                    "parameters": {
+                        "type": "object",
+                        "properties": cmd_info["parameters"],
+                        "required": cmd_info.get("required", [])
+                    }
                 }
             }
             schemas.append(schema)
         return schemas
 
 
-class SimpleAutoGPTAgent:
+class SimpleAutoGPTAgent(AutoGPTAgent):
     """Simplified AutoGPT-style agent for tool calling."""
 
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
-        self.model = "gpt-3.5-turbo"
-        self.commands = WeatherCommand()
-        self.conversation_history = []
-
-    def chat(self, user_message: str) -> str:
-        """Process a user message with tool calling."""
-        # Add user message to history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
-
-        # System message
-        system_message = {
-            "role": "system",
-            "content": "You are a helpful weather assistant. Use the available commands to answer questions."
-        }
-
-        # Get completion with function calling
-        messages = [system_message] + self.conversation_history
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            functions=self.commands.get_commands_schema(),
-            function_call="auto"
+    def __init__(self, api_key: str, **options):
+        super().__init__(
+            api_key,
+            "You are a helpful weather assistant. Use the available commands to answer questions.",
+            WeatherCommand(),
+            **options
         )
 
-        message = response.choices[0].message
-
-        # Check if function was called
-        if message.function_call:
-            # Execute the function
-            function_name = message.function_call.name
-            function_args = json.loads(message.function_call.arguments)
-
-            print(f"→ Calling {function_name} with {function_args}")
-
-            result = self.commands.execute_command(function_name, **function_args)
-
-            # Add function result to conversation
-            self.conversation_history.append({
-                "role": "function",
-                "name": function_name,
-                "content": result
-            })
-
-            # Get final response
-            final_response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[system_message] + self.conversation_history
-            )
-
-            final_message = final_response.choices[0].message.content
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": final_message
-            })
-
-            return final_message
-        else:
-            # Direct response without function call
-            content = message.content
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": content
-            })
-            return content
-
 
 def main():
+    parser = argparse.ArgumentParser(description="AutoGPT-style weather assistant.")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for the complete answer instead of streaming")
+    args = parser.parse_args()
+
     # Get API key
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -169,8 +124,18 @@ def main():
         print(f"Query: {query}")
         print('='*60)
 
-        response = agent.chat(query)
-        print(f"\nResponse: {response}\n")
+        printer = StreamPrinter()
+        response = agent.chat(query, on_token=None if args.no_stream else printer)
+        if printer.first_token_ms is None:
+            printer(response)  # buffered answer, or a stop message nothing was streamed for
+        elif agent.stop_reason == "deadline":
+            print(f"\n{response}")  # the stream was cut off
+        print("\n")
+        print(printer.report())
+        print("⏱️  Agent steps:")
+        print(agent.step_report())
+
+    print("\n🔌 LLM connection pool:\n" + format_pool_stats())
 
 
 if __name__ == "__main__":
@@ -3,18 +3,25 @@
 """
 CrewAI Weather Assistant - Tool Calling Example
 Demonstrates: Role-based agents, intuitive API, crew coordination
+
+The crew's output is streamed token by token (Crew(stream=True), including the agent's answer
+after the tool calls) and time to first token is reported per query; --no-stream waits for kickoff.
 """
 
+import os
+import sys
+import argparse
 from dotenv import load_dotenv
 from crewai import Agent, Task, Crew, Process, LLM
 from crewai.tools import tool
 
+# Shared helpers live in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from stream_printer import StreamPrinter
+
 # Load environment variables
 load_dotenv()
 
-# Configure LLM (BTW, CrewAI implicitly used OpenAI when OPENAI_API_KEY is set)
-llm = LLM(model="gpt-3.5-turbo")
-
 # Define tools using @tool decorator
 @tool
 def get_weather(city: str) -> str:
@@ -29,6 +36,14 @@ def get_weather(city: str) -> str:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="CrewAI weather assistant.")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for the complete answer instead of streaming")
+    args = parser.parse_args()
+
+    # Configure LLM here, not at import time, so --help and imports skip client setup
+    # (BTW, CrewAI implicitly used OpenAI when OPENAI_API_KEY is set)
+    llm = LLM(model="gpt-3.5-turbo")
+
     # Create weather assistant agent with role and tools
     weather_assistant = Agent(
         role="Weather Assistant",
@@ -65,11 +80,22 @@ def main():
             agents=[weather_assistant],
             tasks=[task],
             process=Process.sequential,
-            verbose=True
+            verbose=args.no_stream,  # verbose logs would interleave with streamed tokens
+            stream=not args.no_stream
         )
 
-        result = crew.kickoff()
-        print(f"\nResponse: {result}\n")
+        printer = StreamPrinter()
+        if args.no_stream:
+            printer(str(crew.kickoff()))
+        else:
+            # kickoff() returns a streaming output: iterate the chunks, then read .result
+            streaming = crew.kickoff()
+            for chunk in streaming:
+                printer(chunk.content)
+            if printer.first_token_ms is None:
+                printer(str(streaming.result))
+        print("\n")
+        print(printer.report())
 
 
 if __name__ == "__main__":
@@ -3,10 +3,15 @@
 """
 Google ADK Weather Assistant - Tool Calling Example
 Demonstrates: Code-first approach, automatic function tools, Gemini integration
+
+The answer is streamed as partial events (StreamingMode.SSE, including the response after the
+tool calls) and time to first token is reported per query; --no-stream keeps only the final event.
 """
 
 import asyncio
+import argparse
 import os
+import sys
 import warnings
 from dotenv import load_dotenv
 
@@ -17,6 +22,7 @@ warnings.filterwarnings('ignore', message='.*non-text parts in the response.*')
 
 try:
     from google.adk.agents import Agent
+    from google.adk.agents.run_config import RunConfig, StreamingMode
     from google.adk.runners import Runner
     from google.adk.sessions import InMemorySessionService
     from google.genai import types
@@ -25,6 +31,10 @@ except ImportError:
     print("Install with: pip install google-adk")
     exit(1)
 
+# Shared helpers live in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from stream_printer import StreamPrinter
+
 # Load environment variables
 load_dotenv()
 
@@ -52,6 +62,10 @@ def get_weather(city: str) -> dict:
 
 
 async def main():
+    parser = argparse.ArgumentParser(description="Google ADK weather assistant.")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for the complete answer instead of streaming")
+    args = parser.parse_args()
+
     # Get API key
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
@@ -85,6 +99,8 @@ async def main():
         session_service=session_service
     )
 
+    run_config = RunConfig(streaming_mode=StreamingMode.NONE if args.no_stream else StreamingMode.SSE)
+
     # Test queries
     test_queries = [
         "What's the weather in San Francisco?",
@@ -105,17 +121,21 @@ async def main():
             parts=[types.Part(text=query)]
         )
 
-        # Run agent and collect response
-        response_text = ""
+        # Run agent: partial events carry text deltas, the final event repeats the whole answer
+        printer = StreamPrinter()
         async for event in runner.run_async(
             user_id="user123",
             session_id=session.id,
-            new_message=content
+            new_message=content,
+            run_config=run_config
         ):
-            if event.is_final_response():
-                response_text = event.content.parts[0].text
+            if event.partial and event.content and event.content.parts:
+                printer("".join(part.text or "" for part in event.content.parts))
+            elif event.is_final_response() and printer.first_token_ms is None:
+                printer(event.content.parts[0].text)
 
-        print(f"\nResponse: {response_text}\n")
+        print("\n")
+        print(printer.report())
 
 
 if __name__ == "__main__":
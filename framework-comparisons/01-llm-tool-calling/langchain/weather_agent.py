@@ -3,17 +3,29 @@
 """
 LangChain/LangGraph Weather Assistant - Tool Calling Example
 Demonstrates: Tool definition with decorators, graph-based agent, minimal code
+
+The answer is streamed token by token (stream_mode="messages", including the completion after
+the tool calls) and time to first token is reported per query; --no-stream uses agent.invoke.
 """
 
 # Suppress transformers deprecation warning BEFORE imports (warning occurs during import)
 import warnings
 warnings.filterwarnings('ignore', message='.*torch.utils._pytree.*')
 
+import os
+import sys
+import argparse
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessageChunk
 from langchain_core.tools import tool
 from langchain.agents import create_agent
 
+# Shared helpers live in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import registry, format_pool_stats
+from stream_printer import StreamPrinter
+
 # Load environment variables
 load_dotenv()
 
@@ -32,8 +44,13 @@ def get_weather(city: str) -> str:
 
 
 def main():
-    # Initialize LLM
-    llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0)
+    parser = argparse.ArgumentParser(description="LangChain/LangGraph weather assistant.")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for the complete answer instead of streaming")
+    args = parser.parse_args()
+
+    # Initialize LLM on the shared pooled HTTP clients (see llm_clients.py)
+    llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0, http_client=registry.http_client(),
+                     http_async_client=registry.async_http_client())
 
     # Combine tools
     tools = [get_weather]
@@ -59,12 +76,20 @@ def main():
         print(f"Query: {query}")
         print('='*60)
 
-        # Invoke agent with messages format
-        result = agent.invoke({"messages": [("human", query)]})
-
-        # Extract the final response from messages
-        final_message = result["messages"][-1]
-        print(f"\nResponse: {final_message.content}\n")
+        printer = StreamPrinter()
+        if args.no_stream:
+            # Invoke agent with messages format and extract the final response from messages
+            result = agent.invoke({"messages": [("human", query)]})
+            printer(result["messages"][-1].content)
+        else:
+            # Model tokens as they are generated (tool results are whole ToolMessages, not chunks)
+            for chunk, _metadata in agent.stream({"messages": [("human", query)]}, stream_mode="messages"):
+                if isinstance(chunk, AIMessageChunk) and isinstance(chunk.content, str):
+                    printer(chunk.content)
+        print("\n")
+        print(printer.report())
+
+    print("\n🔌 LLM connection pool:\n" + format_pool_stats())
 
 
 if __name__ == "__main__":
@@ -3,14 +3,27 @@
 """
 LlamaIndex Weather Assistant - Tool Calling Example
 Demonstrates: Function tools, concise API, minimal boilerplate
+
+The answer is streamed token by token (AgentStream events of the step after the tool calls) and
+time to first token is reported per query; --no-stream only awaits the handler. A FunctionAgent
+calls tools natively, so nothing but the answer streams: a ReActAgent would stream its
+"Thought:/Action:" text as well.
 """
 
+import os
+import sys
 import asyncio
+import argparse
 from dotenv import load_dotenv
-from llama_index.core.agent.workflow import ReActAgent
+from llama_index.core.agent.workflow import FunctionAgent, AgentStream
 from llama_index.core.workflow import Context
 from llama_index.llms.openai import OpenAI
 
+# Shared helpers live in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import registry, format_pool_stats
+from stream_printer import StreamPrinter
+
 # Load environment variables
 load_dotenv()
 
@@ -28,11 +41,16 @@ def get_weather(city: str) -> str:
 
 
 async def main():
-    # Initialize LLM
-    llm = OpenAI(model="gpt-3.5-turbo", temperature=0)
+    parser = argparse.ArgumentParser(description="LlamaIndex weather assistant.")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for the complete answer instead of streaming")
+    args = parser.parse_args()
 
-    # Create ReAct agent with tools (functions are automatically wrapped)
-    agent = ReActAgent(tools=[get_weather], llm=llm, verbose=True)
+    # Initialize LLM on the shared pooled HTTP clients (see llm_clients.py)
+    llm = OpenAI(model="gpt-3.5-turbo", temperature=0, http_client=registry.http_client(),
+                 async_http_client=registry.async_http_client())
+
+    # Create function-calling agent with tools (functions are automatically wrapped)
+    agent = FunctionAgent(tools=[get_weather], llm=llm, verbose=True)
 
     # Create context for session state
     ctx = Context(agent)
@@ -51,10 +69,21 @@ async def main():
         print(f"Query: {query}")
         print('='*60)
 
-        # Run agent and await response
+        # Run agent, stream its tokens, then await the final response
+        printer = StreamPrinter()
         handler = agent.run(query, ctx=ctx)
+        if not args.no_stream:
+            async for event in handler.stream_events():
+                # Deltas of a step that calls tools are not part of the answer
+                if isinstance(event, AgentStream) and not event.tool_calls:
+                    printer(event.delta)
         response = await handler
-        print(f"\nResponse: {response}\n")
+        if printer.first_token_ms is None:
+            printer(str(response))
+        print("\n")
+        print(printer.report())
+
+    print("\n🔌 LLM connection pool:\n" + format_pool_stats())
 
 
 if __name__ == "__main__":
@@ -3,9 +3,14 @@
 """
 Microsoft Agent Framework Weather Assistant - Tool Calling Example
 Demonstrates: Unified API, function tools with type annotations, async agents
+
+The answer is streamed with agent.run_stream (including the completion after the tool calls)
+and time to first token is reported per query; --no-stream uses agent.run.
 """
 
+import sys
 import asyncio
+import argparse
 from typing import Annotated
 from pydantic import Field
 from dotenv import load_dotenv
@@ -19,6 +24,11 @@ except ImportError:
     print("Install with: pip install agent-framework --pre")
     exit(1)
 
+# Shared helpers live in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import async_openai_client, format_pool_stats
+from stream_printer import StreamPrinter
+
 # Load environment variables
 load_dotenv()
 
@@ -38,6 +48,10 @@ def get_weather(
 
 
 async def main():
+    parser = argparse.ArgumentParser(description="Microsoft Agent Framework weather assistant.")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for the complete answer instead of streaming")
+    args = parser.parse_args()
+
     # Get API key
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -47,9 +61,9 @@ async def main():
     # Set API key in environment for OpenAIChatClient
     os.environ["OPENAI_API_KEY"] = api_key
 
-    # Create agent with OpenAI chat client and tools
+    # Create agent with OpenAI chat client (shared pooled AsyncOpenAI, see llm_clients.py) and tools
     agent = ChatAgent(
-        chat_client=OpenAIChatClient(model_id="gpt-3.5-turbo"),
+        chat_client=OpenAIChatClient(model_id="gpt-3.5-turbo", async_client=async_openai_client(api_key)),
         instructions="You are a helpful weather assistant. Use the available tools to answer questions about weather.",
         tools=[get_weather]
     )
@@ -68,8 +82,17 @@ async def main():
         print(f"Query: {query}")
         print('='*60)
 
-        result = await agent.run(query)
-        print(f"\nResponse: {result.text}\n")
+        printer = StreamPrinter()
+        if args.no_stream:
+            result = await agent.run(query)
+            printer(result.text)
+        else:
+            async for update in agent.run_stream(query):
+                printer(update.text)
+        print("\n")
+        print(printer.report())
+
+    print("\n🔌 LLM connection pool:\n" + format_pool_stats())
 
 
 if __name__ == "__main__":
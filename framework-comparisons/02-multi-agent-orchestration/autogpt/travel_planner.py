@@ -3,12 +3,21 @@
 """
 AutoGPT Travel Planner - Multi-Agent Orchestration Example
 Demonstrates: Command-based multi-agent system, autonomous coordination, function calling
+
+Each agent runs the shared AutoGPTAgent loop (framework-comparisons/autogpt_agent.py): LLM
+call, tools (all calls of a response at once), LLM call, ... until the model answers, bounded by
+max steps and a wall-clock deadline, with LLM latency, tool latency and tokens recorded per
+step. Its history is windowed to a token budget, with older turns folded into a running summary.
 """
 
 from dotenv import load_dotenv
 import os
-import json
-from openai import OpenAI
+import sys
+
+# Shared LLM clients and agent loop live in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import format_pool_stats
+from autogpt_agent import AutoGPTAgent
 
 # Load environment variables
 load_dotenv()
@@ -58,86 +67,33 @@ class TravelAgentCommands:
         return f"Unknown command: {command_name}"
 
     def get_commands_schema(self) -> list:
-        """Get OpenAI function calling schema for commands."""
+        """Get OpenAI tools schema for commands."""
         schemas = []
         for cmd_name, cmd_info in self.commands.items():
             schema = {
-                "name": cmd_name,
-                "description": cmd_info["description"],
-                "parameters": {
-                    "type": "object",
-                    "properties": cmd_info["parameters"],
-                    "required": cmd_info.get("required", [])
+                "type": "function",
+                "function": {
+                    "name": cmd_name,
+                    "description": cmd_info["description"],
+                    "parameters": {
+                        "type": "object",
+                        "properties": cmd_info["parameters"],
+                        "required": cmd_info.get("required", [])
+                    }
                 }
             }
             schemas.append(schema)
         return schemas
 
 
-class SimpleAutoGPTAgent:
+class SimpleAutoGPTAgent(AutoGPTAgent):
     """Simplified AutoGPT-style agent for multi-agent orchestration."""
 
-    def __init__(self, api_key: str, role: str, commands: TravelAgentCommands):
-        self.client = OpenAI(api_key=api_key)
-        self.model = "gpt-3.5-turbo"
+    def __init__(self, api_key: str, role: str, commands: TravelAgentCommands, **options):
+        # All agents share one pooled client (keep-alive connections, one TLS handshake)
+        super().__init__(api_key, f"You are a {role}. Use the available commands to answer questions.",
+                         commands, **options)
         self.role = role
-        self.commands = commands
-        self.conversation_history = []
-
-    def chat(self, user_message: str) -> str:
-        """Process a user message with tool calling."""
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
-
-        system_message = {
-            "role": "system",
-            "content": f"You are a {self.role}. Use the available commands to answer questions."
-        }
-
-        messages = [system_message] + self.conversation_history
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            functions=self.commands.get_commands_schema(),
-            function_call="auto"
-        )
-
-        message = response.choices[0].message
-
-        if message.function_call:
-            function_name = message.function_call.name
-            function_args = json.loads(message.function_call.arguments)
-
-            result = self.commands.execute_command(function_name, **function_args)
-
-            self.conversation_history.append({
-                "role": "function",
-                "name": function_name,
-                "content": result
-            })
-
-            final_response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[system_message] + self.conversation_history
-            )
-
-            final_message = final_response.choices[0].message.content
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": final_message
-            })
-
-            return final_message
-        else:
-            content = message.content
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": content
-            })
-            return content
 
 
 def main():
@@ -171,19 +127,23 @@ def main():
     # Execute agents sequentially
     print("\n🔍 Step 1: Research Agent")
     research_output = researcher.chat(f"Research {destination} focusing on {preferences}.")
+    print(researcher.step_report())
 
     print("\n✈️  Step 2: Booking Agent")
     booking_output = booking_agent.chat(f"Check availability for {destination} during {dates}.")
+    print(booking_agent.step_report())
 
     print("\n📅 Step 3: Itinerary Planner")
     itinerary_output = itinerary_planner.chat(
         f"Create a 7-day itinerary for {destination} based on:\n\nResearch: {research_output}\n\nBooking: {booking_output}\n\nFocus on {preferences}."
     )
+    print(itinerary_planner.step_report())
 
     print("\n" + "="*60)
     print("📋 Final Travel Plan:")
     print("="*60)
     print(itinerary_output)
+    print("\n🔌 LLM connection pool:\n" + format_pool_stats())
 
 
 if __name__ == "__main__":
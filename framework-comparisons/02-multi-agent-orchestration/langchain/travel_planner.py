@@ -9,6 +9,8 @@ Demonstrates: StateGraph workflow, multi-agent coordination, shared state manage
 import warnings
 warnings.filterwarnings('ignore', message='.*torch.utils._pytree.*')
 
+import os
+import sys
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
@@ -16,6 +18,10 @@ from langchain.agents import create_agent
 from langgraph.graph import StateGraph, END
 from typing import TypedDict
 
+# Shared LLM client registry lives in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import registry, format_pool_stats
+
 # Load environment variables
 load_dotenv()
 
@@ -45,8 +51,9 @@ class TravelPlanState(TypedDict):
     final_plan: str
 
 def main():
-    # Initialize LLM and agents
-    llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7)
+    # Initialize LLM (on the shared pooled HTTP clients, see llm_clients.py) and agents
+    llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7, http_client=registry.http_client(),
+                     http_async_client=registry.async_http_client())
 
     researcher = create_agent(
         model=llm,
@@ -131,6 +138,7 @@ def main():
     print("📋 Final Travel Plan:")
     print("="*60)
     print(result["final_plan"])
+    print("\n🔌 LLM connection pool:\n" + format_pool_stats())
 
 
 if __name__ == "__main__":
@@ -5,12 +5,18 @@ LlamaIndex Travel Planner - Multi-Agent Orchestration Example
 Demonstrates: Multi-agent sequential workflow with FunctionAgent, context management
 """
 
+import os
+import sys
 import asyncio
 from dotenv import load_dotenv
 from llama_index.core.agent.workflow import FunctionAgent
 from llama_index.core.workflow import Context
 from llama_index.llms.openai import OpenAI
 
+# Shared LLM client registry lives in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import registry, format_pool_stats
+
 # Load environment variables
 load_dotenv()
 
@@ -29,8 +35,9 @@ def check_availability(destination: str, dates: str) -> str:
     return f"Available for {destination} during {dates}: Hotels from $100/night, Flights from $500 roundtrip."
 
 async def main():
-    # Initialize LLM
-    llm = OpenAI(model="gpt-3.5-turbo", temperature=0.7)
+    # Initialize LLM on the shared pooled HTTP clients (see llm_clients.py)
+    llm = OpenAI(model="gpt-3.5-turbo", temperature=0.7, http_client=registry.http_client(),
+                 async_http_client=registry.async_http_client())
 
     # Create specialized FunctionAgents
     research_agent = FunctionAgent(
@@ -96,6 +103,7 @@ async def main():
     print("📋 Final Travel Plan:")
     print("="*60)
     print(str(itinerary_response))
+    print("\n🔌 LLM connection pool:\n" + format_pool_stats())
 
 
 if __name__ == "__main__":
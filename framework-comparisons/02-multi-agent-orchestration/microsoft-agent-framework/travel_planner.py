@@ -10,6 +10,7 @@ from typing import Annotated
 from pydantic import Field
 from dotenv import load_dotenv
 import os
+import sys
 
 try:
     from agent_framework import SequentialBuilder, WorkflowOutputEvent, ChatMessage
@@ -19,6 +20,10 @@ except ImportError:
     print("Install with: pip install agent-framework --pre")
     exit(1)
 
+# Shared LLM client registry lives in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import async_openai_client, format_pool_stats
+
 # Load environment variables
 load_dotenv()
 
@@ -50,8 +55,8 @@ async def main():
 
     os.environ["OPENAI_API_KEY"] = api_key
 
-    # Create chat client
-    chat_client = OpenAIChatClient(model_id="gpt-3.5-turbo")
+    # Create chat client (all agents share one pooled AsyncOpenAI, see llm_clients.py)
+    chat_client = OpenAIChatClient(model_id="gpt-3.5-turbo", async_client=async_openai_client(api_key))
 
     # Create specialized agents for sequential workflow
     researcher = chat_client.as_agent(
@@ -110,6 +115,8 @@ async def main():
                 print(msg.text)
                 break
 
+    print("\n🔌 LLM connection pool:\n" + format_pool_stats())
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,108 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Semantic Answer Cache for the Support Agent
+Reuses a Support Agent answer when a new customer query is a close paraphrase of one answered
+recently: lookup is cosine similarity between query embeddings, above a threshold, and only
+against answers produced from the same index version.
+"""
+
+import os
+import time
+import threading
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.95  # cosine similarity; paraphrases of the same question typically score above
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 3600
+
+
+class SemanticAnswerCache:
+    """Fixed-size matrix of unit query vectors + answers, with LRU eviction and per-entry TTL."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.vectors = None  # allocated on first put, once the embedding dimension is known
+        self.entries = [None] * max_entries  # slot -> (version, expires_at, answer)
+        self.last_used = np.zeros(max_entries, dtype=np.float64)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _unit(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def get(self, query_vector, version: str):
+        """Cached answer for the most similar query of this index version, or None."""
+        with self._lock:
+            if self.vectors is None:
+                self.misses += 1
+                return None
+            now = time.monotonic()
+            similarity = self.vectors @ self._unit(query_vector)
+            for slot, entry in enumerate(self.entries):
+                if entry is None or entry[0] != version:
+                    similarity[slot] = -1.0
+                elif entry[1] < now:
+                    self.entries[slot] = None
+                    self.expirations += 1
+                    similarity[slot] = -1.0
+            slot = int(np.argmax(similarity))
+            if similarity[slot] < self.threshold:
+                self.misses += 1
+                return None
+            self.last_used[slot] = now
+            self.hits += 1
+            return self.entries[slot][2]
+
+    def put(self, query_vector, version: str, answer: str):
+        vector = self._unit(query_vector)
+        with self._lock:
+            if self.vectors is None:
+                self.vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+            free = [slot for slot, entry in enumerate(self.entries) if entry is None]
+            if free:
+                slot = free[0]
+            else:
+                slot = int(np.argmin(self.last_used))
+                self.evictions += 1
+            now = time.monotonic()
+            self.vectors[slot] = vector
+            self.entries[slot] = (version, now + self.ttl, answer)
+            self.last_used[slot] = now
+
+    def __len__(self) -> int:
+        return sum(entry is not None for entry in self.entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "llm_calls_saved": self.hits,
+            "entries": len(self),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def answer_cache_from_env() -> SemanticAnswerCache:
+    """Answer cache with threshold/size/TTL configurable via env."""
+    return SemanticAnswerCache(
+        threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", DEFAULT_THRESHOLD)),
+        max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        ttl_seconds=float(os.getenv("ANSWER_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+    )
+
+
+def format_answer_cache_stats(stats: dict) -> str:
+    return (f"   Support Agent answers: {stats['hit_ratio']:.0%} hit ratio "
+            f"({stats['llm_calls_saved']} LLM calls saved, {stats['misses']} misses, {stats['entries']} entries)")
@@ -6,30 +6,30 @@ Demonstrates: 2-agent system (KB Agent retrieves from vector DB, Support Agent r
 """
 
 import os
+import sys
 import json
+import argparse
 from dotenv import load_dotenv
-from openai import OpenAI
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
+
+# Shared RAG helpers live next to build_index.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from kb_runtime import KBRuntime, Lazy, startup
 
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+def _create_client():
+    with startup.timed("import openai"):
+        from llm_clients import openai_client
+    return openai_client()
 
-# Load pre-built FAISS index
-index_path = os.path.join(os.path.dirname(__file__), "..", "faiss_index")
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-vectorstore = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
-retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
+# OpenAI client and the FAISS index written by build_index.py are created on first use (see kb_runtime.py)
+client = Lazy("llm client (openai)", _create_client)
+kb = KBRuntime(os.path.join(os.path.dirname(__file__), "..", "faiss_index"), k=3)
 
 # Agent 1: KB Agent function (RAG tool)
 def search_product_kb(query: str) -> str:
     """Knowledge Base Agent: Retrieve product info from vector DB."""
-    docs = retriever.invoke(query)
-    context = "\n\n".join([doc.page_content for doc in docs])
-    sources = ", ".join({os.path.basename(doc.metadata.get('source', 'Unknown')) for doc in docs})
-    return f"Sources: {sources}\n\n{context}"
+    return kb.search(query)
 
 # Define function for OpenAI
 kb_function = [{
@@ -48,7 +48,7 @@ def run_support_agent(customer_query: str) -> str:
         {"role": "user", "content": customer_query}
     ]
 
-    response = client.chat.completions.create(model="gpt-3.5-turbo", messages=messages, tools=kb_function, tool_choice="auto")
+    response = client.get().chat.completions.create(model="gpt-3.5-turbo", messages=messages, tools=kb_function, tool_choice="auto")
     response_message = response.choices[0].message
 
     if response_message.tool_calls:
@@ -58,12 +58,19 @@ def run_support_agent(customer_query: str) -> str:
                 result = search_product_kb(query=json.loads(tool_call.function.arguments).get("query"))
                 messages.append({"role": "tool", "tool_call_id": tool_call.id, "name": "search_product_kb", "content": result})
 
-        final_response = client.chat.completions.create(model="gpt-3.5-turbo", messages=messages)
+        final_response = client.get().chat.completions.create(model="gpt-3.5-turbo", messages=messages)
         return final_response.choices[0].message.content
 
     return response_message.content
 
 def main():
+    parser = argparse.ArgumentParser(description="AutoGPT customer support (2-agent RAG)")
+    parser.add_argument("--no-warmup", action="store_true", help="Load the KB index on first search, not in the background")
+    args = parser.parse_args()
+    if not args.no_warmup:
+        kb.warm_up()  # index loads while the LLM client is set up below
+    client.get()
+
     print("📚 AutoGPT Customer Support (2-Agent RAG)\n" + "=" * 60)
 
     queries = [
@@ -74,8 +81,19 @@ def main():
 
     for i, query in enumerate(queries, 1):
         print(f"\n{'='*60}\n🧑 Customer Query {i}: {query}\n{'='*60}")
+
+        # Step 0: Reuse the answer to a near-identical earlier question (same index version)
+        cached, cache_key = kb.cached_answer(query)
+        if cached is not None:
+            print(f"⚡ [Answer Cache] Reusing the answer to a similar question\n💬 Support Agent: {cached}\n")
+            continue
+
         response = run_support_agent(query)
+        kb.store_answer(cache_key, response)
         print(f"💬 Support Agent: {response}\n")
 
+    print(kb.report())
+    print("🚀 Startup time by component:\n" + startup.report())
+
 if __name__ == "__main__":
     main()
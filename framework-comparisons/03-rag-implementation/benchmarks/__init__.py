@@ -0,0 +1,6 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Retrieval Benchmarks for RAG Examples
+Run from 03-rag-implementation, e.g. `python -m benchmarks.index_types`.
+"""
@@ -0,0 +1,136 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Synthetic Product Catalog for Benchmarks
+Deterministic phone spec sheets in the same plain-text format as sample-docs/, generated lazily
+so a catalog of 1M+ chunks never has to sit in memory as text. Each product also yields support
+questions whose answer lives in that product's spec sheet (the relevance ground truth).
+
+Usage (from 03-rag-implementation):
+    python -m benchmarks.catalog --products 1000 --out /tmp/catalog-docs   # spec sheets for build_index.py
+"""
+
+import os
+import random
+import itertools
+import argparse
+from doc_loading import StructureAwareSplitter
+
+BRANDS = ["Zentra", "Novum", "Aurix", "Kestrel", "Lumio", "Veyra", "Orbit", "Pyxis", "Halcyon", "Tessar"]
+SERIES = ["Nova", "Edge", "Prime", "Flux", "Aero", "Core", "Vista", "Pulse"]
+TIERS = ["", " Plus", " Pro", " Ultra", " Lite"]
+PANELS = ["LTPO OLED", "Dynamic AMOLED", "Super Retina XDR", "P-OLED", "IPS LCD"]
+CHIPS = ["Tensor", "Snapdragon", "Dimensity", "Exynos", "Bionic"]
+COLORS = ["Graphite", "Silver", "Obsidian", "Coral", "Sage", "Midnight", "Frost", "Sand"]
+
+QUESTIONS = [
+    "What is the main camera resolution of the {name}?",
+    "How big is the battery on the {name} and how fast does it charge?",
+    "What display does the {name} have?",
+    "Which chip powers the {name}?",
+    "How much does the {name} cost?",
+]
+
+
+def product_name(i: int) -> str:
+    """Unique, stable name of product i."""
+    return f"{BRANDS[i % len(BRANDS)]} {SERIES[(i // len(BRANDS)) % len(SERIES)]} {100 + i}{TIERS[i % len(TIERS)]}"
+
+
+def product_source(i: int) -> str:
+    return f"catalog/{product_name(i).lower().replace(' ', '-')}.txt"
+
+
+def spec_sheet(i: int, seed: int = 0) -> str:
+    """Spec sheet text of product i (same layout as sample-docs/*.txt)."""
+    rng = random.Random(f"{seed}:{i}")
+    name = product_name(i)
+    colors = ", ".join(rng.sample(COLORS, 3))
+    return f"""{name} - Technical Specifications
+
+Overview:
+The {name} is {rng.choice(["a flagship", "an upper mid-range", "a value-focused", "a compact"])} phone from \
+{name.split()[0]}, released in {rng.choice(["spring", "summer", "autumn", "winter"])} {rng.randint(2022, 2025)}. \
+It targets customers who care most about {rng.choice(["photography", "battery life", "gaming", "price", "portability"])}, \
+and ships with {rng.choice([4, 5, 7])} years of OS updates and {rng.choice(["an aluminum", "a titanium", "a glass"])} frame. \
+Support covers a {rng.choice([1, 2])}-year limited warranty with optional extended protection plans.
+
+Display:
+- {rng.choice([6.1, 6.3, 6.5, 6.7, 6.8])}-inch {rng.choice(PANELS)} display
+- {rng.choice(["2556 x 1179", "2992 x 1344", "3120 x 1440", "2400 x 1080"])} resolution at {rng.randint(390, 520)} ppi
+- {rng.choice([60, 90, 120, 144])}Hz refresh rate, {rng.randrange(1200, 3000, 100)} nits peak brightness
+
+Processor:
+- {rng.choice(CHIPS)} {rng.randint(1, 9)} Gen {rng.randint(1, 4)} chip
+- {rng.choice([6, 8, 10])}-core CPU, {rng.choice([8, 12, 16])}GB RAM
+
+Camera:
+- {rng.choice([48, 50, 64, 108, 200])}MP main camera with optical image stabilization
+- {rng.choice([12, 13, 48, 50])}MP ultra-wide, {rng.choice([3, 5, 10])}x optical zoom telephoto
+- {rng.choice([10, 12, 32])}MP front camera, {rng.choice(["4K60", "8K30", "4K120"])} video recording
+
+Battery:
+- {rng.randrange(3800, 6000, 50)}mAh battery
+- {rng.choice([20, 25, 30, 45, 65, 120])}W wired charging, {rng.choice([0, 10, 15, 23, 50])}W wireless charging
+
+Pricing:
+- Starts at ${rng.randrange(399, 1599, 100)} for {rng.choice([128, 256])}GB storage
+- Colors: {colors}
+"""
+
+
+def catalog_documents(products: int, seed: int = 0):
+    """Yield (source, text) for products 0..products-1."""
+    for i in range(products):
+        yield product_source(i), spec_sheet(i, seed)
+
+
+def catalog_queries(products: int, count: int, seed: int = 1) -> list:
+    """Support questions as (query, source of the spec sheet that answers it)."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        i = rng.randrange(products)
+        template = rng.choice(QUESTIONS)
+        queries.append((template.format(name=product_name(i)), product_source(i)))
+    return queries
+
+
+def write_catalog(out_dir: str, products: int, seed: int = 0):
+    """Write spec sheets as .txt files, e.g. to point build_index.py at a large corpus."""
+    for source, text in catalog_documents(products, seed):
+        _write_sheet(out_dir, source, text)
+
+
+def write_catalog_chunks(out_dir: str, chunks: int, seed: int = 0, chunk_size: int = 1000,
+                         chunk_overlap: int = 200) -> int:
+    """Write spec sheets until the production splitter yields at least `chunks` chunks. Returns the product count."""
+    splitter = StructureAwareSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    produced = 0
+    for i in itertools.count():
+        if produced >= chunks:
+            return i
+        source, text = product_source(i), spec_sheet(i, seed)
+        _write_sheet(out_dir, source, text)
+        produced += len(splitter.split_text(source, text))
+
+
+def _write_sheet(out_dir: str, source: str, text: str):
+    path = os.path.join(out_dir, source)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic product catalog as spec sheet files.")
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="Directory to write catalog/*.txt into")
+    args = parser.parse_args()
+    write_catalog(args.out, args.products, args.seed)
+    print(f"✅ Wrote {args.products} spec sheets to {os.path.join(args.out, 'catalog')}")
+
+
+if __name__ == "__main__":
+    main()
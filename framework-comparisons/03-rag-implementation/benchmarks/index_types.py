@@ -0,0 +1,126 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Index Type Benchmark - recall@k vs. latency vs. size
+Compares every search index type (and nprobe/efSearch setting) against the exact flat baseline.
+
+Usage (from 03-rag-implementation):
+    python -m benchmarks.index_types                              # vectors of faiss_index/index.faiss
+    python -m benchmarks.index_types --synthetic 1000000 --dim 256 --json results.json
+"""
+
+import os
+import json
+import time
+import argparse
+import numpy as np
+import faiss
+from index_factory import IndexSpec, build_search_index, apply_search_params, canonical_vectors
+from chunk_store import INDEX_FILE
+from index_versions import resolve_index_dir
+
+# (build spec, search settings to sweep without rebuilding)
+DEFAULT_CONFIGS = [
+    (IndexSpec("flat-ip"), [{}]),
+    (IndexSpec("ivf-flat"), [{"nprobe": 1}, {"nprobe": 8}, {"nprobe": 32}]),
+    (IndexSpec("hnsw", hnsw_m=32), [{"ef_search": 16}, {"ef_search": 64}, {"ef_search": 128}]),
+    (IndexSpec("ivf-pq", pq_m=16), [{"nprobe": 8}, {"nprobe": 32}]),
+]
+
+
+def synthetic_vectors(count: int, dim: int, clusters: int = 256, seed: int = 0) -> np.ndarray:
+    """Clustered unit vectors (embeddings are clustered, uniform noise would flatter IVF/PQ less)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, count)] + 0.5 * rng.standard_normal((count, dim)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def make_queries(vectors: np.ndarray, count: int, seed: int = 1) -> np.ndarray:
+    """Perturbed copies of random corpus vectors, so queries land near real data."""
+    rng = np.random.default_rng(seed)
+    picks = vectors[rng.integers(0, len(vectors), count)]
+    queries = picks + 0.1 * rng.standard_normal(picks.shape).astype(np.float32)
+    faiss.normalize_L2(queries)
+    return queries
+
+
+def measure(index, queries: np.ndarray, truth: np.ndarray, k: int, normalize: bool) -> dict:
+    """Single-query latency percentiles (what a KB agent sees) and recall@k vs. truth."""
+    latencies, found = [], []
+    for query in queries:
+        query = query.reshape(1, -1).copy()
+        if normalize:
+            faiss.normalize_L2(query)
+        start = time.perf_counter()
+        _, rows = index.search(query, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found.append(rows[0])
+    recall = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)])
+    return {
+        "recall_at_k": float(recall),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+def run(vectors: np.ndarray, queries: np.ndarray, k: int, configs: list) -> list:
+    faiss.omp_set_num_threads(1)  # per-query latency, not batch throughput
+    baseline = faiss.IndexFlatL2(vectors.shape[1])
+    baseline.add(vectors)
+    _, truth = baseline.search(queries, k)
+
+    results = [{"index": "flat-l2", "build_s": 0.0, "size_mb": faiss.serialize_index(baseline).nbytes / 1e6,
+                **measure(baseline, queries, truth, k, normalize=False)}]
+    for spec, sweeps in configs:
+        start = time.perf_counter()
+        try:
+            index = build_search_index(vectors, spec)
+        except ValueError as e:
+            print(f"   skipping {spec.label()}: {e}")
+            continue
+        build_s = time.perf_counter() - start
+        size_mb = faiss.serialize_index(index).nbytes / 1e6
+        for params in sweeps:
+            spec.nprobe = params.get("nprobe", spec.nprobe)
+            spec.ef_search = params.get("ef_search", spec.ef_search)
+            apply_search_params(index, spec.index_type, nprobe=spec.nprobe, ef_search=spec.ef_search)
+            results.append({"index": spec.label(), "build_s": build_s, "size_mb": size_mb,
+                            **measure(index, queries, truth, k, normalize=spec.normalize)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FAISS index types against the flat baseline.")
+    parser.add_argument("--index-path", default=os.path.join(os.path.dirname(__file__), "..", "faiss_index"))
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic vectors instead of the index")
+    parser.add_argument("--dim", type=int, default=1536, help="Dimension of synthetic vectors")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        vectors = synthetic_vectors(args.synthetic, args.dim)
+        source = f"synthetic {args.synthetic}x{args.dim}"
+    else:
+        vectors = canonical_vectors(faiss.read_index(os.path.join(resolve_index_dir(args.index_path), INDEX_FILE)))
+        source = f"{args.index_path} ({len(vectors)}x{vectors.shape[1]})"
+    k = min(args.k, len(vectors))
+    queries = make_queries(vectors, args.queries)
+
+    print(f"📊 Index type benchmark - {source}, {len(queries)} queries, recall@{k}\n" + "=" * 60)
+    results = run(vectors, queries, k, DEFAULT_CONFIGS)
+    print(f"{'index':<45} {'recall':>7} {'p50 ms':>8} {'p99 ms':>8} {'size MB':>9} {'build s':>8}")
+    for r in results:
+        print(f"{r['index']:<45} {r['recall_at_k']:>7.3f} {r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f} "
+              f"{r['size_mb']:>9.1f} {r['build_s']:>8.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"source": source, "k": k, "queries": len(queries), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Deterministic Offline Embedder for Benchmarks
+Feature-hashing embeddings (words + word bigrams -> signed buckets, L2-normalized): no network,
+no API key, identical vectors in every process. Texts sharing terms land close together, which is
+enough structure for recall and latency measurements.
+"""
+
+import hashlib
+from functools import lru_cache
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from bm25_index import tokenize
+
+
+class OfflineEmbeddings(Embeddings):
+    """Drop-in stand-in for OpenAIEmbeddings in benchmarks."""
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.model = "offline-hash-v1"  # part of the embedding-cache namespace
+
+    @lru_cache(maxsize=1 << 20)
+    def _bucket(self, feature: str) -> tuple:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dimensions, 1.0 if value >> 63 else -1.0
+
+    def _embed(self, text: str) -> np.ndarray:
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        if features:
+            buckets, signs = zip(*(self._bucket(feature) for feature in features))
+            np.add.at(vector, np.asarray(buckets), np.asarray(signs, dtype=np.float32))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_documents(self, texts: list) -> list:
+        return [self._embed(text).tolist() for text in texts]
+
+    def embed_query(self, text: str) -> list:
+        return self._embed(text).tolist()
+
+    def embed_matrix(self, texts: list) -> np.ndarray:
+        """Embed straight into a float32 matrix (avoids list round-trips for 1M+ chunks)."""
+        matrix = np.empty((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self._embed(text)
+        return matrix
@@ -0,0 +1,197 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Retrieval Benchmark - build, load, memory, latency and recall of the KB agent path
+Writes the synthetic catalog as spec sheet files and builds a faiss_index/-style directory from
+them with build_index.py's streaming ingest pipeline and the offline embedder (no network), loads
+it with ChunkStoreRetriever and times `kb_agent_search` end to end (retriever.invoke +
+format_kb_result with the context packer).
+
+Usage (from 03-rag-implementation):
+    python -m benchmarks.retrieval --chunks 100000 --json results.json
+    python -m benchmarks.retrieval --chunks 1000000 --index-type hnsw --dim 128
+    python -m benchmarks.retrieval --chunks 1000000 --search-dims 128 --storage int8
+"""
+
+import os
+import copy
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import numpy as np
+import faiss
+from chunk_store import INDEX_FILE
+from doc_loading import list_documents, SPLITTER_VERSION
+from index_factory import IndexSpec, INDEX_TYPES, STORAGE_TYPES, format_compression_report
+from ingest_pipeline import IngestPipeline
+from build_index import CHUNK_SIZE, CHUNK_OVERLAP, build_full, save_bm25_index, save_search_index
+from kb_retriever import ChunkStoreRetriever, format_kb_result
+from context_packer import ContextPacker
+from benchmarks.catalog import write_catalog_chunks, catalog_queries
+from benchmarks.offline_embedder import OfflineEmbeddings
+
+
+def rss_mb() -> float:
+    """Current resident set size (falls back to the peak where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build(index_path: str, chunks: int, embedder: OfflineEmbeddings, spec: IndexSpec, seed: int = 0,
+          workers: int = None) -> tuple:
+    """Build the index the way build_index.py does: streaming ingest of the catalog files, then the
+    BM25, product and search indexes. Returns (timings, canonical index, product count, docs dir)
+    where docs dir is the (deleted) directory the chunk sources point into."""
+    timings = {}
+    docs_path = tempfile.mkdtemp(prefix="kb-bench-docs-")
+    try:
+        start = time.perf_counter()
+        products = write_catalog_chunks(docs_path, chunks, seed, CHUNK_SIZE, CHUNK_OVERLAP)
+        timings["generate_s"] = time.perf_counter() - start
+
+        # Split workers -> embed batches -> index, with bounded queues between the stages
+        pipeline = IngestPipeline(embedder, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP,
+                                  split_workers=workers)
+        settings = {"embedding_model": embedder.model, "splitter": SPLITTER_VERSION,
+                    "chunk_size": CHUNK_SIZE, "chunk_overlap": CHUNK_OVERLAP}
+        os.makedirs(index_path, exist_ok=True)
+        start = time.perf_counter()
+        stats = build_full(list_documents(docs_path), pipeline, index_path, settings)
+        timings["ingest_s"] = time.perf_counter() - start
+    finally:
+        # Chunks keep the file paths as their source; the files themselves are no longer needed
+        shutil.rmtree(docs_path, ignore_errors=True)
+    timings["chunks"] = stats["chunks"]
+    timings["pipeline"] = {name: {"items": stage.items, "busy_s": stage.busy, "blocked_s": stage.blocked}
+                           for name, stage in pipeline.stats.items()}
+
+    start = time.perf_counter()
+    save_bm25_index(index_path)
+    timings["bm25_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    info = save_search_index(index_path, copy.copy(spec))
+    timings["search_index_s"] = time.perf_counter() - start
+    if "compression" in info:
+        timings["compression"] = info["compression"]
+
+    timings["build_s"] = sum(timings[key] for key in ("ingest_s", "bm25_s", "search_index_s"))
+    timings["disk_mb"] = sum(
+        os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(index_path) for name in names
+    ) / 1e6
+    canonical = faiss.read_index(os.path.join(index_path, INDEX_FILE))
+    return timings, canonical, products, docs_path
+
+
+def measure_queries(retriever: ChunkStoreRetriever, canonical, embedder: OfflineEmbeddings,
+                    queries: list, k: int) -> dict:
+    """Latency of the kb_agent_search path per query, recall@k vs. exact vector search, product hit rate,
+    and distinct source files per result (what the MMR stage raises)."""
+    _, truth = canonical.search(embedder.embed_matrix([query for query, _ in queries]), k)
+    packer = ContextPacker()
+    latencies, recalls, hits, sources = [], [], 0, []
+    for (query, source), truth_rows in zip(queries, truth):
+        start = time.perf_counter()
+        docs = retriever.invoke(query)
+        format_kb_result(docs, packer)
+        latencies.append((time.perf_counter() - start) * 1000)
+        expected = {retriever.store.chunk_id(int(row)) for row in truth_rows if row != -1}
+        recalls.append(len(expected & {doc.id for doc in docs}) / max(len(expected), 1))
+        hits += any(doc.metadata.get("source") == source for doc in docs)
+        sources.append(len({doc.metadata.get("source") for doc in docs}))
+    return {
+        "queries": len(queries),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "recall_at_k": float(np.mean(recalls)),
+        "product_hit_rate": hits / len(queries),
+        "distinct_sources": float(np.mean(sources)),
+        "context_tokens_saved": packer.stats()["saved_ratio"],
+        "paths": retriever.latency_stats(),
+    }
+
+
+def run(args) -> dict:
+    embedder = OfflineEmbeddings(dimensions=args.dim)
+    spec = IndexSpec(args.index_type, dims=args.search_dims, storage=args.storage)
+    index_path = args.index_path or tempfile.mkdtemp(prefix="kb-bench-")
+    try:
+        rss_start = rss_mb()
+        timings, canonical, products, docs_path = build(index_path, args.chunks, embedder, spec, seed=args.seed,
+                                                        workers=args.workers)
+        rss_built = rss_mb()
+
+        start = time.perf_counter()
+        # Caches off: every query pays for embedding + search, like a first-time question
+        retriever = ChunkStoreRetriever(index_path, embedder, k=args.k, hybrid=not args.no_hybrid,
+                                        mmr=not args.no_mmr, cache_size=0)
+        load = {"load_s": time.perf_counter() - start, "rss_delta_mb": rss_mb() - rss_built}
+
+        # Chunk sources are the absolute paths of the spec sheet files
+        queries = [(query, os.path.join(docs_path, source))
+                   for query, source in catalog_queries(products, args.queries, seed=args.seed + 1)]
+        query = measure_queries(retriever, canonical, embedder, queries, args.k)
+    finally:
+        if not args.index_path:
+            shutil.rmtree(index_path, ignore_errors=True)
+    return {
+        "config": {
+            "chunks": timings["chunks"], "products": products, "dim": args.dim, "k": args.k,
+            "index_type": spec.label(), "hybrid": not args.no_hybrid, "mmr": not args.no_mmr, "seed": args.seed,
+        },
+        "build": {**timings, "rss_delta_mb": rss_built - rss_start},
+        "load": load,
+        "query": query,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the KB agent retrieval path on a synthetic catalog.")
+    parser.add_argument("--chunks", type=int, default=10_000, help="Catalog size in chunks")
+    parser.add_argument("--dim", type=int, default=256, help="Offline embedding dimension")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default="flat-l2")
+    parser.add_argument("--search-dims", type=int, default=None, help="Truncate the search index to N dimensions")
+    parser.add_argument("--storage", choices=STORAGE_TYPES, default="float32", help="Search index vector codes")
+    parser.add_argument("--no-hybrid", action="store_true", help="Vector search only (skip BM25 fusion)")
+    parser.add_argument("--no-mmr", action="store_true", help="Plain top-k (skip the MMR diversification stage)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Split worker processes of the ingest pipeline (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--index-path", help="Keep the built index here instead of a temp dir")
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    label = IndexSpec(args.index_type, dims=args.search_dims, storage=args.storage).label()
+    print(f"📊 Retrieval benchmark - {args.chunks} chunks, dim {args.dim}, {label}, "
+          f"{'hybrid' if not args.no_hybrid else 'vector only'}\n" + "=" * 60)
+    results = run(args)
+    build_stats, load, query = results["build"], results["load"], results["query"]
+    print(f"🔨 Build: {build_stats['build_s']:.1f}s (streaming ingest {build_stats['ingest_s']:.1f}s), "
+          f"{build_stats['chunks']} chunks, {build_stats['disk_mb']:.1f} MB on disk")
+    if "compression" in build_stats:
+        print(format_compression_report(build_stats["compression"]))
+    print(f"📂 Load: {load['load_s'] * 1000:.1f} ms, +{load['rss_delta_mb']:.1f} MB RSS")
+    print(f"🔍 Query: p50 {query['p50_ms']:.2f} ms, p99 {query['p99_ms']:.2f} ms, "
+          f"recall@{args.k} {query['recall_at_k']:.3f}, product hit rate {query['product_hit_rate']:.0%}, "
+          f"{query['distinct_sources']:.2f} sources per result")
+    print(f"💾 Peak RSS: {results['peak_rss_mb']:.0f} MB")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
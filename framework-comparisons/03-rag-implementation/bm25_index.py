@@ -0,0 +1,138 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+BM25 Keyword Index for RAG Examples
+Compact inverted index over the chunk store, so exact terms like "50MP", "5000mAh" or model
+numbers are found even when embedding search ranks them low.
+
+Layout (faiss_index/bm25/, rows aligned with index.faiss and the chunk store):
+    header.json        vocabulary (sorted) + BM25 parameters
+    offsets.npy        int64, postings of term t are rows[offsets[t]:offsets[t + 1]]
+    rows.npy / tf.npy  int32 chunk rows / uint16 term frequencies
+    idf.npy, doc_len.npy
+"""
+
+import os
+import re
+import json
+import shutil
+from collections import Counter
+import numpy as np
+
+BM25_DIR = "bm25"
+HEADER_FILE = "header.json"
+BM25_VERSION = 1
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_NUMBER_UNIT = re.compile(r"^([0-9]+(?:\.[0-9]+)?)([a-z]+)$")
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word/number tokens. "50MP" yields "50mp" plus "50" and "mp", so "50 MP" matches too."""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        tokens.append(token)
+        match = _NUMBER_UNIT.match(token)
+        if match:
+            tokens.extend(match.groups())
+    return tokens
+
+
+def write_bm25_index(path: str, texts: list, k1: float = 1.5, b: float = 0.75):
+    """Build the inverted index for texts (in chunk row order). Replaces any existing index at path."""
+    postings = {}
+    doc_len = np.zeros(len(texts), dtype=np.int32)
+    for row, text in enumerate(texts):
+        counts = Counter(tokenize(text))
+        doc_len[row] = sum(counts.values())
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((row, tf))
+
+    terms = sorted(postings)
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum([len(postings[term]) for term in terms], out=offsets[1:])
+    rows = np.fromiter((row for term in terms for row, _ in postings[term]), dtype=np.int32, count=offsets[-1])
+    tf = np.fromiter((min(tf, 65535) for term in terms for _, tf in postings[term]), dtype=np.uint16,
+                     count=offsets[-1])
+    df = np.diff(offsets).astype(np.float32)
+    idf = np.log(1 + (len(texts) - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, array in (("offsets", offsets), ("rows", rows), ("tf", tf), ("idf", idf), ("doc_len", doc_len)):
+        np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+    header = {
+        "version": BM25_VERSION,
+        "count": len(texts),
+        "avg_doc_len": float(doc_len.mean()) if len(texts) else 0.0,
+        "k1": k1,
+        "b": b,
+        "terms": terms,
+    }
+    with open(os.path.join(tmp_path, HEADER_FILE), "w") as f:
+        json.dump(header, f)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+
+class BM25Index:
+    """Read-only BM25 scorer over a memory-mapped inverted index."""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, HEADER_FILE), "r") as f:
+            header = json.load(f)
+        if header.get("version") != BM25_VERSION:
+            raise ValueError(f"Unsupported BM25 index version {header.get('version')} at {path}")
+        self.count = header["count"]
+        self.k1 = header["k1"]
+        self.b = header["b"]
+        self.term_ids = {term: i for i, term in enumerate(header["terms"])}
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                  for name in ("offsets", "rows", "tf", "idf", "doc_len")}
+        self.offsets, self.rows, self.tf, self.idf = arrays["offsets"], arrays["rows"], arrays["tf"], arrays["idf"]
+        # Per-row length normalization is query independent: k1 * (1 - b + b * len / avg_len)
+        avg_doc_len = header["avg_doc_len"] or 1.0
+        self.norm = (self.k1 * (1 - self.b + self.b * np.asarray(arrays["doc_len"]) / avg_doc_len)).astype(np.float32)
+
+    @classmethod
+    def load(cls, index_path: str):
+        """BM25 index of an index directory, or None if the build predates it."""
+        path = os.path.join(index_path, BM25_DIR)
+        return cls(path) if os.path.exists(os.path.join(path, HEADER_FILE)) else None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def search(self, query: str, k: int, allowed: np.ndarray = None) -> list:
+        """Return (row, score) pairs of the k best-scoring chunks (only chunks sharing a term).
+
+        allowed: optional boolean row mask (e.g. one product's partition) the results must fall in.
+        """
+        scores = np.zeros(self.count, dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            rows = self.rows[start:end]
+            tf = self.tf[start:end].astype(np.float32)
+            # Rows are unique within one posting list, so fancy-index += is safe
+            scores[rows] += self.idf[term_id] * tf * (self.k1 + 1) / (tf + self.norm[rows])
+        candidates = np.flatnonzero(scores)
+        if allowed is not None:
+            candidates = candidates[allowed[candidates]]
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(row), float(scores[row])) for row in candidates]
+
+
+def reciprocal_rank_fusion(rankings: list, k: int, rrf_k: int = 60) -> list:
+    """Fuse ranked [(row, score)] lists: each list adds 1 / (rrf_k + rank). Returns (row, fused score)."""
+    fused = {}
+    for ranking in rankings:
+        for rank, (row, _) in enumerate(ranking, 1):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
@@ -3,19 +3,208 @@
 """
 Common Index Builder for RAG Examples
 Creates FAISS vector index from product documentation that all framework examples can share.
+
+Usage:
+    python build_index.py                 # full rebuild
+    python build_index.py --incremental   # re-embed only new/changed chunks, drop removed files
+    python build_index.py --workers 8 --embed-concurrency 8   # tune the streaming pipeline
+    python build_index.py --index-type hnsw --ef-search 64    # approximate search index
+    python build_index.py --dims 512 --storage int8           # compressed search index + exact re-rank
+    python build_index.py --shards 4                          # hash shards, searched scatter-gather
+    python build_index.py --shard-by product                  # one shard per product line
+    python build_index.py --keep-versions 5                   # keep more old builds for rollback
+
+Each build is written to faiss_index/versions/<version>/ and published by switching
+faiss_index/current; running KB agents swap to it without a restart.
 """
 
 import os
+import copy
+import argparse
+import faiss
 from dotenv import load_dotenv
 from langchain_openai import OpenAIEmbeddings
-from langchain_community.document_loaders import DirectoryLoader, TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
+from index_manifest import IndexManifest
+from embedding_cache import cached_embeddings
+from chunk_store import ChunkStore, save_vectorstore, load_vectorstore, INDEX_FILE, CHUNKS_DIR, TEXT_COLUMN
+from doc_loading import list_documents, SPLITTER_VERSION
+from ingest_pipeline import IngestPipeline
+from index_factory import (IndexSpec, INDEX_TYPES, STORAGE_TYPES, write_search_index, load_index_info,
+                           format_compression_report)
+from bm25_index import write_bm25_index, BM25_DIR
+from product_router import write_partitions
+from kb_shards import SHARDS_DIR, SHARD_STRATEGIES, write_shards, remove_shards
+from index_versions import DEFAULT_KEEP_VERSIONS, resolve_index_dir, new_version_dir, publish, discard
 
 # Load environment variables
 load_dotenv()
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+
+def build_full(files: dict, pipeline: IngestPipeline, index_path: str, settings: dict) -> dict:
+    """Embed every chunk of every file and overwrite the index."""
+    manifest = IndexManifest(settings=settings)
+
+    def on_file(result: dict) -> set:
+        manifest.record(result["rel_path"], result["abs_path"], result["ids"], file_hash=result["file_hash"])
+        return set(result["ids"])
+
+    print("🔮 Splitting, embedding and indexing (streaming)...")
+    vectorstore = pipeline.run(list(files.items()), on_file)
+    if vectorstore is None:
+        raise SystemExit("No supported documents found to index")
+
+    print("💾 Saving index to disk...")
+    save_vectorstore(vectorstore, index_path)
+    manifest.save(index_path)
+    chunks = len(manifest.all_chunk_ids())
+    return {"documents": len(files), "chunks": chunks, "embedded": chunks, "deleted": 0}
+
+
+def build_incremental(files: dict, pipeline: IngestPipeline, index_path: str, manifest: IndexManifest,
+                      embeddings) -> dict:
+    """Apply only the difference between the corpus and the manifest to the existing index."""
+    removed = [rel for rel in manifest.files if rel not in files]
+    changed = [rel for rel, abs_path in files.items() if manifest.file_changed(rel, abs_path)]
+    print(f"   {len(files) - len(changed)} unchanged, {len(changed)} new/changed, {len(removed)} removed")
+    if not removed and not changed:
+        print("   Index already up to date")
+        manifest.save(index_path)
+        return {"documents": len(files), "chunks": len(manifest.all_chunk_ids()), "embedded": 0, "deleted": 0}
+
+    # Chunk ids are content hashes, so unchanged chunks inside a changed file keep their vectors
+    to_delete, embedded = [], []
+    for rel_path in removed:
+        to_delete.extend(manifest.files.pop(rel_path)["chunks"])
+
+    def on_file(result: dict) -> set:
+        old_ids = set(manifest.files.get(result["rel_path"], {}).get("chunks", []))
+        current = set(result["ids"])
+        to_delete.extend(old_ids - current)
+        manifest.record(result["rel_path"], result["abs_path"], result["ids"], file_hash=result["file_hash"])
+        new_ids = current - old_ids
+        embedded.extend(new_ids)
+        return new_ids
+
+    vectorstore = load_vectorstore(index_path, embeddings)
+    if to_delete:
+        # Vectors of removed files go first so the index never holds them alongside new data
+        print(f"🗑️  Deleting {len(to_delete)} chunks of removed files...")
+        vectorstore.delete(to_delete)
+    removed_count = len(to_delete)
+    print("🔮 Splitting, embedding and indexing new/changed files (streaming)...")
+    vectorstore = pipeline.run([(rel, files[rel]) for rel in changed], on_file, vectorstore=vectorstore)
+    stale = to_delete[removed_count:]
+    if stale:
+        print(f"🗑️  Deleting {len(stale)} stale chunks of changed files...")
+        vectorstore.delete(stale)
+
+    print("💾 Saving index to disk...")
+    save_vectorstore(vectorstore, index_path)
+    manifest.save(index_path)
+    return {
+        "documents": len(files),
+        "chunks": len(manifest.all_chunk_ids()),
+        "embedded": len(embedded),
+        "deleted": len(to_delete),
+    }
+
+
+def save_search_index(index_path: str, spec: IndexSpec):
+    """Derive search.faiss from the canonical flat vectors (no re-embedding) and write the per-product rows."""
+    canonical = faiss.read_index(os.path.join(index_path, INDEX_FILE))
+    partitions = write_partitions(index_path, ChunkStore(os.path.join(index_path, CHUNKS_DIR)))
+    print("   Product partitions: " + (", ".join(f"{p} ({n['chunks']})" for p, n in partitions.items()) or "none"))
+    try:
+        return write_search_index(index_path, canonical, spec)
+    except ValueError as e:
+        print(f"⚠️  {e}; falling back to flat-l2")
+        return write_search_index(index_path, canonical, IndexSpec("flat-l2"))
+
+
+def save_bm25_index(index_path: str):
+    """Build the BM25 keyword index from the chunk store (rows stay aligned with index.faiss)."""
+    store = ChunkStore(os.path.join(index_path, CHUNKS_DIR))
+    texts = [store.columns[TEXT_COLUMN][row] for row in range(len(store))]
+    write_bm25_index(os.path.join(index_path, BM25_DIR), texts)
+
+
+def build_version(build_path: str, files: dict, pipeline: IngestPipeline, embeddings, settings: dict,
+                  spec: IndexSpec, args) -> tuple:
+    """Write every artifact of one build into build_path. Returns (stats, search index info, changed)."""
+    manifest = IndexManifest.load(build_path) if args.incremental else None
+    if manifest is not None and manifest.settings != settings:
+        print("   Build settings changed since last build, falling back to a full rebuild")
+        manifest = None
+    elif args.incremental and manifest is None:
+        print("   No usable manifest found, running a full rebuild")
+
+    if manifest is None:
+        stats = build_full(files, pipeline, build_path, settings)
+    else:
+        stats = build_incremental(files, pipeline, build_path, manifest, embeddings)
+
+    info = load_index_info(build_path)
+    rebuilt = stats["embedded"] or stats["deleted"] or not os.path.isdir(os.path.join(build_path, BM25_DIR))
+    changed = bool(rebuilt)
+    if rebuilt:
+        print("🔤 Writing BM25 keyword index...")
+        save_bm25_index(build_path)
+    if rebuilt or info.get("label") != spec.label():
+        print(f"🧭 Writing search index ({spec.label()})...")
+        # A copy: building resolves nlist="auto" on the spec, and shards need it unresolved
+        info = save_search_index(build_path, copy.copy(spec))
+        changed = True
+
+    shards_dir = os.path.join(build_path, SHARDS_DIR)
+    if args.shards or args.shard_by == "product":
+        # Only shards whose chunks changed are rewritten (the rest are copies of the published build)
+        print(f"🧩 Writing shards (by {args.shard_by})...")
+        for name, status in write_shards(build_path, spec, args.shard_by, args.shards).items():
+            print(f"   {name}: {status}")
+            changed = changed or status != "unchanged"
+    elif os.path.isdir(shards_dir):
+        remove_shards(build_path)
+        changed = True
+    return stats, info, changed
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Build the shared FAISS index for the RAG examples.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-embed new/changed chunks and delete vectors of removed files")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes for reading/splitting files (default: CPU count)")
+    parser.add_argument("--embed-concurrency", type=int, default=4,
+                        help="Embedding requests in flight at once")
+    parser.add_argument("--batch-tokens", type=int, default=50_000,
+                        help="Approximate tokens per embedding request")
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default="flat-l2",
+                        help="Index the KB agents search (default: exact flat L2)")
+    parser.add_argument("--nlist", type=int, default=None, help="IVF inverted lists (default: ~4*sqrt(n))")
+    parser.add_argument("--nprobe", type=int, default=8, help="IVF lists probed per query")
+    parser.add_argument("--hnsw-m", type=int, default=32, help="HNSW neighbors per node")
+    parser.add_argument("--ef-construction", type=int, default=200, help="HNSW build-time beam width")
+    parser.add_argument("--ef-search", type=int, default=64, help="HNSW query-time beam width")
+    parser.add_argument("--pq-m", type=int, default=64, help="IVF-PQ sub-quantizers (must divide the dimension)")
+    parser.add_argument("--pq-bits", type=int, default=8, help="IVF-PQ bits per sub-quantizer code")
+    parser.add_argument("--dims", type=int, default=None,
+                        help="Search on the first N embedding dimensions (Matryoshka truncation)")
+    parser.add_argument("--storage", choices=STORAGE_TYPES, default="float32",
+                        help="Vector codes of the search index (fp16/int8 scalar quantization)")
+    parser.add_argument("--oversample", type=int, default=4,
+                        help="Candidates per result re-ranked with full vectors when --dims/--storage compress")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="Split the index into N hash shards searched by shard worker processes (0 = one index)")
+    parser.add_argument("--shard-by", choices=SHARD_STRATEGIES, default="hash",
+                        help="hash: by chunk id; product: one shard per product line (ignores --shards)")
+    parser.add_argument("--keep-versions", type=int, default=DEFAULT_KEEP_VERSIONS,
+                        help="Published builds kept under faiss_index/versions (older ones are deleted)")
+    args = parser.parse_args()
+
     print("🔨 Building FAISS Index for Product Documentation\n")
     print("=" * 60)
 
@@ -24,35 +213,63 @@ def main():
     docs_path = os.path.join(script_dir, "sample-docs")
     index_path = os.path.join(script_dir, "faiss_index")
 
-    # Load documents
-    print("📄 Loading documents...")
-    loader = DirectoryLoader(docs_path, glob="**/*.txt", loader_cls=TextLoader)
-    documents = loader.load()
-    print(f"   Loaded {len(documents)} documents")
-
-    # Split documents
-    print("✂️  Splitting documents into chunks...")
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200
+    embeddings = cached_embeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL))
+    # Workers split on headings/spec sections/tables first, RecursiveCharacterTextSplitter only as a fallback
+    pipeline = IngestPipeline(
+        embeddings,
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        split_workers=args.workers,
+        embed_concurrency=args.embed_concurrency,
+        batch_tokens=args.batch_tokens,
     )
-    splits = text_splitter.split_documents(documents)
-    print(f"   Created {len(splits)} chunks")
+    settings = {
+        "embedding_model": EMBEDDING_MODEL,
+        "splitter": SPLITTER_VERSION,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+    }
 
-    # Create embeddings and index
-    print("🔮 Creating embeddings and building index...")
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-    vectorstore = FAISS.from_documents(splits, embeddings)
+    print("📄 Scanning documents...")
+    files = list_documents(docs_path)
 
-    # Save index
-    print("💾 Saving index to disk...")
-    vectorstore.save_local(index_path)
+    # Build into a fresh version directory; agents keep serving the published one until publish().
+    # Incremental builds start from a copy of the published build.
+    build_path = new_version_dir(index_path, copy_from=resolve_index_dir(index_path) if args.incremental else None)
+    spec = IndexSpec(args.index_type, nlist=args.nlist, nprobe=args.nprobe, hnsw_m=args.hnsw_m,
+                     ef_construction=args.ef_construction, ef_search=args.ef_search,
+                     pq_m=args.pq_m, pq_bits=args.pq_bits, dims=args.dims, storage=args.storage,
+                     oversample=args.oversample)
+    # Nothing is published until every artifact is written; a failed build leaves no half-written version
+    try:
+        stats, info, changed = build_version(build_path, files, pipeline, embeddings, settings, spec, args)
+    except BaseException:
+        discard(build_path)
+        raise
+
+    if changed or not args.incremental:
+        version = publish(index_path, build_path, keep=args.keep_versions)
+    else:
+        # Nothing to swap to: running agents keep the published build
+        discard(build_path)
+        build_path = resolve_index_dir(index_path)
+        version = os.path.basename(build_path)
 
     print("=" * 60)
     print(f"✅ Index built successfully!")
-    print(f"   Location: {index_path}")
-    print(f"   Documents: {len(documents)}")
-    print(f"   Chunks: {len(splits)}")
+    print(f"   Location: {build_path}")
+    print(f"   Published version: {version}")
+    print(f"   Documents: {stats['documents']}")
+    print(f"   Chunks: {stats['chunks']}")
+    print(f"   Search index: {info['label']}")
+    if "compression" in info:
+        print(format_compression_report(info["compression"]))
+    print(f"   Embedded this run: {stats['embedded']} (deleted: {stats['deleted']})")
+    cache_stats = embeddings.cache.stats()
+    print(f"   Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses ({cache_stats['hit_ratio']:.0%})")
+    if pipeline.wall:
+        print("\n📈 Pipeline throughput per stage:")
+        print(pipeline.report())
     print("\nAll framework examples can now load this pre-built index.")
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Memory-Mapped Chunk Store for RAG Examples
+Pickle-free, columnar storage of chunk text, metadata and ids, aligned with the rows of index.faiss.
+
+Layout (inside the index directory):
+    index.faiss                      FAISS vectors, row i <-> chunk i
+    chunks/header.json               row count + column names/types
+    chunks/<col>.bin + .offsets.npy  string column: UTF-8 blob + int64 offsets (n + 1)
+    chunks/<col>.npy                 integer column
+Readers mmap every file and only decode the rows a search returns.
+"""
+
+import os
+import json
+import mmap
+import shutil
+import numpy as np
+import faiss
+from langchain_core.documents import Document
+
+INDEX_FILE = "index.faiss"
+CHUNKS_DIR = "chunks"
+HEADER_FILE = "header.json"
+STORE_VERSION = 1
+LEGACY_DOCSTORE_FILE = "index.pkl"  # pickled LangChain docstore of builds before the chunk store
+
+# Columns that are not document metadata
+TEXT_COLUMN = "text"
+ID_COLUMN = "id"
+
+
+def _column_type(values: list) -> str:
+    if values and all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return "int"
+    return "str"
+
+
+def write_chunk_store(path: str, ids: list, documents: list):
+    """Write chunks (in index row order) as columns. Replaces any existing store at path."""
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    meta_keys = sorted({key for doc in documents for key in doc.metadata})
+    columns = {TEXT_COLUMN: [doc.page_content for doc in documents], ID_COLUMN: list(ids)}
+    for key in meta_keys:
+        columns[key] = [doc.metadata.get(key) for doc in documents]
+
+    types = {}
+    for name, values in columns.items():
+        types[name] = _column_type(values)
+        if types[name] == "int":
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(values, dtype=np.int64))
+            continue
+        encoded = [("" if v is None else str(v)).encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        with open(os.path.join(tmp_path, f"{name}.bin"), "wb") as f:
+            for blob in encoded:
+                f.write(blob)
+        np.save(os.path.join(tmp_path, f"{name}.offsets.npy"), offsets)
+
+    with open(os.path.join(tmp_path, HEADER_FILE), "w") as f:
+        json.dump({"version": STORE_VERSION, "count": len(documents), "columns": types}, f, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+
+class _StringColumn:
+    def __init__(self, path: str, name: str):
+        self.offsets = np.load(os.path.join(path, f"{name}.offsets.npy"), mmap_mode="r")
+        blob_path = os.path.join(path, f"{name}.bin")
+        if os.path.getsize(blob_path) == 0:
+            self.blob = b""  # mmap cannot map an empty file
+        else:
+            with open(blob_path, "rb") as f:
+                self.blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __getitem__(self, row: int) -> str:
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return self.blob[start:end].decode("utf-8")
+
+
+class _IntColumn:
+    def __init__(self, path: str, name: str):
+        self.values = np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+    def __getitem__(self, row: int) -> int:
+        return int(self.values[row])
+
+
+def check_index_dir(index_path: str):
+    """Fail with a rebuild hint unless index_path holds a chunk-store build."""
+    if os.path.exists(os.path.join(index_path, CHUNKS_DIR, HEADER_FILE)):
+        return
+    if os.path.exists(os.path.join(index_path, LEGACY_DOCSTORE_FILE)):
+        raise FileNotFoundError(
+            f"{index_path} was built by an older build_index.py (pickled index.pkl docstore), which the "
+            f"chunk-store loader cannot read. Run `python build_index.py` to rebuild it.")
+    raise FileNotFoundError(f"No index at {index_path}. Run `python build_index.py` first.")
+
+
+class ChunkStore:
+    """Read-only, memory-mapped view of a chunk store. Rows are decoded on demand."""
+
+    def __init__(self, path: str):
+        header_path = os.path.join(path, HEADER_FILE)
+        if not os.path.exists(header_path):
+            raise FileNotFoundError(f"No chunk store at {path}. Run build_index.py first.")
+        with open(header_path, "r") as f:
+            header = json.load(f)
+        if header.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported chunk store version {header.get('version')} at {path}")
+        self.count = header["count"]
+        self.columns = {
+            name: (_IntColumn if kind == "int" else _StringColumn)(path, name)
+            for name, kind in header["columns"].items()
+        }
+        self._id_to_row = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def chunk_id(self, row: int) -> str:
+        return self.columns[ID_COLUMN][row]
+
+    def row_of(self, chunk_id: str) -> int:
+        """Row for a chunk id. The id map is built on first use (builder-side only)."""
+        if self._id_to_row is None:
+            ids = self.columns[ID_COLUMN]
+            self._id_to_row = {ids[row]: row for row in range(self.count)}
+        return self._id_to_row[chunk_id]
+
+    def document(self, row: int) -> Document:
+        """Materialize one row as a LangChain Document."""
+        metadata = {name: col[row] for name, col in self.columns.items() if name not in (TEXT_COLUMN, ID_COLUMN)}
+        return Document(id=self.chunk_id(row), page_content=self.columns[TEXT_COLUMN][row], metadata=metadata)
+
+
+# Builder-side helpers: LangChain FAISS vectorstore <-> index.faiss + chunk store
+
+def save_vectorstore(vectorstore, index_path: str):
+    """Persist a LangChain FAISS vectorstore without pickling its docstore."""
+    os.makedirs(index_path, exist_ok=True)
+    rows = range(vectorstore.index.ntotal)
+    ids = [vectorstore.index_to_docstore_id[row] for row in rows]
+    documents = [vectorstore.docstore.search(cid) for cid in ids]
+    write_chunk_store(os.path.join(index_path, CHUNKS_DIR), ids, documents)
+    faiss.write_index(vectorstore.index, os.path.join(index_path, INDEX_FILE))
+    # Drop the pickled docstore written by older builds
+    legacy_pickle = os.path.join(index_path, LEGACY_DOCSTORE_FILE)
+    if os.path.exists(legacy_pickle):
+        os.remove(legacy_pickle)
+
+
+def load_vectorstore(index_path: str, embeddings):
+    """Rebuild a LangChain FAISS vectorstore from index.faiss + chunk store (used for incremental builds)."""
+    from langchain_community.vectorstores import FAISS
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+
+    check_index_dir(index_path)
+    store = ChunkStore(os.path.join(index_path, CHUNKS_DIR))
+    index = faiss.read_index(os.path.join(index_path, INDEX_FILE))
+    documents = {}
+    index_to_docstore_id = {}
+    for row in range(len(store)):
+        doc = store.document(row)
+        documents[doc.id] = doc
+        index_to_docstore_id[row] = doc.id
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(documents),
+        index_to_docstore_id=index_to_docstore_id,
+    )
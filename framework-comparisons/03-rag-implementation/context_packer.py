@@ -0,0 +1,132 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Token-Budgeted Context Packer for the KB Agent
+Turns the retrieved chunks into the context the Support Agent sees:
+    1. neighbouring chunks of the same file (chunk_index i, i+1) are merged, in file order
+    2. lines already in the context (chunk overlap, comparison sheet vs per-phone file) are dropped
+    3. blocks are added in relevance order until the token budget is spent
+
+Tokens are counted with token_counting.load_encoding() (cl100k_base, or a word count offline).
+"""
+
+import os
+import re
+import threading
+from token_counting import load_encoding
+
+DEFAULT_TOKEN_BUDGET = 800
+DUPLICATE_THRESHOLD = 0.8  # share of a line's word 3-grams already in the context
+SHINGLE_SIZE = 3
+
+_BULLET = re.compile(r"^[\s\-*•]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(line: str) -> str:
+    return _WHITESPACE.sub(" ", _BULLET.sub("", line).lower()).strip()
+
+
+def _shingles(normalized: str) -> set:
+    words = normalized.split()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+class ContextPacker:
+    """Builds deduplicated, budget-limited context from ranked chunks; counts the tokens it saves."""
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, duplicate_threshold: float = DUPLICATE_THRESHOLD):
+        self.token_budget = token_budget
+        self.duplicate_threshold = duplicate_threshold
+        self._encoding = None
+        self._lock = threading.Lock()
+        self.packs = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+
+    def _tokens(self, text: str) -> int:
+        if self._encoding is None:
+            self._encoding = load_encoding()
+        return len(self._encoding.encode_ordinary(text))
+
+    @staticmethod
+    def _blocks(docs: list) -> list:
+        """Group ranked docs into blocks of adjacent chunks of one file; a block keeps its best rank."""
+        blocks = []
+        for doc in docs:
+            source, index = doc.metadata.get("source"), doc.metadata.get("chunk_index")
+            for block in blocks:
+                if index is not None and any(
+                    other.metadata.get("source") == source and other.metadata.get("chunk_index") is not None
+                    and abs(other.metadata["chunk_index"] - index) == 1
+                    for other in block
+                ):
+                    block.append(doc)
+                    break
+            else:
+                blocks.append([doc])
+        return [sorted(block, key=lambda d: d.metadata.get("chunk_index") or 0) for block in blocks]
+
+    def _is_duplicate(self, normalized: str, seen_lines: set, seen_shingles: set) -> bool:
+        if normalized in seen_lines:
+            return True
+        shingles = _shingles(normalized)
+        return bool(shingles) and len(shingles & seen_shingles) / len(shingles) >= self.duplicate_threshold
+
+    def pack(self, docs: list) -> tuple:
+        """Return (context text, docs that contributed to it)."""
+        seen_lines, seen_shingles = set(), set()
+        parts, used, spent = [], [], 0
+        for block in self._blocks(docs):
+            lines = []
+            for doc in block:
+                for line in doc.page_content.split("\n"):
+                    normalized = _normalize(line)
+                    if not normalized:
+                        if lines and lines[-1]:
+                            lines.append("")  # keep paragraph breaks, never two in a row
+                        continue
+                    # The block's first line (breadcrumb/heading) always stays, it labels the text below it
+                    if lines and self._is_duplicate(normalized, seen_lines, seen_shingles):
+                        continue
+                    lines.append(line)
+                    seen_lines.add(normalized)
+                    seen_shingles.update(_shingles(normalized))
+            kept = []
+            for line in lines:
+                cost = self._tokens(line) + 1
+                if spent + cost > self.token_budget:
+                    break
+                kept.append(line)
+                spent += cost
+            text = "\n".join(kept).strip()
+            if text:
+                parts.append(text)
+                used.extend(block)
+            if len(kept) < len(lines):
+                break  # budget spent
+        context = "\n\n".join(parts)
+        with self._lock:
+            self.packs += 1
+            self.tokens_in += self._tokens("\n\n".join(doc.page_content for doc in docs))
+            self.tokens_out += self._tokens(context)
+        return context, used
+
+    def stats(self) -> dict:
+        saved = self.tokens_in - self.tokens_out
+        return {
+            "packs": self.packs,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "saved_ratio": saved / self.tokens_in if self.tokens_in else 0.0,
+        }
+
+
+def format_packing_stats(stats: dict) -> str:
+    return (f"   KB context: {stats['tokens_in']} -> {stats['tokens_out']} prompt tokens "
+            f"({stats['saved_ratio']:.0%} saved over {stats['packs']} searches)")
+
+
+def context_packer_from_env() -> ContextPacker:
+    """Context packer with the token budget configurable via env."""
+    return ContextPacker(token_budget=int(os.getenv("KB_CONTEXT_TOKENS", DEFAULT_TOKEN_BUDGET)))
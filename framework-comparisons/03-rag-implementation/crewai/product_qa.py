@@ -6,31 +6,43 @@ Demonstrates: 2-agent system (KB Agent retrieves from vector DB, Support Agent r
 """
 
 import os
+import sys
+import argparse
 from dotenv import load_dotenv
-from crewai import Agent, Task, Crew, LLM
-from crewai.tools import tool
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
+
+# Shared RAG helpers live next to build_index.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from kb_runtime import KBRuntime, Lazy, startup
+
+with startup.timed("import crewai"):
+    # Needed at import time for the @tool decorator
+    from crewai import Agent, Task, Crew, LLM
+    from crewai.tools import tool
 
 load_dotenv()
 
-# Load pre-built FAISS index (shared across all frameworks)
-index_path = os.path.join(os.path.dirname(__file__), "..", "faiss_index")
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-vectorstore = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
-retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
+def _create_llm():
+    return LLM(model="gpt-3.5-turbo", temperature=0.7)
+
+llm = Lazy("llm client (crewai)", _create_llm)
+
+# Shared FAISS index written by build_index.py (run it once first), loaded on first use (see kb_runtime.py)
+kb = KBRuntime(os.path.join(os.path.dirname(__file__), "..", "faiss_index"), k=3)
 
 # Agent 1: KB Agent tool (vector search)
 @tool
 def search_knowledge_base(query: str) -> str:
     """Knowledge Base Agent: Search product knowledge base using vector search."""
-    docs = retriever.invoke(query)
-    context = "\n\n".join([doc.page_content for doc in docs])
-    sources = ", ".join({os.path.basename(doc.metadata.get('source', 'Unknown')) for doc in docs})
-    return f"Sources: {sources}\n\n{context}"
+    return kb.search(query)
 
 def main():
-    llm = LLM(model="gpt-3.5-turbo", temperature=0.7)
+    parser = argparse.ArgumentParser(description="CrewAI customer support (2-agent RAG)")
+    parser.add_argument("--no-warmup", action="store_true", help="Load the KB index on first search, not in the background")
+    args = parser.parse_args()
+    if not args.no_warmup:
+        kb.warm_up()  # index loads while the LLM client is set up below
+    llm.get()
+
     print("📚 CrewAI Customer Support (2-Agent RAG)\n" + "=" * 60)
 
     # Agent 2: Support Agent (uses KB Agent tool)
@@ -39,7 +51,7 @@ def main():
         goal="Help customers with smartphone questions using the knowledge base",
         backstory="Friendly TechStore support agent who consults product docs.",
         tools=[search_knowledge_base],
-        llm=llm,
+        llm=llm.get(),
         verbose=False
     )
 
@@ -52,6 +64,12 @@ def main():
     for i, query in enumerate(queries, 1):
         print(f"\n{'='*60}\n🧑 Customer Query {i}: {query}\n{'='*60}")
 
+        # Step 0: Reuse the answer to a near-identical earlier question (same index version)
+        cached, cache_key = kb.cached_answer(query)
+        if cached is not None:
+            print(f"⚡ [Answer Cache] Reusing the answer to a similar question\n💬 Support Agent: {cached}\n")
+            continue
+
         task = Task(
             description=f"Answer: {query}",
             agent=support_agent,
@@ -60,7 +78,11 @@ def main():
 
         crew = Crew(agents=[support_agent], tasks=[task], verbose=False)
         result = crew.kickoff()
+        kb.store_answer(cache_key, str(result))
         print(f"💬 Support Agent: {result}\n")
 
+    print(kb.report())
+    print("🚀 Startup time by component:\n" + startup.report())
+
 if __name__ == "__main__":
     main()
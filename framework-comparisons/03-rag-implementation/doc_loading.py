@@ -0,0 +1,182 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Structure-Aware Document Loading for RAG Examples
+Loads .txt/.md/.rst product docs and splits them on headings, spec sections and tables,
+falling back to RecursiveCharacterTextSplitter only for sections that are still too large.
+"""
+
+import os
+import re
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from product_router import product_metadata
+
+SUPPORTED_EXTENSIONS = (".txt", ".md", ".markdown", ".rst")
+MARKDOWN_EXTENSIONS = (".md", ".markdown")
+SPLITTER_VERSION = "structure-aware-v3"
+
+MD_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+# Spec-sheet section label, e.g. "Camera System:" on its own line
+SPEC_LABEL = re.compile(r"^([A-Z][^:\n]{0,80}):\s*$")
+# reStructuredText / setext underline, e.g. "=====" or "-----"
+UNDERLINE = re.compile(r"^([=\-~^*+#])\1{2,}\s*$")
+
+
+def is_supported(path: str) -> bool:
+    return path.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def markdown_sections(text: str) -> list:
+    """Split markdown into (heading path, text) sections. Code fences are never split on."""
+    sections, path, lines, in_code = [], [], [], False
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        match = None if in_code else MD_HEADING.match(line)
+        if match:
+            sections.append((list(path), "\n".join(lines)))
+            level = len(match.group(1))
+            path = path[:level - 1] + [""] * max(0, level - 1 - len(path)) + [match.group(2).strip()]
+            lines = [line]
+        else:
+            lines.append(line)
+    sections.append((list(path), "\n".join(lines)))
+    return sections
+
+
+def text_sections(text: str) -> list:
+    """Split plain-text spec sheets on "Label:" lines and underlined headings.
+
+    The first non-empty line is treated as the document title.
+    """
+    raw = text.splitlines()
+    title = next((line.strip() for line in raw if line.strip()), "")
+    sections, label, lines = [], None, []
+    for i, line in enumerate(raw):
+        next_line = raw[i + 1] if i + 1 < len(raw) else ""
+        is_heading = bool(SPEC_LABEL.match(line)) or (line.strip() and UNDERLINE.match(next_line))
+        if is_heading and line.strip() != title:
+            sections.append(([title, label] if label else [title], "\n".join(lines)))
+            label, lines = line.strip().rstrip(":"), [line]
+        else:
+            lines.append(line)
+    sections.append(([title, label] if label else [title], "\n".join(lines)))
+    return sections
+
+
+def _blocks(text: str) -> list:
+    """Separate table blocks (consecutive '|' rows) from prose: [(is_table, text)]."""
+    blocks, current, current_is_table = [], [], False
+    for line in text.splitlines():
+        is_table = line.lstrip().startswith("|")
+        if current and is_table != current_is_table:
+            blocks.append((current_is_table, "\n".join(current)))
+            current = []
+        current_is_table = is_table
+        current.append(line)
+    if current:
+        blocks.append((current_is_table, "\n".join(current)))
+    return blocks
+
+
+def _split_table(table: str, chunk_size: int) -> list:
+    """Split a large table on row boundaries, repeating the header rows in every piece."""
+    rows = table.splitlines()
+    header_len = 2 if len(rows) > 1 and set(rows[1].replace("|", "").strip()) <= set("-: ") else 1
+    header, body = rows[:header_len], rows[header_len:]
+    pieces, current = [], list(header)
+    for row in body:
+        if len(current) > header_len and len("\n".join(current + [row])) > chunk_size:
+            pieces.append("\n".join(current))
+            current = list(header)
+        current.append(row)
+    pieces.append("\n".join(current))
+    return pieces
+
+
+class StructureAwareSplitter:
+    """Loader + splitter stage used by build_index.py."""
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+        self.chunk_size = chunk_size
+        # Adjacent small sections under the same parent are merged up to this size
+        self.merge_size = chunk_size // 2
+        self.fallback = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    def sections(self, path: str, text: str) -> list:
+        if path.lower().endswith(MARKDOWN_EXTENSIONS):
+            return markdown_sections(text)
+        return text_sections(text)
+
+    def _pieces(self, text: str) -> list:
+        if len(text) <= self.chunk_size:
+            return [text]
+        pieces = []
+        for is_table, block in _blocks(text):
+            if not block.strip():
+                continue
+            if len(block) <= self.chunk_size:
+                pieces.append(block)
+            elif is_table:
+                pieces.extend(_split_table(block, self.chunk_size))
+            else:
+                pieces.extend(self.fallback.split_text(block))
+        return pieces
+
+    def _merged(self, sections: list) -> list:
+        """Merge consecutive small sections that share a parent heading."""
+        merged = []
+        for heading_path, text in sections:
+            text = text.strip()
+            # A heading with nothing under it (title line, parent of subsections) is carried
+            # by the breadcrumbs of the chunks below it instead of becoming a chunk of its own
+            body = text.split("\n", 1)[1] if heading_path and "\n" in text else ("" if heading_path else text)
+            if not body.strip():
+                continue
+            parent = heading_path[:-1]
+            if merged:
+                last_parent, last_path, last_text = merged[-1]
+                if last_parent == parent and len(last_text) + len(text) + 2 <= self.merge_size:
+                    merged[-1] = (parent, last_path, f"{last_text}\n\n{text}")
+                    continue
+            merged.append((parent, heading_path, text))
+        return merged
+
+    def split_file(self, path: str) -> list:
+        """Load one file and return its chunks as Documents (source, section, chunk_index, products, brand)."""
+        with open(path, "r", encoding="utf-8") as f:
+            return self.split_text(path, f.read())
+
+    def split_text(self, path: str, text: str) -> list:
+        """Split already-loaded file contents (path picks the format and becomes the source)."""
+        documents = []
+        # A product named in the file's title line applies to every chunk of the file
+        title = next((line.lstrip("#").strip() for line in text.splitlines() if line.strip()), "")
+        for parent, heading_path, section_text in self._merged(self.sections(path, text)):
+            # Prefix each chunk with its parent headings so it stays self-describing
+            breadcrumb = " > ".join(h for h in parent if h)
+            for piece in self._pieces(section_text):
+                content = f"{breadcrumb}\n\n{piece}" if breadcrumb else piece
+                documents.append(Document(
+                    page_content=content,
+                    # chunk_index = position in the file, lets the context packer merge neighbours
+                    metadata={
+                        "source": path,
+                        "section": " > ".join(h for h in heading_path if h),
+                        "chunk_index": len(documents),
+                        **product_metadata(title, content),
+                    },
+                ))
+        return documents
+
+
+def list_documents(docs_path: str) -> dict:
+    """Map relative path -> absolute path for every supported document in the corpus."""
+    files = {}
+    for root, _, names in os.walk(docs_path):
+        for name in names:
+            if is_supported(name):
+                abs_path = os.path.join(root, name)
+                files[os.path.relpath(abs_path, docs_path)] = abs_path
+    return dict(sorted(files.items()))
@@ -0,0 +1,153 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Persistent Embedding Cache for RAG Examples
+SQLite-backed cache keyed by (model, dimensions, text hash), shared by build_index.py and every KB agent.
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "embeddings.sqlite")
+DEFAULT_MAX_ENTRIES = 200_000
+SQLITE_MAX_PARAMS = 900  # stay under SQLite's bound-parameter limit per statement
+
+
+class EmbeddingCache:
+    """On-disk vector cache with least-recently-used eviction and hit/miss counters."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, keys: list) -> dict:
+        """Return {key: vector} for the keys present in the cache and mark them as recently used."""
+        found = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), SQLITE_MAX_PARAMS):
+                batch = keys[start:start + SQLITE_MAX_PARAMS]
+                marks = ",".join("?" * len(batch))
+                rows = self._conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", batch)
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+                if found:
+                    self._conn.execute(f"UPDATE embeddings SET last_used = ? WHERE key IN ({marks})", [now, *batch])
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items: dict):
+        """Store {key: vector} and evict the least recently used entries beyond max_entries."""
+        now = time.time()
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in items.items()]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows)
+            self._entries += self._conn.total_changes - before
+            if self._entries > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Trim to 90% of the bound so eviction runs once per batch of inserts, not on every insert
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = self._entries - int(self.max_entries * 0.9)
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)", (excess,)
+        )
+        self._entries -= excess
+        self.evictions += excess
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": self._entries,
+            "evictions": self.evictions,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain Embeddings wrapper that only sends cache misses to the underlying embedder."""
+
+    def __init__(self, embedder: Embeddings, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+        model = getattr(embedder, "model", type(embedder).__name__)
+        dimensions = getattr(embedder, "dimensions", None) or "default"
+        self.namespace = f"{model}:{dimensions}"
+
+    def _key(self, text: str) -> str:
+        return f"{self.namespace}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def embed_documents(self, texts: list) -> list:
+        keys = [self._key(text) for text in texts]
+        cached = self.cache.get_many(keys)
+        # Embed each distinct missing text once, even if it repeats within the batch
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = self.embedder.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(fresh)
+            cached.update(fresh)
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> list:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: list) -> list:
+        """Async embed_documents: SQLite lookups run in a worker thread, misses go to the async embedder."""
+        keys = [self._key(text) for text in texts]
+        cached = await asyncio.to_thread(self.cache.get_many, keys)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = await self.embedder.aembed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            await asyncio.to_thread(self.cache.put_many, fresh)
+            cached.update(fresh)
+        return [cached[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> list:
+        return (await self.aembed_documents([text]))[0]
+
+
+def cached_embeddings(embedder: Embeddings) -> CachedEmbeddings:
+    """Wrap an embedder with the shared on-disk cache (path/size configurable via env)."""
+    cache = EmbeddingCache(
+        path=os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH),
+        max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+    )
+    return CachedEmbeddings(embedder, cache)
@@ -0,0 +1,281 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Search Index Types for RAG Examples
+Builds the index the KB agents search (flat, IVF, HNSW, IVF-PQ) from the canonical flat vectors.
+
+index.faiss stays a flat L2 index: it is the lossless copy incremental builds update.
+search.faiss + index_info.json describe the (optional) approximate index derived from it.
+
+Compressed search indexes keep fewer bytes per vector in RAM: the first `dims` dimensions only
+(text-embedding-3 vectors are Matryoshka-trained, so a renormalized prefix is a valid embedding)
+and/or fp16 / int8 scalar-quantized codes. They fetch `oversample` x k candidates and re-rank them
+exactly against rerank.npy, the full float32 vectors, memory-mapped so only candidate rows are read.
+"""
+
+import os
+import json
+import math
+import time
+import uuid
+import numpy as np
+import faiss
+
+SEARCH_INDEX_FILE = "search.faiss"
+INDEX_INFO_FILE = "index_info.json"
+RERANK_FILE = "rerank.npy"
+INDEX_TYPES = ("flat-l2", "flat-ip", "ivf-flat", "hnsw", "ivf-pq")
+STORAGE_TYPES = ("float32", "fp16", "int8")
+
+_SQ_TYPES = {"fp16": faiss.ScalarQuantizer.QT_fp16, "int8": faiss.ScalarQuantizer.QT_8bit}
+
+# FAISS warns below ~39 training points per centroid
+MIN_POINTS_PER_CENTROID = 39
+
+
+def default_nlist(count: int) -> int:
+    """Rule of thumb: ~4*sqrt(n) inverted lists, limited by the training points available."""
+    return max(1, min(int(4 * math.sqrt(count)), count // MIN_POINTS_PER_CENTROID))
+
+
+class IndexSpec:
+    """Index type plus its build-time and search-time parameters."""
+
+    def __init__(self, index_type: str = "flat-l2", nlist: int = None, nprobe: int = 8,
+                 hnsw_m: int = 32, ef_construction: int = 200, ef_search: int = 64,
+                 pq_m: int = 64, pq_bits: int = 8, dims: int = None, storage: str = "float32", oversample: int = 4):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type {index_type!r}, expected one of {', '.join(INDEX_TYPES)}")
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"Unknown storage {storage!r}, expected one of {', '.join(STORAGE_TYPES)}")
+        if index_type == "ivf-pq" and storage != "float32":
+            raise ValueError("ivf-pq already stores compressed codes, use storage float32 with it")
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.pq_m = pq_m
+        self.pq_bits = pq_bits
+        self.dims = dims
+        self.storage = storage
+        self.oversample = oversample
+
+    @property
+    def normalize(self) -> bool:
+        return self.index_type == "flat-ip"
+
+    @property
+    def compressed(self) -> bool:
+        """Truncated and/or scalar-quantized vectors: searched with oversampling + exact re-rank."""
+        return bool(self.dims) or self.storage != "float32"
+
+    def label(self) -> str:
+        if self.index_type in ("ivf-flat", "ivf-pq"):
+            extra = f",pq{self.pq_m}x{self.pq_bits}" if self.index_type == "ivf-pq" else ""
+            label = f"{self.index_type}(nlist={self.nlist or 'auto'},nprobe={self.nprobe}{extra})"
+        elif self.index_type == "hnsw":
+            label = f"hnsw(M={self.hnsw_m},efC={self.ef_construction},efS={self.ef_search})"
+        else:
+            label = self.index_type
+        if self.compressed:
+            label += f"[{f'd={self.dims},' if self.dims else ''}{self.storage},rerank x{self.oversample}]"
+        return label
+
+
+def truncate_vectors(vectors: np.ndarray, dims: int) -> np.ndarray:
+    """First dims dimensions of each vector, renormalized to unit length (Matryoshka truncation)."""
+    truncated = np.ascontiguousarray(vectors[:, :dims], dtype=np.float32)
+    faiss.normalize_L2(truncated)
+    return truncated
+
+
+def build_search_index(vectors: np.ndarray, spec: IndexSpec):
+    """Train (if needed) and fill an index of spec's type. Row i of vectors becomes id i."""
+    count, dim = vectors.shape
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if spec.dims:
+        if spec.dims > dim:
+            raise ValueError(f"dims={spec.dims} exceeds the vector dimension {dim}")
+        vectors = truncate_vectors(vectors, spec.dims)
+        dim = spec.dims
+    sq_type = _SQ_TYPES.get(spec.storage)
+    quantized = sq_type is not None  # QT_8bit is 0, so test for None rather than truthiness
+
+    if spec.index_type == "flat-l2":
+        index = faiss.IndexScalarQuantizer(dim, sq_type, faiss.METRIC_L2) if quantized else faiss.IndexFlatL2(dim)
+    elif spec.index_type == "flat-ip":
+        # Inner product on unit vectors == cosine similarity
+        vectors = vectors.copy()
+        faiss.normalize_L2(vectors)
+        if quantized:
+            index = faiss.IndexScalarQuantizer(dim, sq_type, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexFlatIP(dim)
+    elif spec.index_type == "hnsw":
+        index = faiss.IndexHNSWSQ(dim, sq_type, spec.hnsw_m) if quantized else faiss.IndexHNSWFlat(dim, spec.hnsw_m)
+        index.hnsw.efConstruction = spec.ef_construction
+    else:
+        nlist = spec.nlist or default_nlist(count)
+        if count < nlist:
+            raise ValueError(f"{spec.index_type} with nlist={nlist} needs at least {nlist} vectors, got {count}")
+        quantizer = faiss.IndexFlatL2(dim)
+        if spec.index_type == "ivf-flat" and quantized:
+            index = faiss.IndexIVFScalarQuantizer(quantizer, dim, nlist, sq_type)
+        elif spec.index_type == "ivf-flat":
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist)
+        else:
+            if dim % spec.pq_m:
+                raise ValueError(f"pq_m={spec.pq_m} must divide the vector dimension {dim}")
+            if count < 2 ** spec.pq_bits:
+                raise ValueError(f"ivf-pq with {spec.pq_bits}-bit codes needs at least {2 ** spec.pq_bits} vectors")
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, spec.pq_m, spec.pq_bits)
+        index.train(vectors)
+        spec.nlist = nlist
+
+    if not index.is_trained:
+        index.train(vectors)  # int8 codes learn per-dimension ranges
+    index.add(vectors)
+    apply_search_params(index, spec.index_type, nprobe=spec.nprobe, ef_search=spec.ef_search)
+    return index
+
+
+def apply_search_params(index, index_type: str, nprobe: int = None, ef_search: int = None):
+    """Set the query-time knobs (nprobe for IVF, efSearch for HNSW)."""
+    if index_type in ("ivf-flat", "ivf-pq") and nprobe:
+        faiss.extract_index_ivf(index).nprobe = nprobe
+    elif index_type == "hnsw" and ef_search:
+        index.hnsw.efSearch = ef_search
+
+
+def filtered_search_params(index, selector):
+    """SearchParameters restricting index.search to selector's ids, with the index's nprobe/efSearch."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    return faiss.SearchParameters(sel=selector)
+
+
+def canonical_vectors(index) -> np.ndarray:
+    """All vectors of the canonical flat index, in row order."""
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def rerank_vectors(vectors: np.ndarray, spec: IndexSpec) -> np.ndarray:
+    """Full-precision vectors compressed indexes re-rank against (unit length for inner product)."""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if spec.normalize:
+        vectors = vectors.copy()
+        faiss.normalize_L2(vectors)
+    return vectors
+
+
+def exact_rerank(vectors: np.ndarray, queries: np.ndarray, candidates: np.ndarray, k: int,
+                 inner_product: bool) -> tuple:
+    """Exact scores of each query's candidate rows -> (distances, rows) of the best k, like index.search."""
+    distances = np.full((len(queries), k), -np.inf if inner_product else np.inf, dtype=np.float32)
+    rows = np.full((len(queries), k), -1, dtype=np.int64)
+    for i, (query, cand) in enumerate(zip(queries, candidates)):
+        cand = np.unique(cand[cand != -1])  # sorted rows: sequential reads from the memory map
+        if not len(cand):
+            continue
+        block = np.asarray(vectors[cand], dtype=np.float32)
+        scores = block @ query if inner_product else ((block - query) ** 2).sum(axis=1)
+        best = np.argsort(-scores if inner_product else scores, kind="stable")[:k]
+        rows[i, :len(best)] = cand[best]
+        distances[i, :len(best)] = scores[best]
+    return distances, rows
+
+
+def search_compressed(index, full_vectors: np.ndarray, queries: np.ndarray, k: int, info: dict,
+                      params=None) -> tuple:
+    """Oversampled search of a compressed index, then exact re-rank with full queries and vectors."""
+    search_queries = truncate_vectors(queries, info["dims"]) if info.get("dims") else queries
+    _, candidates = index.search(search_queries, k * info["oversample"], params=params)
+    return exact_rerank(full_vectors, queries, candidates, k, inner_product=info["normalize"])
+
+
+def compression_report(index, index_file: str, full_vectors: np.ndarray, info: dict, k: int = 10,
+                       queries: int = 200, seed: int = 0) -> dict:
+    """Search index size (index_file on disk) vs. full float32 vectors, and recall@k vs. exact search
+    before/after re-rank.
+
+    Queries are perturbed copies of stored vectors, so they land near real data.
+    """
+    rng = np.random.default_rng(seed)
+    k = min(k, len(full_vectors))
+    picks = np.sort(rng.choice(len(full_vectors), min(queries, len(full_vectors)), replace=False))
+    sample = full_vectors[picks] + 0.01 * rng.standard_normal((len(picks), full_vectors.shape[1])).astype(np.float32)
+    if info["normalize"]:
+        faiss.normalize_L2(sample)
+    metric = faiss.METRIC_INNER_PRODUCT if info["normalize"] else faiss.METRIC_L2
+    _, truth = faiss.knn(sample, full_vectors, k, metric=metric)
+    search_queries = truncate_vectors(sample, info["dims"]) if info.get("dims") else sample
+    _, raw = index.search(search_queries, k)
+    _, reranked = search_compressed(index, full_vectors, sample, k, info)
+
+    def recall(found):
+        return float(np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)]))
+
+    full_mb = full_vectors.nbytes / 1e6
+    search_mb = os.path.getsize(index_file) / 1e6
+    return {
+        "full_mb": full_mb,
+        "search_mb": search_mb,
+        "saved_ratio": 1 - search_mb / full_mb if full_mb else 0.0,
+        "k": k,
+        "recall_at_k": recall(raw),
+        "recall_at_k_reranked": recall(reranked),
+    }
+
+
+def format_compression_report(report: dict) -> str:
+    return (f"   Search index {report['search_mb']:.1f} MB vs {report['full_mb']:.1f} MB full float32 "
+            f"({report['saved_ratio']:.0%} smaller)\n"
+            f"   recall@{report['k']}: {report['recall_at_k']:.3f} compressed, "
+            f"{report['recall_at_k_reranked']:.3f} after exact re-rank")
+
+
+def write_search_index(index_path: str, canonical_index, spec: IndexSpec) -> dict:
+    """Derive and persist the search index for spec. Uncompressed flat L2 searches index.faiss directly."""
+    search_path = os.path.join(index_path, SEARCH_INDEX_FILE)
+    rerank_path = os.path.join(index_path, RERANK_FILE)
+    # A fresh version per build lets KB agents detect the rebuild and key their caches on it
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    info = {"version": version, "index_type": spec.index_type, "normalize": spec.normalize, "label": spec.label()}
+    if spec.index_type == "flat-l2" and not spec.compressed:
+        if os.path.exists(search_path):
+            os.remove(search_path)
+    else:
+        vectors = canonical_vectors(canonical_index)
+        index = build_search_index(vectors, spec)
+        info.update({"nlist": spec.nlist, "nprobe": spec.nprobe, "ef_search": spec.ef_search})
+        faiss.write_index(index, search_path + ".tmp")
+        os.replace(search_path + ".tmp", search_path)
+    if spec.compressed:
+        full_vectors = rerank_vectors(vectors, spec)
+        with open(rerank_path + ".tmp", "wb") as f:
+            np.save(f, full_vectors)
+        os.replace(rerank_path + ".tmp", rerank_path)
+        info.update({"dims": spec.dims, "storage": spec.storage, "oversample": spec.oversample})
+        info["compression"] = compression_report(index, search_path, full_vectors, info)
+    elif os.path.exists(rerank_path):
+        os.remove(rerank_path)
+    # Written last and atomically: readers treat a new index_info.json as "build complete"
+    info_path = os.path.join(index_path, INDEX_INFO_FILE)
+    with open(info_path + ".tmp", "w") as f:
+        json.dump(info, f, indent=2)
+    os.replace(info_path + ".tmp", info_path)
+    return info
+
+
+def load_index_info(index_path: str) -> dict:
+    """index_info.json of an index directory (flat L2 if the build predates index types)."""
+    path = os.path.join(index_path, INDEX_INFO_FILE)
+    if not os.path.exists(path):
+        return {"index_type": "flat-l2", "normalize": False}
+    with open(path, "r") as f:
+        return json.load(f)
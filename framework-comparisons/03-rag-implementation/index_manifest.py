@@ -0,0 +1,103 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Index Manifest for Incremental Builds
+Records per-file and per-chunk content hashes so build_index.py only re-embeds what changed.
+"""
+
+import os
+import json
+import hashlib
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 of a string (used for chunk ids)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file's bytes, read in blocks so large files stay cheap."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_ids(source_key: str, texts: list) -> list:
+    """Stable chunk ids derived from source + chunk text.
+
+    Identical text inside one file gets an occurrence suffix so ids stay unique,
+    while an unchanged chunk keeps its id (and its vector) when other parts of the file change.
+    """
+    seen = {}
+    ids = []
+    for text in texts:
+        base = hash_text(f"{source_key}\0{text}")[:32]
+        count = seen.get(base, 0)
+        seen[base] = count + 1
+        ids.append(base if count == 0 else f"{base}-{count}")
+    return ids
+
+
+class IndexManifest:
+    """Per-file state of the last build: content hash, stat signature and chunk ids."""
+
+    def __init__(self, files: dict = None, settings: dict = None):
+        # relative path -> {"hash": str, "size": int, "mtime_ns": int, "chunks": [chunk ids]}
+        self.files = files or {}
+        # Build settings (splitter, embedding model) - a change forces a full rebuild
+        self.settings = settings or {}
+
+    @classmethod
+    def load(cls, index_path: str):
+        """Load the manifest from an index directory, or None if there is none."""
+        path = os.path.join(index_path, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            return None
+        return cls(files=data.get("files", {}), settings=data.get("settings", {}))
+
+    def save(self, index_path: str):
+        """Write the manifest next to the index (temp file + rename so readers never see half a file)."""
+        path = os.path.join(index_path, MANIFEST_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "settings": self.settings, "files": self.files}, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def all_chunk_ids(self) -> list:
+        return [cid for entry in self.files.values() for cid in entry["chunks"]]
+
+    def file_changed(self, rel_path: str, abs_path: str) -> bool:
+        """True if a file is new or its content differs from the last build.
+
+        Size + mtime are checked first so unchanged files are not re-hashed.
+        """
+        entry = self.files.get(rel_path)
+        if entry is None:
+            return True
+        stat = os.stat(abs_path)
+        if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return False
+        if hash_file(abs_path) != entry["hash"]:
+            return True
+        # Touched but identical: refresh the stat signature so the next run skips hashing
+        entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+        return False
+
+    def record(self, rel_path: str, abs_path: str, ids: list, file_hash: str = None):
+        """Store the current state of a file after it has been indexed."""
+        stat = os.stat(abs_path)
+        self.files[rel_path] = {
+            "hash": file_hash or hash_file(abs_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "chunks": ids,
+        }
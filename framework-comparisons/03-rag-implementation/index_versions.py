@@ -0,0 +1,90 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Versioned Index Directories for RAG Examples
+Every build writes a complete index into its own directory and publishes it by atomically
+rewriting the `current` pointer, so running KB agents never read a half-written build and pick
+up the new one without restarting (see ChunkStoreRetriever.check_for_rebuild).
+
+Layout (faiss_index/):
+    current                   name of the published version (replaced atomically)
+    versions/<version>/       index.faiss, chunks/, bm25/, partitions/, shards/, index_info.json, ...
+An index directory without `current` (built before versioning) is read in place.
+
+Readers open every file of a build when they load it (IndexSnapshot), so pruning a version an
+agent still serves only unlinks names: the open files and mappings stay valid until it swaps.
+"""
+
+import os
+import time
+import uuid
+import shutil
+
+VERSIONS_DIR = "versions"
+CURRENT_FILE = "current"
+DEFAULT_KEEP_VERSIONS = 3  # older versions may still be mapped by agents that have not swapped yet
+
+
+def current_version(index_path: str):
+    """Name of the published version, or None for an unversioned index directory."""
+    try:
+        with open(os.path.join(index_path, CURRENT_FILE), "r") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def directory_version(index_dir: str):
+    """Version name of a build directory under versions/, or None for an unversioned directory."""
+    parent, name = os.path.split(os.path.normpath(index_dir))
+    return name if os.path.basename(parent) == VERSIONS_DIR else None
+
+
+def resolve_index_dir(index_path: str) -> str:
+    """Directory holding the published build's files."""
+    version = current_version(index_path)
+    return os.path.join(index_path, VERSIONS_DIR, version) if version else index_path
+
+
+def new_version_dir(index_path: str, copy_from: str = None) -> str:
+    """Create the directory for the next build, seeded with a copy of copy_from (incremental builds).
+
+    Files are copied, not hard-linked: some writers (faiss.write_index) rewrite files in place.
+    """
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    path = os.path.join(index_path, VERSIONS_DIR, version)
+    if copy_from and os.path.isdir(copy_from):
+        shutil.copytree(copy_from, path, ignore=shutil.ignore_patterns(VERSIONS_DIR, CURRENT_FILE, "*.tmp"))
+    else:
+        os.makedirs(path)
+    return path
+
+
+def publish(index_path: str, version_dir: str, keep: int = DEFAULT_KEEP_VERSIONS) -> str:
+    """Point `current` at version_dir (atomic rename), then prune all but the newest `keep` versions."""
+    version = os.path.basename(os.path.normpath(version_dir))
+    pointer = os.path.join(index_path, CURRENT_FILE)
+    with open(pointer + ".tmp", "w") as f:
+        f.write(version + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(pointer + ".tmp", pointer)
+    prune_versions(index_path, keep)
+    return version
+
+
+def discard(version_dir: str):
+    """Remove an unpublished build directory (e.g. a build that changed nothing)."""
+    shutil.rmtree(version_dir, ignore_errors=True)
+
+
+def prune_versions(index_path: str, keep: int = DEFAULT_KEEP_VERSIONS):
+    """Delete the oldest versions beyond keep (never the published one)."""
+    root = os.path.join(index_path, VERSIONS_DIR)
+    if not os.path.isdir(root):
+        return
+    current = current_version(index_path)
+    versions = sorted(os.listdir(root))  # names start with a timestamp
+    for version in versions[:-keep] if keep > 0 else versions:
+        if version != current:
+            shutil.rmtree(os.path.join(root, version), ignore_errors=True)
@@ -0,0 +1,241 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Streaming Ingestion Pipeline for RAG Examples
+Overlaps three stages with bounded queues so peak memory is bounded by queue sizes, not corpus size:
+
+    read + split (process pool) -> embed (concurrent token-sized batches) -> add to FAISS (main thread)
+"""
+
+import os
+import time
+import queue
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from langchain_community.vectorstores import FAISS
+from doc_loading import StructureAwareSplitter
+from index_manifest import chunk_ids
+from token_counting import load_encoding
+
+_DONE = object()  # end-of-stream marker passed through the queues
+
+# Per-process splitter/tokenizer, created once by the pool initializer
+_worker_splitter = None
+_worker_encoding = None
+
+
+def _init_worker(chunk_size: int, chunk_overlap: int):
+    global _worker_splitter, _worker_encoding
+    _worker_splitter = StructureAwareSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    _worker_encoding = load_encoding()
+
+
+def _read_and_split(rel_path: str, abs_path: str) -> dict:
+    """Stage 1 (worker process): read, hash, split and token-count one file."""
+    start = time.perf_counter()
+    with open(abs_path, "rb") as f:
+        raw = f.read()
+    splits = _worker_splitter.split_text(abs_path, raw.decode("utf-8"))
+    texts = [doc.page_content for doc in splits]
+    return {
+        "rel_path": rel_path,
+        "abs_path": abs_path,
+        "file_hash": hashlib.sha256(raw).hexdigest(),
+        "splits": splits,
+        "ids": chunk_ids(rel_path, texts),
+        "tokens": [len(tokens) for tokens in _worker_encoding.encode_ordinary_batch(texts)],
+        "seconds": time.perf_counter() - start,
+    }
+
+
+class StageStats:
+    """Items processed and time spent working vs. waiting on queues, for one stage."""
+
+    def __init__(self, name: str, unit: str, parallelism: int = 1):
+        self.name = name
+        self.unit = unit
+        self.parallelism = parallelism
+        self.items = 0
+        self.busy = 0.0    # summed work time across all workers of the stage
+        self.blocked = 0.0  # time the stage's driver spent waiting for input or output space
+        self._lock = threading.Lock()
+
+    def add(self, items: int, seconds: float):
+        with self._lock:
+            self.items += items
+            self.busy += seconds
+
+    def report(self, wall: float) -> str:
+        rate = self.items / self.busy if self.busy else 0.0
+        utilization = self.busy / (wall * self.parallelism) if wall else 0.0
+        return (f"{self.name:<8} {self.items:>8} {self.unit:<7} {rate:>10.1f} {self.unit}/s/worker "
+                f"utilization {utilization:>4.0%}  blocked {self.blocked:.2f}s")
+
+
+class IngestPipeline:
+    """Streams files through read/split -> embed -> index with bounded memory between stages."""
+
+    def __init__(self, embeddings, chunk_size: int = 1000, chunk_overlap: int = 200,
+                 split_workers: int = None, embed_concurrency: int = 4,
+                 batch_tokens: int = 50_000, queue_size: int = 64):
+        self.embeddings = embeddings
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.split_workers = split_workers or os.cpu_count() or 1
+        self.embed_concurrency = embed_concurrency
+        self.batch_tokens = batch_tokens
+        self.queue_size = queue_size
+        self.stats = {
+            "split": StageStats("split", "files", self.split_workers),
+            "embed": StageStats("embed", "chunks", self.embed_concurrency),
+            "index": StageStats("index", "chunks"),
+        }
+        self.wall = 0.0
+        self._error = None
+
+    def _fail(self, exc: BaseException):
+        if self._error is None:
+            self._error = exc
+
+    def _put(self, q: queue.Queue, item, stats: StageStats):
+        start = time.perf_counter()
+        q.put(item)
+        stats.blocked += time.perf_counter() - start
+
+    def _reader(self, files: list, on_file, chunk_queue: queue.Queue):
+        """Stage 1 driver: keeps at most 2x workers files in flight, forwards chunks as files finish."""
+        stats = self.stats["split"]
+        try:
+            with ProcessPoolExecutor(max_workers=self.split_workers, initializer=_init_worker,
+                                     initargs=(self.chunk_size, self.chunk_overlap)) as pool:
+                pending = set()
+                remaining = iter(files)
+                while True:
+                    while len(pending) < self.split_workers * 2 and self._error is None:
+                        item = next(remaining, None)
+                        if item is None:
+                            break
+                        pending.add(pool.submit(_read_and_split, *item))
+                    if not pending or self._error is not None:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        stats.add(1, result["seconds"])
+                        # on_file records the manifest and picks which chunks still need embedding
+                        keep = on_file(result)
+                        chunks = [(doc, cid, tokens)
+                                  for doc, cid, tokens in zip(result["splits"], result["ids"], result["tokens"])
+                                  if cid in keep]
+                        if chunks:
+                            self._put(chunk_queue, chunks, stats)
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            chunk_queue.put(_DONE)
+
+    def _embed_batch(self, batch: list) -> tuple:
+        start = time.perf_counter()
+        vectors = self.embeddings.embed_documents([doc.page_content for doc, _, _ in batch])
+        self.stats["embed"].add(len(batch), time.perf_counter() - start)
+        return batch, vectors
+
+    def _embedder(self, chunk_queue: queue.Queue, vector_queue: queue.Queue):
+        """Stage 2 driver: packs chunks into batches of ~batch_tokens and embeds them concurrently."""
+        stats = self.stats["embed"]
+        slots = threading.Semaphore(self.embed_concurrency)
+
+        def submit(pool, batch):
+            start = time.perf_counter()
+            slots.acquire()
+            stats.blocked += time.perf_counter() - start
+            future = pool.submit(self._embed_batch, batch)
+            # The slot is released only once the result is queued, so blocked results count as in flight
+            future.add_done_callback(lambda f: (forward(f), slots.release()))
+
+        def forward(future):
+            if future.exception() is not None:
+                self._fail(future.exception())
+                return
+            self._put(vector_queue, future.result(), stats)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.embed_concurrency) as pool:
+                batch, batch_tokens = [], 0
+                while True:
+                    start = time.perf_counter()
+                    item = chunk_queue.get()
+                    stats.blocked += time.perf_counter() - start
+                    if item is _DONE:
+                        break
+                    if self._error is not None:
+                        continue  # keep draining so the reader never blocks on a full queue
+                    for chunk in item:
+                        if batch and batch_tokens + chunk[2] > self.batch_tokens:
+                            submit(pool, batch)
+                            batch, batch_tokens = [], 0
+                        batch.append(chunk)
+                        batch_tokens += chunk[2]
+                if batch and self._error is None:
+                    submit(pool, batch)
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            vector_queue.put(_DONE)
+
+    def run(self, files: list, on_file, vectorstore=None):
+        """Ingest [(rel_path, abs_path)] into vectorstore (created on the first batch if None).
+
+        on_file(result) is called once per split file with rel_path/abs_path/file_hash/ids and must
+        return the set of chunk ids to embed. Returns the (possibly new) vectorstore.
+        """
+        start = time.perf_counter()
+        chunk_queue = queue.Queue(maxsize=self.queue_size)
+        vector_queue = queue.Queue(maxsize=self.queue_size)
+        threads = [
+            threading.Thread(target=self._reader, args=(files, on_file, chunk_queue), daemon=True),
+            threading.Thread(target=self._embedder, args=(chunk_queue, vector_queue), daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        # Stage 3 (this thread): add finished batches to the index as they arrive
+        stats = self.stats["index"]
+        while True:
+            wait_start = time.perf_counter()
+            item = vector_queue.get()
+            stats.blocked += time.perf_counter() - wait_start
+            if item is _DONE:
+                break
+            if self._error is not None:
+                continue  # keep draining so the embed stage can finish and shut down
+            batch, vectors = item
+            add_start = time.perf_counter()
+            text_embeddings = [(doc.page_content, vector) for (doc, _, _), vector in zip(batch, vectors)]
+            metadatas = [doc.metadata for doc, _, _ in batch]
+            ids = [cid for _, cid, _ in batch]
+            try:
+                if vectorstore is None:
+                    vectorstore = FAISS.from_embeddings(text_embeddings, self.embeddings, metadatas=metadatas, ids=ids)
+                else:
+                    vectorstore.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+            except BaseException as exc:
+                self._fail(exc)
+                continue
+            stats.add(len(batch), time.perf_counter() - add_start)
+
+        for thread in threads:
+            thread.join()
+        self.wall = time.perf_counter() - start
+        if self._error is not None:
+            raise self._error
+        return vectorstore
+
+    def report(self) -> str:
+        lines = [f"   Pipeline wall time: {self.wall:.2f}s"]
+        lines += [f"   {stats.report(self.wall)}" for stats in self.stats.values()]
+        # The stage with the highest utilization is the one the others are waiting on
+        bottleneck = max(self.stats.values(), key=lambda s: s.busy / s.parallelism)
+        lines.append(f"   Bottleneck: {bottleneck.name}")
+        return "\n".join(lines)
@@ -0,0 +1,81 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+In-Process Caches for the KB Agent
+LRU + TTL cache used for query embeddings and top-k search results.
+"""
+
+import re
+import time
+import threading
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Cache key for a customer query: case, spacing and trailing punctuation don't matter."""
+    return _WHITESPACE.sub(" ", text.strip().lower()).rstrip("?!. ")
+
+
+class LRUTTLCache:
+    """Thread-safe LRU cache whose entries also expire ttl_seconds after insertion."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Cached value, or None on a miss (including expired entries)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._data),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def format_cache_stats(stats: dict) -> str:
+    """One line per cache level, e.g. for the end of a product_qa.py run."""
+    return "\n".join(
+        f"   {name}: {s['hit_ratio']:.0%} hit ratio ({s['hits']} hits, {s['misses']} misses, {s['entries']} entries)"
+        for name, s in stats.items()
+    )
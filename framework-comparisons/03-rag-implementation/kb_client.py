@@ -0,0 +1,94 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Thin Client for the Local KB Retrieval Service
+Same `invoke(query)` / `search_many(queries)` shape (plus async variants) as ChunkStoreRetriever, so KB agents can switch to
+the shared kb_service.py process by setting KB_SERVICE_URL.
+"""
+
+import os
+import json
+import asyncio
+import threading
+import http.client
+from urllib.parse import urlparse
+from langchain_core.documents import Document
+
+
+class KBServiceClient:
+    """HTTP client for kb_service.py with one keep-alive connection per thread."""
+
+    def __init__(self, url: str, k: int = 3, timeout: float = 30.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.k = k
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @classmethod
+    def from_env(cls, k: int = 3):
+        """Client for $KB_SERVICE_URL, or None when the service is not configured."""
+        url = os.getenv("KB_SERVICE_URL")
+        return cls(url, k=k) if url else None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _request(self, method: str, path: str, payload: dict = None) -> dict:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body else {}
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = json.loads(response.read())
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed an idle keep-alive connection: reconnect once
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise RuntimeError(f"KB service error {response.status}: {data.get('error')}")
+        return data
+
+    def invoke(self, query: str) -> list:
+        data = self._request("POST", "/search", {"query": query, "k": self.k})
+        return [self._document(d) for d in data["documents"]]
+
+    def search_many(self, queries: list, k: int = None) -> list:
+        """Top-k Documents for each query, in input order (one round trip, one server-side batch)."""
+        data = self._request("POST", "/search_many", {"queries": list(queries), "k": k or self.k})
+        return [[self._document(d) for d in docs] for docs in data["results"]]
+
+    async def ainvoke(self, query: str) -> list:
+        """invoke from an event loop: the request runs on a worker thread with its own keep-alive connection."""
+        return await asyncio.to_thread(self.invoke, query)
+
+    async def asearch_many(self, queries: list, k: int = None) -> list:
+        return await asyncio.to_thread(self.search_many, queries, k)
+
+    @staticmethod
+    def _document(d: dict) -> Document:
+        return Document(id=d["id"], page_content=d["page_content"], metadata=d["metadata"])
+
+    @property
+    def version(self) -> str:
+        """Index version the service is currently searching."""
+        return self._request("GET", "/health")["index_version"]
+
+    def metrics(self) -> dict:
+        return self._request("GET", "/metrics")
+
+    def latency_stats(self) -> dict:
+        return self.metrics()["retrieval"]
+
+    def cache_stats(self) -> dict:
+        return self.metrics()["cache"]
@@ -0,0 +1,428 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Shared KB Agent Retriever for RAG Examples
+Searches index.faiss and materializes only the top-k chunks from the memory-mapped chunk store.
+
+When the build wrote a BM25 index (bm25/), each query runs vector and keyword search
+concurrently and fuses both rankings with reciprocal rank fusion. A query naming a product
+only searches that product's chunks (partitions/), on both paths.
+
+With mmr on, both paths fetch mmr_candidates chunks and a second stage picks k of them with
+Maximal Marginal Relevance, so comparison questions get chunks from several files instead of
+k near-copies of one.
+
+Two in-process caches sit in front of the index:
+    L1  normalized query text -> query embedding           (skips the embedding API call)
+    L2  (normalized query, index version, k) -> top-k rows   (skips embedding and search)
+Publishing a new build (index_versions.py flips faiss_index/current) changes the index version:
+the new build is loaded on a background thread while queries keep using the old one, then both
+swap at once and L2 is dropped.
+
+The async API (ainvoke / asearch_many) awaits the embedding request on the embedder's async
+HTTP client and runs cache lookups, FAISS/BM25 search and chunk reads on a bounded thread pool,
+so an event loop keeps serving other conversations while one query is retrieved.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import faiss
+from chunk_store import ChunkStore, check_index_dir, INDEX_FILE, CHUNKS_DIR
+from index_factory import (SEARCH_INDEX_FILE, INDEX_INFO_FILE, RERANK_FILE, load_index_info, apply_search_params,
+                           filtered_search_params, search_compressed)
+from bm25_index import BM25Index, reciprocal_rank_fusion
+from product_router import ProductRouter
+from kb_cache import LRUTTLCache, normalize_query
+from index_versions import resolve_index_dir, directory_version
+
+LATENCY_WINDOW = 10_000  # most recent samples kept per metric
+
+
+class LatencyStats:
+    """Rolling window of latencies (ms) with percentile summaries."""
+
+    def __init__(self):
+        self.samples = deque(maxlen=LATENCY_WINDOW)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self, ms: float):
+        with self._lock:
+            self.samples.append(ms)
+            self.count += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            samples = np.asarray(self.samples)
+        if not len(samples):
+            return {"count": self.count}
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return {"count": self.count, "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+
+def format_latency_stats(stats: dict) -> str:
+    """One line per retrieval path, e.g. for the end of a product_qa.py run."""
+    return "\n".join(
+        f"   {name}: p50 {s['p50_ms']:.1f} ms, p99 {s['p99_ms']:.1f} ms ({s['count']} searches)"
+        for name, s in stats.items() if s["count"]
+    )
+
+
+def format_kb_result(docs: list, packer=None) -> str:
+    """KB Agent answer for one query: source file names, then the retrieved chunks.
+
+    With a ContextPacker, chunks are merged/deduplicated to its token budget instead of joined verbatim.
+    """
+    if packer is None:
+        context = "\n\n".join([doc.page_content for doc in docs])
+    else:
+        context, docs = packer.pack(docs)
+    sources = ", ".join({os.path.basename(doc.metadata.get('source', 'Unknown')) for doc in docs})
+    return f"Sources: {sources}\n\n{context}"
+
+
+def first_stage_relevance(scores: list, higher_is_better: bool) -> np.ndarray:
+    """First-stage scores (fused RRF, inner product or L2 distance) min-max scaled to [0, 1], best = 1."""
+    scores = np.asarray(scores, dtype=np.float32)
+    if not higher_is_better:
+        scores = -scores
+    spread = scores.max() - scores.min()
+    return (scores - scores.min()) / spread if spread > 0 else np.ones_like(scores)
+
+
+def maximal_marginal_relevance(relevance: np.ndarray, vectors: np.ndarray, k: int, lambda_mult: float = 0.7) -> list:
+    """Indexes of k rows of vectors, each maximizing lambda * relevance - (1 - lambda) * max similarity to picks.
+
+    relevance comes from the first stage (see first_stage_relevance), so a chunk ranked high by BM25
+    keeps its place; the vectors only measure redundancy. All cosine similarities come from one
+    matrix product; each pick updates the redundancy vector in place.
+    """
+    unit = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    similarity = unit @ unit.T
+    picks = [int(np.argmax(relevance))]
+    redundancy = similarity[picks[0]].copy()
+    for _ in range(1, min(k, len(vectors))):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[picks] = -np.inf
+        best = int(np.argmax(scores))
+        picks.append(best)
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return picks
+
+
+def read_index(path: str):
+    """Read a FAISS index, memory-mapping it where the index type supports it."""
+    return faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+
+
+class IndexSnapshot:
+    """Index + chunk store + build info of one build, swapped as a unit on reload."""
+
+    def __init__(self, index_path: str):
+        check_index_dir(index_path)
+        # Search the approximate index chosen at build time, if any, else the canonical flat index
+        self.index_path = index_path
+        self.info = load_index_info(index_path)
+        # Published builds are named by their directory; an index rebuilt in place by its build info
+        self.version = directory_version(index_path) or self.info.get("version", "unversioned")
+        compressed = "oversample" in self.info
+        index_file = INDEX_FILE if self.info["index_type"] == "flat-l2" and not compressed else SEARCH_INDEX_FILE
+        self.index = read_index(os.path.join(index_path, index_file))
+        apply_search_params(self.index, self.info["index_type"],
+                            nprobe=self.info.get("nprobe"), ef_search=self.info.get("ef_search"))
+        # Full float32 vectors for the exact re-rank of compressed indexes (only candidate rows are paged in)
+        self.rerank = np.load(os.path.join(index_path, RERANK_FILE), mmap_mode="r") if compressed else None
+        # Exact vectors for MMR when there is no re-rank matrix. Opened at load, not on first need,
+        # so pruning this version's directory cannot remove it from under a running agent.
+        self._canonical = self.index if index_file == INDEX_FILE else None
+        if self._canonical is None and self.rerank is None:
+            self._canonical = read_index(os.path.join(index_path, INDEX_FILE))
+        self.store = ChunkStore(os.path.join(index_path, CHUNKS_DIR))
+        self.bm25 = BM25Index.load(index_path)
+        self.router = ProductRouter.load(index_path)
+
+    def search(self, vectors: np.ndarray, k: int, selector=None) -> tuple:
+        """index.search (only over selector's rows, if given); compressed indexes oversample with
+        truncated queries and re-rank exactly."""
+        params = filtered_search_params(self.index, selector) if selector is not None else None
+        if self.rerank is None:
+            return self.index.search(vectors, k, params=params)
+        return search_compressed(self.index, self.rerank, vectors, k, self.info, params)
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Full-precision vectors of chunk rows (re-rank matrix, else the canonical flat index)."""
+        if self.rerank is not None:
+            return np.asarray(self.rerank[rows], dtype=np.float32)
+        return self._canonical.reconstruct_batch(rows)
+
+
+class ChunkStoreRetriever:
+    """Drop-in replacement for `vectorstore.as_retriever(search_kwargs={"k": k})`."""
+
+    def __init__(self, index_path: str, embeddings, k: int = 3, hybrid: bool = True, candidates: int = 20,
+                 cache_size: int = 4096, cache_ttl_seconds: float = 3600, reload_check_seconds: float = 2.0,
+                 search_workers: int = 4, mmr: bool = True, mmr_candidates: int = 50, mmr_lambda: float = 0.7):
+        self.index_path = index_path
+        self.embeddings = embeddings
+        self.k = k
+        self.hybrid = hybrid
+        self.candidates = candidates  # per-path depth fed into rank fusion
+        self.mmr = mmr
+        self.mmr_candidates = mmr_candidates  # first-stage depth the MMR stage picks k from
+        self.mmr_lambda = mmr_lambda  # 1.0 = pure relevance, lower = more diverse
+        self.latency = {name: LatencyStats() for name in ("vector", "bm25", "mmr")}
+        self._keyword_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bm25")
+        # Bounds how many async searches hit FAISS at once (each search already uses several cores)
+        self._search_pool = ThreadPoolExecutor(max_workers=search_workers, thread_name_prefix="kb-search")
+        self.reload_check_seconds = reload_check_seconds
+        self.query_embeddings = LRUTTLCache(cache_size, cache_ttl_seconds)
+        self.results = LRUTTLCache(cache_size, cache_ttl_seconds)
+        self._published = self._watch_published()
+        self._snapshot = IndexSnapshot(self._published[0])
+        self._last_check = time.monotonic()
+        self._reload_lock = threading.Lock()
+        self._reloading = False
+        self.reloads = 0
+
+    @property
+    def store(self) -> ChunkStore:
+        return self._snapshot.store
+
+    def __len__(self) -> int:
+        return len(self._snapshot.store)
+
+    @property
+    def version(self) -> str:
+        """Version of the build queries currently run against (the answer cache keys on it)."""
+        self.check_for_rebuild()
+        return self._snapshot.version
+
+    def _watch_published(self) -> tuple:
+        """(directory of the published build, mtime of its index_info.json): changes when a build lands."""
+        path = resolve_index_dir(self.index_path)
+        try:
+            return path, os.stat(os.path.join(path, INDEX_INFO_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return path, None
+
+    def check_for_rebuild(self):
+        """Start loading a newly published build in the background (checked at most every reload_check_seconds).
+
+        Queries never wait for the load: they use the old snapshot until the new one is complete.
+        """
+        now = time.monotonic()
+        if now - self._last_check < self.reload_check_seconds:
+            return
+        with self._reload_lock:
+            if now - self._last_check < self.reload_check_seconds or self._reloading:
+                return
+            self._last_check = now
+            published = self._watch_published()
+            if published == self._published:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, args=(published,), name="kb-reload", daemon=True).start()
+
+    def _reload(self, published: tuple):
+        try:
+            snapshot = IndexSnapshot(published[0])
+            if snapshot.version != self._snapshot.version:
+                self._snapshot = snapshot
+                self.results.clear()  # keys of the old version can never hit again
+                self.reloads += 1
+            self._published = published
+        except (OSError, ValueError, RuntimeError) as e:
+            # An unversioned directory mid-rebuild: retry on a later check
+            print(f"⚠️  KB index reload failed, still serving {self._snapshot.version}: {e}")
+        finally:
+            with self._reload_lock:
+                self._reloading = False
+
+    def embed_queries(self, queries: list, snapshot: IndexSnapshot = None) -> np.ndarray:
+        """Embed queries (one request for all L1 misses), as a float32 matrix ready for index.search."""
+        keys = [normalize_query(query) for query in queries]
+        vectors = [self.query_embeddings.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fresh = self.embeddings.embed_documents([queries[i] for i in missing])
+            for i, vector in zip(missing, fresh):
+                vectors[i] = np.asarray(vector, dtype=np.float32)
+                self.query_embeddings.put(keys[i], vectors[i])
+        return self._query_matrix(vectors, snapshot)
+
+    async def aembed_queries(self, queries: list, snapshot: IndexSnapshot = None) -> np.ndarray:
+        """embed_queries without blocking the event loop (awaits the embedder's async client)."""
+        keys = [normalize_query(query) for query in queries]
+        vectors = [self.query_embeddings.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fresh = await self.embeddings.aembed_documents([queries[i] for i in missing])
+            for i, vector in zip(missing, fresh):
+                vectors[i] = np.asarray(vector, dtype=np.float32)
+                self.query_embeddings.put(keys[i], vectors[i])
+        return self._query_matrix(vectors, snapshot)
+
+    def _query_matrix(self, vectors: list, snapshot: IndexSnapshot = None) -> np.ndarray:
+        matrix = np.vstack(vectors).astype(np.float32, copy=False)
+        if (snapshot or self._snapshot).info["normalize"]:
+            matrix = matrix.copy()
+            faiss.normalize_L2(matrix)
+        return matrix
+
+    def search_vectors(self, vectors: np.ndarray, k: int = None, snapshot: IndexSnapshot = None,
+                       selector=None) -> list:
+        """One vectorized index.search over a query matrix -> per query [(row, distance)]."""
+        snapshot = snapshot or self._snapshot
+        distances, rows = snapshot.search(vectors, k or self.k, selector)
+        return [
+            [(int(row), float(dist)) for row, dist in zip(row_ids, dists) if row != -1]
+            for row_ids, dists in zip(rows, distances)
+        ]
+
+    def _search(self, queries: list, k: int) -> tuple:
+        """Top-k rows per query through the L2 cache. Returns (snapshot, rows per query)."""
+        snapshot, keys, results, missing = self._lookup(queries, k)
+        if missing:
+            self._fill(keys, results, missing, self._search_missing([queries[i] for i in missing], k, snapshot))
+        return snapshot, results
+
+    async def _asearch(self, queries: list, k: int) -> tuple:
+        """_search for the event loop: only the embedding request runs on it, as an awaited HTTP call."""
+        loop = asyncio.get_running_loop()
+        snapshot, keys, results, missing = await loop.run_in_executor(self._search_pool, self._lookup, queries, k)
+        if missing:
+            pending = [queries[i] for i in missing]
+            started = time.perf_counter()
+            vectors = await self.aembed_queries(pending, snapshot)
+            found = await loop.run_in_executor(self._search_pool, self._search_missing,
+                                               pending, k, snapshot, vectors, started)
+            self._fill(keys, results, missing, found)
+        return snapshot, results
+
+    def _lookup(self, queries: list, k: int) -> tuple:
+        """(snapshot, L2 keys, cached rows or None per query, indexes of the misses)."""
+        self.check_for_rebuild()
+        snapshot = self._snapshot
+        keys = [(normalize_query(query), snapshot.version, k) for query in queries]
+        results = [self.results.get(key) for key in keys]
+        missing = [i for i, rows in enumerate(results) if rows is None]
+        return snapshot, keys, results, missing
+
+    def _fill(self, keys: list, results: list, missing: list, found: list):
+        for i, rows in zip(missing, found):
+            results[i] = rows
+            self.results.put(keys[i], rows)
+
+    def _search_missing(self, queries: list, k: int, snapshot: IndexSnapshot,
+                        vectors: np.ndarray = None, started: float = None) -> list:
+        """Vector (+ concurrent BM25) search for L2 misses, then MMR; vectors are embedded here unless given."""
+        hybrid = self.hybrid and snapshot.bm25 is not None
+        depth = max(k, self.mmr_candidates) if self.mmr else k
+        fetch = max(depth, self.candidates) if hybrid else depth
+        vectors, found, keyword = self._first_stage(queries, fetch, snapshot, vectors, started)
+        if keyword is not None:
+            found = [reciprocal_rank_fusion([v, kw], depth) for v, kw in zip(found, keyword)]
+        if self.mmr:
+            # Fused RRF scores and inner products rank high-first, L2 distances low-first
+            higher_is_better = keyword is not None or bool(snapshot.info.get("normalize"))
+            found = self._timed("mmr", self._diversify, found, k, snapshot, higher_is_better)
+        return found
+
+    def _first_stage(self, queries: list, fetch: int, snapshot: IndexSnapshot,
+                     vectors: np.ndarray = None, started: float = None) -> tuple:
+        """(query vectors, vector hits, BM25 hits or None) per query, both paths fetch deep and run concurrently."""
+        routes = [snapshot.router.route(query) if snapshot.router else () for query in queries]
+        keyword = None
+        if self.hybrid and snapshot.bm25 is not None:
+            keyword = self._keyword_pool.submit(self._timed, "bm25", self._keyword_search,
+                                                queries, routes, fetch, snapshot)
+        if vectors is None:
+            started = time.perf_counter()
+            vectors = self.embed_queries(queries, snapshot)
+        found = self._timed("vector", self._vector_search, vectors, routes, fetch, snapshot, started=started)
+        return vectors, found, keyword.result() if keyword is not None else None
+
+    def shard_candidates(self, queries: list, vectors: np.ndarray, fetch: int) -> tuple:
+        """First stage only, no fusion/MMR/cache (for shard workers): (snapshot, vector hits, BM25 hits or None)."""
+        self.check_for_rebuild()
+        snapshot = self._snapshot
+        _, found, keyword = self._first_stage(queries, fetch, snapshot, vectors)
+        return snapshot, found, keyword
+
+    def _timed(self, path: str, search, *args, started: float = None):
+        # started: when the path began before this call (the query embedding is timed as part of it)
+        start = started or time.perf_counter()
+        try:
+            return search(*args)
+        finally:
+            self.latency[path].add((time.perf_counter() - start) * 1000)
+
+    def _vector_search(self, vectors: np.ndarray, routes: list, k: int, snapshot: IndexSnapshot) -> list:
+        """One index.search per distinct route, limited to the route's rows (all rows for unrouted queries)."""
+        by_route = {}
+        for i, route in enumerate(routes):
+            by_route.setdefault(route, []).append(i)
+        results = [None] * len(vectors)
+        for route, members in by_route.items():
+            selector = snapshot.router.selector(route) if route else None
+            hits = self.search_vectors(vectors[members], k, snapshot, selector)
+            for i, rows in zip(members, hits):
+                results[i] = rows
+        return results
+
+    def _diversify(self, found: list, k: int, snapshot: IndexSnapshot, higher_is_better: bool) -> list:
+        """Second stage: k of each query's candidates by MMR over their first-stage scores."""
+        diversified = []
+        for rows in found:
+            if len(rows) <= k:
+                diversified.append(rows)
+                continue
+            relevance = first_stage_relevance([score for _, score in rows], higher_is_better)
+            candidates = snapshot.vectors(np.fromiter((row for row, _ in rows), dtype=np.int64, count=len(rows)))
+            diversified.append([rows[i] for i in maximal_marginal_relevance(relevance, candidates, k, self.mmr_lambda)])
+        return diversified
+
+    @staticmethod
+    def _keyword_search(queries: list, routes: list, k: int, snapshot: IndexSnapshot) -> list:
+        return [snapshot.bm25.search(query, k, allowed=snapshot.router.mask(route) if route else None)
+                for query, route in zip(queries, routes)]
+
+    def search_rows(self, query: str, k: int = None) -> list:
+        """Return (row, score) pairs for the k chosen chunks (L2 distance, or fused RRF score when hybrid)."""
+        return self._search([query], k or self.k)[1][0]
+
+    def search_many(self, queries: list, k: int = None) -> list:
+        """Top-k Documents for each query, in input order."""
+        snapshot, results = self._search(list(queries), k or self.k)
+        return [[snapshot.store.document(row) for row, _ in rows] for rows in results]
+
+    def invoke(self, query: str) -> list:
+        """Return the top-k chunks as LangChain Documents (same shape as a LangChain retriever)."""
+        return self.search_many([query])[0]
+
+    async def asearch_many(self, queries: list, k: int = None) -> list:
+        """Async search_many: one awaited embedding request, search and chunk reads on the search pool."""
+        snapshot, results = await self._asearch(list(queries), k or self.k)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._search_pool, lambda: [[snapshot.store.document(row) for row, _ in rows] for rows in results])
+
+    async def ainvoke(self, query: str) -> list:
+        """Async invoke (same name as on LangChain retrievers)."""
+        return (await self.asearch_many([query]))[0]
+
+    def latency_stats(self) -> dict:
+        """Latency percentiles per retrieval stage (vector includes the query embedding)."""
+        return {name: stats.summary() for name, stats in self.latency.items()}
+
+    def routing_stats(self) -> dict:
+        """How many searches a product partition served, and the share of the catalog they scanned."""
+        router = self._snapshot.router
+        return router.stats() if router else {}
+
+    def cache_stats(self) -> dict:
+        return {"query embeddings (L1)": self.query_embeddings.stats(), "search results (L2)": self.results.stats()}
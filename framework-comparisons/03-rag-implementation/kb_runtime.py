@@ -0,0 +1,217 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Lazy KB Agent Runtime for RAG Examples
+Everything a product_qa.py needs for retrieval (embedder, index, caches, context packer) as
+process-wide singletons created on first use, so importing a script (tests, --help) costs nothing.
+warm_up() loads them on a background thread while the script sets up its LLM client, and
+startup.report() shows where import/init time went. Batch jobs (evaluation sets, multi-question
+tickets) call kb.search_many / kb.asearch_many: one embedding request and one index search.
+
+Heavy modules (langchain_openai, faiss, numpy, tiktoken) are only imported inside the factories;
+scripts wrap their own LLM client setup in Lazy too.
+
+Async scripts use asearch / asearch_many / acached_answer: query embeddings go over the pooled
+HTTP clients of the shared LLM client registry (framework-comparisons/llm_clients.py, which the
+scripts' LLM clients use too) and FAISS search runs on the retriever's bounded thread pool, so
+one event loop can serve many support conversations.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+
+# Shared LLM client registry lives in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+class StartupReport:
+    """Import/init time per component, in the order components finished.
+
+    Timed blocks may nest (a factory importing its library): each entry excludes its nested entries.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.entries = []  # (component, seconds, thread name)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def timed(self, component: str):
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                self.entries.append((component, elapsed - nested, threading.current_thread().name))
+
+    def report(self) -> str:
+        with self._lock:
+            entries = list(self.entries)
+        lines = [f"   {component:<32} {seconds * 1000:>8.1f} ms  ({thread})" for component, seconds, thread in entries]
+        lines.append(f"   {'total since kb_runtime import':<32} {(time.perf_counter() - self.start) * 1000:>8.1f} ms")
+        return "\n".join(lines)
+
+
+startup = StartupReport()
+
+
+class Lazy:
+    """Thread-safe lazily created singleton. deps are created first and timed separately."""
+
+    _UNSET = object()
+
+    def __init__(self, name: str, factory, deps: tuple = ()):
+        self.name = name
+        self.factory = factory
+        self.deps = deps
+        self._value = self._UNSET
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not self._UNSET
+
+    def get(self):
+        if self._value is self._UNSET:
+            for dep in self.deps:
+                dep.get()
+            with self._lock:
+                if self._value is self._UNSET:
+                    with startup.timed(self.name):
+                        self._value = self.factory()
+        return self._value
+
+    async def aget(self):
+        """get() from an event loop: a first-time (or in-progress) creation is awaited on a worker thread."""
+        if self.ready:
+            return self._value
+        return await asyncio.to_thread(self.get)
+
+
+def warm_up(*singletons: Lazy) -> threading.Thread:
+    """Create singletons on a background thread (first use just waits on the same lock)."""
+    def run():
+        for singleton in singletons:
+            singleton.get()
+
+    thread = threading.Thread(target=run, name="kb-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+class KBRuntime:
+    """Lazy KB Agent: retrieval, semantic answer cache and context packing for one script."""
+
+    def __init__(self, index_path: str, k: int = 3):
+        self.index_path = index_path
+        self.k = k
+        self.embeddings = Lazy("embeddings (OpenAI + cache)", self._create_embeddings)
+        self.retriever = Lazy("kb index", self._create_retriever, deps=(self.embeddings,))
+        self.answer_cache = Lazy("answer cache", self._create_answer_cache)
+        self.packer = Lazy("context packer", self._create_packer)
+
+    def _create_embeddings(self):
+        with startup.timed("import langchain_openai"):
+            from langchain_openai import OpenAIEmbeddings
+        from embedding_cache import cached_embeddings
+        from llm_clients import registry
+        # Embedding requests share the connection pools of the script's LLM client
+        embedder = OpenAIEmbeddings(model=EMBEDDING_MODEL, http_client=registry.http_client(),
+                                    http_async_client=registry.async_http_client())
+        return cached_embeddings(embedder)
+
+    def _create_retriever(self):
+        # Use the shared KB service when KB_SERVICE_URL is set, else load the index in-process
+        from kb_client import KBServiceClient
+        client = KBServiceClient.from_env(k=self.k)
+        if client is not None:
+            return client
+        with startup.timed("import faiss + numpy"):
+            from kb_shards import open_retriever
+        return open_retriever(self.index_path, self.embeddings.get(), k=self.k)
+
+    @staticmethod
+    def _create_answer_cache():
+        # Semantic cache in front of the Support Agent: paraphrased questions skip the LLM call
+        from answer_cache import answer_cache_from_env
+        return answer_cache_from_env()
+
+    @staticmethod
+    def _create_packer():
+        # Merges neighbouring chunks and drops repeated lines so the prompt stays within KB_CONTEXT_TOKENS
+        from context_packer import context_packer_from_env
+        return context_packer_from_env()
+
+    def warm_up(self) -> threading.Thread:
+        """Load embedder, index, answer cache and packer in the background."""
+        return warm_up(self.embeddings, self.retriever, self.answer_cache, self.packer)
+
+    def search(self, query: str) -> str:
+        """KB Agent answer ("Sources: ..." + packed context) for one query."""
+        from kb_retriever import format_kb_result
+        return format_kb_result(self.retriever.get().invoke(query), self.packer.get())
+
+    def search_many(self, queries: list) -> list:
+        """KB Agent answers for several queries: one embedding request and one index search."""
+        from kb_retriever import format_kb_result
+        packer = self.packer.get()
+        return [format_kb_result(docs, packer) for docs in self.retriever.get().search_many(queries)]
+
+    async def asearch(self, query: str) -> str:
+        """search() without blocking the event loop."""
+        from kb_retriever import format_kb_result
+        retriever = await self.retriever.aget()
+        return format_kb_result(await retriever.ainvoke(query), await self.packer.aget())
+
+    async def asearch_many(self, queries: list) -> list:
+        from kb_retriever import format_kb_result
+        retriever = await self.retriever.aget()
+        packer = await self.packer.aget()
+        return [format_kb_result(docs, packer) for docs in await retriever.asearch_many(queries)]
+
+    def cached_answer(self, query: str) -> tuple:
+        """(answer to a near-identical earlier question or None, key for store_answer)."""
+        version = self.retriever.get().version
+        query_vector = self.embeddings.get().embed_query(query)
+        return self.answer_cache.get().get(query_vector, version), (query_vector, version)
+
+    async def acached_answer(self, query: str) -> tuple:
+        retriever = await self.retriever.aget()
+        # version may stat the index (or ask the KB service), so it runs off the loop
+        version = await asyncio.to_thread(lambda: retriever.version)
+        query_vector = await (await self.embeddings.aget()).aembed_query(query)
+        return (await self.answer_cache.aget()).get(query_vector, version), (query_vector, version)
+
+    def store_answer(self, key: tuple, answer: str):
+        query_vector, version = key
+        self.answer_cache.get().put(query_vector, version, answer)
+
+    def report(self) -> str:
+        """End-of-run stats: KB caches, retrieval latency, answer cache, context packing."""
+        from kb_cache import format_cache_stats
+        from kb_retriever import format_latency_stats
+        from answer_cache import format_answer_cache_stats
+        from context_packer import format_packing_stats
+        from llm_clients import format_pool_stats
+        retriever = self.retriever.get()
+        return "\n".join([
+            "📈 KB cache hit ratios:\n" + format_cache_stats(retriever.cache_stats()),
+            "⏱️  KB retrieval latency per path:\n" + format_latency_stats(retriever.latency_stats()),
+            "🧠 Answer cache:\n" + format_answer_cache_stats(self.answer_cache.get().stats()),
+            "✂️  Context packing:\n" + format_packing_stats(self.packer.get().stats()),
+            "🔌 LLM connection pool:\n" + format_pool_stats(),
+        ])
+
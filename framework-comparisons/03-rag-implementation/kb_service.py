@@ -0,0 +1,197 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Local KB Retrieval Service for RAG Examples
+One process holds the index + embedder and serves search over localhost HTTP, so N agent
+processes share a single copy. Concurrent requests are micro-batched: one embedding request
+and one vectorized index.search per batch.
+
+Usage:
+    python kb_service.py --port 8765
+    KB_SERVICE_URL=http://127.0.0.1:8765 python langchain/product_qa.py
+
+Endpoints:
+    POST /search       {"query": str, "k": int}          -> {"documents": [{"id", "page_content", "metadata"}]}
+    POST /search_many  {"queries": [str], "k": int}      -> {"results": [[...documents of query i...]]}
+    GET  /metrics  request/batch counters, per-stage and per-path latency, routing, cache hit ratios
+    GET  /health
+"""
+
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from dotenv import load_dotenv
+from langchain_openai import OpenAIEmbeddings
+from embedding_cache import cached_embeddings
+from kb_retriever import ChunkStoreRetriever, LatencyStats
+from kb_shards import open_retriever
+
+load_dotenv()
+
+DEFAULT_PORT = 8765
+
+
+class SearchBatcher:
+    """Collects concurrent search requests and serves them as one batch."""
+
+    def __init__(self, retriever: ChunkStoreRetriever, max_batch: int = 32, max_wait_ms: float = 5.0):
+        self.retriever = retriever
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.requests = queue.Queue()
+        self.batches = 0
+        self.batched_requests = 0
+        self.metrics = {name: LatencyStats() for name in ("request", "queue", "retrieve")}
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def search(self, query: str, k: int) -> list:
+        """Blocking search from a request thread; returns Documents."""
+        start = time.perf_counter()
+        future = Future()
+        self.requests.put((query, k, start, future))
+        try:
+            return future.result()
+        finally:
+            self.metrics["request"].add((time.perf_counter() - start) * 1000)
+
+    def search_many(self, queries: list, k: int) -> list:
+        """Blocking search for several queries; all are queued at once so they share a batch."""
+        start = time.perf_counter()
+        futures = [Future() for _ in queries]
+        for query, future in zip(queries, futures):
+            self.requests.put((query, k, start, future))
+        try:
+            return [future.result() for future in futures]
+        finally:
+            self.metrics["request"].add((time.perf_counter() - start) * 1000)
+
+    def _collect(self) -> list:
+        batch = [self.requests.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            for _, _, enqueued, _ in batch:
+                self.metrics["queue"].add((started - enqueued) * 1000)
+            try:
+                # One embedding request + one search at the largest k in the batch, trimmed per request
+                # (cache hits skip both)
+                hits = self.retriever.search_many([query for query, _, _, _ in batch], max(k for _, k, _, _ in batch))
+                for (_, k, _, future), docs in zip(batch, hits):
+                    future.set_result(docs[:k])
+                self.metrics["retrieve"].add((time.perf_counter() - started) * 1000)
+            except Exception as exc:
+                for _, _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            self.batches += 1
+            self.batched_requests += len(batch)
+
+    def snapshot(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.batched_requests,
+            "avg_batch_size": self.batched_requests / self.batches if self.batches else 0.0,
+            "latency": {name: stats.summary() for name, stats in self.metrics.items()},
+            "retrieval": self.retriever.latency_stats(),
+            "routing": self.retriever.routing_stats(),
+            "index_version": self.retriever.version,
+            "index_reloads": self.retriever.reloads,
+            "cache": self.retriever.cache_stats(),
+        }
+
+
+class KBRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients reuse one connection
+    batcher: SearchBatcher = None
+    default_k = 3
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send_json(200, self.batcher.snapshot())
+        elif self.path == "/health":
+            retriever = self.batcher.retriever
+            self._send_json(200, {"status": "ok", "chunks": len(retriever), "index_version": retriever.version})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path not in ("/search", "/search_many"):
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            queries = request["queries"] if self.path == "/search_many" else [request["query"]]
+            k = int(request.get("k", self.default_k))
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"error": f"bad request: {e}"})
+            return
+        try:
+            results = self.batcher.search_many(queries, k)
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        results = [[
+            {"id": doc.id, "page_content": doc.page_content, "metadata": doc.metadata} for doc in docs
+        ] for docs in results]
+        if self.path == "/search_many":
+            self._send_json(200, {"results": results})
+        else:
+            self._send_json(200, {"documents": results[0]})
+
+    def log_message(self, format, *args):
+        pass  # per-request logging would dominate the latency being measured
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve KB search for all RAG examples from one process.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--index-path", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "faiss_index"))
+    parser.add_argument("-k", type=int, default=3, help="Default number of chunks per search")
+    parser.add_argument("--max-batch", type=int, default=32, help="Most requests served by one batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="How long a batch waits to fill up")
+    args = parser.parse_args()
+
+    embeddings = cached_embeddings(OpenAIEmbeddings(model="text-embedding-3-small"))
+    # Scatter-gathers over shard workers when build_index.py wrote shards
+    retriever = open_retriever(args.index_path, embeddings, k=args.k)
+    KBRequestHandler.batcher = SearchBatcher(retriever, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    KBRequestHandler.default_k = args.k
+
+    server = ThreadingHTTPServer((args.host, args.port), KBRequestHandler)
+    print(f"📡 KB service on http://{args.host}:{args.port} ({len(retriever)} chunks)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
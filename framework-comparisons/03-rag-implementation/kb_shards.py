@@ -0,0 +1,464 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Sharded KB Index with Scatter-Gather Search
+Splits the canonical index into N shards, by chunk-id hash or by product line, so no single
+process has to hold the whole catalog. Each shard is a complete index directory (index.faiss,
+chunks/, bm25/, partitions/, search index) derived from the canonical vectors, and is only
+rewritten when its set of chunks changed: an incremental build touches the shards holding the
+edited chunks and leaves the others (and the workers serving them) alone.
+
+ShardedRetriever runs one worker process per shard. A query is embedded once, sent to every
+shard (or, with product-line shards, only to the shards covering the products it names), and
+the per-shard rankings are merged with a heap and diversified with MMR, the same pipeline
+ChunkStoreRetriever runs over one index. BM25 scores depend on each shard's own document
+frequencies and lengths, so a hybrid query fuses vector and BM25 ranks with RRF inside each
+shard first; the rank-based fused scores are what the heap merges across shards. A newly published build (index_versions.py)
+gets a fresh set of shard workers, loaded in the background while the old set keeps serving.
+
+Layout (faiss_index/shards/):
+    shards.json           strategy, shard count (hash), search index label, metric,
+                          per shard: chunks, products, ids hash
+    <shard>/              index directory of the shard (rows are shard-local)
+"""
+
+import os
+import copy
+import json
+import time
+import heapq
+import shutil
+import asyncio
+import hashlib
+import threading
+import multiprocessing
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import faiss
+from chunk_store import ChunkStore, write_chunk_store, INDEX_FILE, CHUNKS_DIR
+from index_factory import IndexSpec, write_search_index, load_index_info
+from bm25_index import write_bm25_index, reciprocal_rank_fusion, BM25_DIR
+from product_router import write_partitions, route_query
+from kb_cache import LRUTTLCache, normalize_query
+from kb_retriever import ChunkStoreRetriever, LatencyStats, first_stage_relevance, maximal_marginal_relevance
+from index_versions import resolve_index_dir
+
+SHARDS_DIR = "shards"
+SHARDS_FILE = "shards.json"
+SHARD_STRATEGIES = ("hash", "product")
+GENERAL_SHARD = "general"  # product-line shards: chunks of no catalog product
+
+
+def load_shards_header(index_path: str):
+    """shards.json of an index directory, or None if the build is not sharded."""
+    path = os.path.join(index_path, SHARDS_DIR, SHARDS_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def assign_shards(store: ChunkStore, strategy: str, count: int) -> dict:
+    """shard name -> ascending canonical rows.
+
+    hash: by chunk id (content hash), so an unchanged chunk stays in its shard across builds.
+    product: by the product line (brand) of the chunk's first product.
+    """
+    if strategy not in SHARD_STRATEGIES:
+        raise ValueError(f"Unknown shard strategy {strategy!r}, expected one of {', '.join(SHARD_STRATEGIES)}")
+    shards = {}
+    brands = store.columns.get("brand")
+    for row in range(len(store)):
+        if strategy == "hash":
+            digest = hashlib.blake2b(store.chunk_id(row).encode("utf-8"), digest_size=8).digest()
+            name = f"shard-{int.from_bytes(digest, 'little') % count:02d}"
+        else:
+            brand = brands[row].split(",")[0] if brands is not None else ""
+            name = brand or GENERAL_SHARD
+        shards.setdefault(name, []).append(row)
+    return shards
+
+
+def write_shard(path: str, canonical_index, store: ChunkStore, rows: list, spec: IndexSpec) -> dict:
+    """Write one shard's index directory from canonical rows (no re-embedding). Returns its index info."""
+    os.makedirs(path, exist_ok=True)
+    vectors = canonical_index.reconstruct_batch(np.asarray(rows, dtype=np.int64))
+    flat = faiss.IndexFlatL2(vectors.shape[1])
+    flat.add(np.ascontiguousarray(vectors, dtype=np.float32))
+    faiss.write_index(flat, os.path.join(path, INDEX_FILE))
+    documents = [store.document(row) for row in rows]
+    write_chunk_store(os.path.join(path, CHUNKS_DIR), [doc.id for doc in documents], documents)
+    write_bm25_index(os.path.join(path, BM25_DIR), [doc.page_content for doc in documents])
+    write_partitions(path, ChunkStore(os.path.join(path, CHUNKS_DIR)))
+    # A small shard may be too small for IVF training; it then searches exactly
+    try:
+        return write_search_index(path, flat, copy.copy(spec))
+    except ValueError as e:
+        print(f"⚠️  {os.path.basename(path)}: {e}; falling back to flat-l2")
+        return write_search_index(path, flat, IndexSpec("flat-l2"))
+
+
+def write_shards(index_path: str, spec: IndexSpec, strategy: str = "hash", count: int = 4) -> dict:
+    """Split the canonical index into shards, rewriting only shards whose chunks changed.
+
+    Returns shard name -> "rebuilt" / "unchanged" / "removed".
+    """
+    canonical = faiss.read_index(os.path.join(index_path, INDEX_FILE))
+    store = ChunkStore(os.path.join(index_path, CHUNKS_DIR))
+    path = os.path.join(index_path, SHARDS_DIR)
+    previous = load_shards_header(index_path) or {}
+    count = count if strategy == "hash" else None  # product-line shards ignore --shards
+    # A different split or search index invalidates every shard
+    same_layout = (previous.get("strategy"), previous.get("count"), previous.get("label")) == \
+        (strategy, count, spec.label())
+
+    products_column = store.columns.get("products")
+    shards, status = {}, {}
+    for name, rows in sorted(assign_shards(store, strategy, count).items()):
+        ids_hash = hashlib.sha256("\n".join(store.chunk_id(row) for row in rows).encode("utf-8")).hexdigest()
+        # Every product a shard's chunks name, so product-line routing also reaches comparison chunks
+        products = set()
+        for row in rows if products_column is not None else ():
+            products.update(filter(None, products_column[row].split(",")))
+        old = previous.get("shards", {}).get(name, {})
+        shard_path = os.path.join(path, name)
+        if same_layout and old.get("ids_hash") == ids_hash and os.path.isdir(shard_path):
+            status[name] = "unchanged"
+        else:
+            write_shard(shard_path, canonical, store, rows, spec)
+            status[name] = "rebuilt"
+        shards[name] = {"chunks": len(rows), "products": sorted(products), "ids_hash": ids_hash}
+    for name in previous.get("shards", {}):
+        if name not in shards:
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+            status[name] = "removed"
+
+    header = {"strategy": strategy, "count": count, "label": spec.label(),
+              "metric": "ip" if spec.normalize else "l2", "shards": shards}
+    header_path = os.path.join(path, SHARDS_FILE)
+    with open(header_path + ".tmp", "w") as f:
+        json.dump(header, f, indent=2)
+    os.replace(header_path + ".tmp", header_path)
+    return status
+
+
+def remove_shards(index_path: str):
+    shutil.rmtree(os.path.join(index_path, SHARDS_DIR), ignore_errors=True)
+
+
+# Shard worker process: one ChunkStoreRetriever over the shard directory, reloading on shard rebuilds
+
+_worker = None
+
+
+def _init_worker(shard_path: str, hybrid: bool, reload_check_seconds: float):
+    global _worker
+    _worker = ChunkStoreRetriever(shard_path, embeddings=None, hybrid=hybrid, mmr=False, cache_size=0,
+                                  reload_check_seconds=reload_check_seconds)
+
+
+def _worker_version() -> str:
+    return _worker.version
+
+
+def _search_shard(queries: list, vectors: np.ndarray, fetch: int, with_vectors: bool) -> list:
+    """Per query: shard-local vector and BM25 rankings plus the Documents (and vectors) of their rows."""
+    snapshot, found, keyword = _worker.shard_candidates(queries, vectors, fetch)
+    results = []
+    for i in range(len(queries)):
+        bm25 = keyword[i] if keyword is not None else []
+        rows = sorted({row for row, _ in found[i]} | {row for row, _ in bm25})
+        payload = {"vector": found[i], "bm25": bm25, "documents": {row: snapshot.store.document(row) for row in rows}}
+        if with_vectors and rows:
+            payload["vectors"] = dict(zip(rows, snapshot.vectors(np.asarray(rows, dtype=np.int64))))
+        results.append(payload)
+    return results
+
+
+class ShardSet:
+    """Worker processes serving the shards of one build directory."""
+
+    def __init__(self, index_dir: str, hybrid: bool, reload_check_seconds: float):
+        header = load_shards_header(index_dir)
+        if header is None:
+            raise FileNotFoundError(f"No shards at {index_dir}. Run build_index.py --shards N first.")
+        self.path = os.path.join(index_dir, SHARDS_DIR)
+        self.strategy = header["strategy"]
+        self.higher_is_better = header["metric"] == "ip"
+        self.shards = header["shards"]
+        # Spawned, not forked: the parent may already run threads (warm-up, HTTP clients)
+        context = multiprocessing.get_context("spawn")
+        self.pools = {
+            name: ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_init_worker,
+                                      initargs=(os.path.join(self.path, name), hybrid, reload_check_seconds))
+            for name in self.shards
+        }
+        # Start every worker now, so shards load in parallel before the first query
+        self._started = [pool.submit(_worker_version) for pool in self.pools.values()]
+
+    def wait_ready(self):
+        for future in self._started:
+            future.result()
+
+    def version(self) -> str:
+        """Combined version of all shards (changes when any shard is rebuilt)."""
+        versions = "+".join(load_index_info(os.path.join(self.path, name)).get("version", "unversioned")
+                            for name in sorted(self.shards))
+        return hashlib.sha256(versions.encode("utf-8")).hexdigest()[:16]
+
+    def targets(self, query: str) -> list:
+        """Shards a query is sent to: product-line shards covering the products it names, else all."""
+        if self.strategy == "product":
+            products = set(route_query(query))
+            targets = [name for name, info in self.shards.items() if products & set(info["products"])]
+            if targets:
+                return targets
+        return list(self.shards)
+
+    def close(self):
+        # Searches already submitted still complete
+        for pool in self.pools.values():
+            pool.shutdown(wait=False)
+
+
+class ShardedRetriever:
+    """Scatter-gather over shard worker processes, with the same interface as ChunkStoreRetriever.
+
+    Shard rebuilds in place reload inside their workers. A newly published build starts a new
+    ShardSet in the background; queries switch to it once every worker has loaded its shard.
+    """
+
+    def __init__(self, index_path: str, embeddings, k: int = 3, hybrid: bool = True, candidates: int = 20,
+                 mmr: bool = True, mmr_candidates: int = 50, mmr_lambda: float = 0.7,
+                 cache_size: int = 4096, cache_ttl_seconds: float = 3600, reload_check_seconds: float = 2.0):
+        self.index_path = index_path
+        self.embeddings = embeddings
+        self.k = k
+        self.hybrid = hybrid
+        self.candidates = candidates
+        self.mmr = mmr
+        self.mmr_candidates = mmr_candidates
+        self.mmr_lambda = mmr_lambda
+        self.reload_check_seconds = reload_check_seconds
+        self.latency = {name: LatencyStats() for name in ("embed", "scatter-gather", "mmr")}
+        self.query_embeddings = LRUTTLCache(cache_size, cache_ttl_seconds)
+        self.results = LRUTTLCache(cache_size, cache_ttl_seconds)
+        self.searches = 0
+        self.shard_requests = 0
+        self.reloads = 0
+        self._published = self._watch_published()
+        self._set = ShardSet(self._published[0], hybrid, reload_check_seconds)
+        self._version = self._set.version()
+        self._last_check = time.monotonic()
+        self._lock = threading.Lock()
+        self._reloading = False
+
+    def _watch_published(self) -> tuple:
+        path = resolve_index_dir(self.index_path)
+        try:
+            return path, os.stat(os.path.join(path, SHARDS_DIR, SHARDS_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return path, None
+
+    @property
+    def shards(self) -> dict:
+        return self._set.shards
+
+    @property
+    def version(self) -> str:
+        """Version of the shard set queries currently run against (the answer cache keys on it)."""
+        self.check_for_rebuild()
+        return self._version
+
+    def check_for_rebuild(self):
+        """Pick up shards rebuilt in place, and start a new shard set for a newly published build."""
+        now = time.monotonic()
+        if now - self._last_check < self.reload_check_seconds:
+            return
+        with self._lock:
+            if now - self._last_check < self.reload_check_seconds:
+                return
+            self._last_check = now
+            self._set_version(self._set.version())
+            published = self._watch_published()
+            if published == self._published or self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, args=(published,), name="kb-shard-reload", daemon=True).start()
+
+    def _set_version(self, version: str):
+        if version != self._version:
+            self._version = version
+            self.results.clear()
+
+    def _reload(self, published: tuple):
+        try:
+            shard_set = ShardSet(published[0], self.hybrid, self.reload_check_seconds)
+            shard_set.wait_ready()
+            # Set, version and published build change together, so a concurrent check never pairs them wrongly
+            with self._lock:
+                old, self._set = self._set, shard_set
+                self._set_version(shard_set.version())
+                self._published = published
+                self.reloads += 1
+            old.close()
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"⚠️  Shard set reload failed, still serving {self._version}: {e}")
+        finally:
+            with self._lock:
+                self._reloading = False
+
+    def _lookup(self, queries: list, k: int) -> tuple:
+        version = self.version
+        keys = [(normalize_query(query), version, k) for query in queries]
+        results = [self.results.get(key) for key in keys]
+        return keys, results, [i for i, docs in enumerate(results) if docs is None]
+
+    def _cached_vectors(self, queries: list) -> tuple:
+        keys = [normalize_query(query) for query in queries]
+        vectors = [self.query_embeddings.get(key) for key in keys]
+        return keys, vectors, [i for i, vector in enumerate(vectors) if vector is None]
+
+    def _query_matrix(self, vectors: list, shard_set: ShardSet) -> np.ndarray:
+        matrix = np.vstack(vectors).astype(np.float32)
+        if shard_set.higher_is_better:
+            faiss.normalize_L2(matrix)
+        return matrix
+
+    def embed_queries(self, queries: list, shard_set: ShardSet = None) -> np.ndarray:
+        """Embed once in the parent (one request for all L1 misses); shards only receive vectors."""
+        keys, vectors, missing = self._cached_vectors(queries)
+        if missing:
+            for i, vector in zip(missing, self.embeddings.embed_documents([queries[i] for i in missing])):
+                vectors[i] = np.asarray(vector, dtype=np.float32)
+                self.query_embeddings.put(keys[i], vectors[i])
+        return self._query_matrix(vectors, shard_set or self._set)
+
+    async def aembed_queries(self, queries: list, shard_set: ShardSet = None) -> np.ndarray:
+        keys, vectors, missing = self._cached_vectors(queries)
+        if missing:
+            fresh = await self.embeddings.aembed_documents([queries[i] for i in missing])
+            for i, vector in zip(missing, fresh):
+                vectors[i] = np.asarray(vector, dtype=np.float32)
+                self.query_embeddings.put(keys[i], vectors[i])
+        return self._query_matrix(vectors, shard_set or self._set)
+
+    def _scatter(self, shard_set: ShardSet, queries: list, vectors: np.ndarray, k: int) -> list:
+        """Submit each shard's share of the batch -> [(shard, query indexes, future)]."""
+        members = {}
+        for i, query in enumerate(queries):
+            for name in shard_set.targets(query):
+                members.setdefault(name, []).append(i)
+        depth = max(k, self.mmr_candidates) if self.mmr else k
+        fetch = max(depth, self.candidates) if self.hybrid else depth
+        self.searches += len(queries)
+        self.shard_requests += sum(len(idx) for idx in members.values())
+        return [(name, idx, shard_set.pools[name].submit(_search_shard, [queries[i] for i in idx], vectors[idx],
+                                                    fetch, self.mmr))
+                for name, idx in members.items()]
+
+    def _gather(self, shard_set: ShardSet, queries: list, parts: list, k: int) -> list:
+        """Merge shard rankings per query (per-shard RRF, heap merge, MMR) -> top-k Documents."""
+        per_query = [[] for _ in queries]
+        for name, idx, payloads in parts:
+            for i, payload in zip(idx, payloads):
+                per_query[i].append((name, payload))
+        depth = max(k, self.mmr_candidates) if self.mmr else k
+        start = time.perf_counter()
+        results = [self._merge(shards, k, depth, shard_set.higher_is_better) for shards in per_query]
+        if self.mmr:
+            self.latency["mmr"].add((time.perf_counter() - start) * 1000)
+        return results
+
+    def _merge(self, shards: list, k: int, depth: int, higher_is_better: bool) -> list:
+        hybrid = any(payload["bm25"] for _, payload in shards)
+        if hybrid:
+            # Shard-local BM25 scores are not comparable across shards: fuse by rank within each shard
+            rankings = [[((name, row), score) for row, score in
+                         reciprocal_rank_fusion([payload["vector"], payload["bm25"]], depth)]
+                        for name, payload in shards]
+        else:
+            # Vector distances are comparable across shards (same embedding space and metric)
+            rankings = [[((name, row), dist) for row, dist in payload["vector"]] for name, payload in shards]
+        # Shard rankings arrive best first; heapq.merge interleaves them without a full sort
+        ranked = list(islice(heapq.merge(*rankings, key=lambda hit: hit[1], reverse=hybrid or higher_is_better),
+                             depth))
+        payloads = dict(shards)
+        if self.mmr and len(ranked) > k:
+            relevance = first_stage_relevance([score for _, score in ranked], hybrid or higher_is_better)
+            candidates = np.vstack([payloads[name]["vectors"][row] for (name, row), _ in ranked])
+            ranked = [ranked[i] for i in maximal_marginal_relevance(relevance, candidates, k, self.mmr_lambda)]
+        return [payloads[name]["documents"][row] for (name, row), _ in ranked[:k]]
+
+    def search_many(self, queries: list, k: int = None) -> list:
+        """Top-k Documents for each query, in input order."""
+        queries, k = list(queries), k or self.k
+        keys, results, missing = self._lookup(queries, k)
+        if missing:
+            pending = [queries[i] for i in missing]
+            shard_set = self._set  # one batch stays on one shard set, even if a swap happens meanwhile
+            start = time.perf_counter()
+            vectors = self.embed_queries(pending, shard_set)
+            self.latency["embed"].add((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            scattered = self._scatter(shard_set, pending, vectors, k)
+            parts = [(name, idx, future.result()) for name, idx, future in scattered]
+            self.latency["scatter-gather"].add((time.perf_counter() - start) * 1000)
+            for i, docs in zip(missing, self._gather(shard_set, pending, parts, k)):
+                results[i] = docs
+                self.results.put(keys[i], docs)
+        return results
+
+    async def asearch_many(self, queries: list, k: int = None) -> list:
+        """search_many for the event loop: awaits the embedding request and the shard workers."""
+        queries, k = list(queries), k or self.k
+        keys, results, missing = await asyncio.to_thread(self._lookup, queries, k)
+        if missing:
+            pending = [queries[i] for i in missing]
+            shard_set = self._set
+            start = time.perf_counter()
+            vectors = await self.aembed_queries(pending, shard_set)
+            self.latency["embed"].add((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            scattered = self._scatter(shard_set, pending, vectors, k)
+            payloads = await asyncio.gather(*(asyncio.wrap_future(future) for _, _, future in scattered))
+            parts = [(name, idx, result) for (name, idx, _), result in zip(scattered, payloads)]
+            self.latency["scatter-gather"].add((time.perf_counter() - start) * 1000)
+            for i, docs in zip(missing, self._gather(shard_set, pending, parts, k)):
+                results[i] = docs
+                self.results.put(keys[i], docs)
+        return results
+
+    def __len__(self) -> int:
+        return sum(info["chunks"] for info in self.shards.values())
+
+    def close(self):
+        """Stop the shard worker processes."""
+        self._set.close()
+
+    def invoke(self, query: str) -> list:
+        return self.search_many([query])[0]
+
+    async def ainvoke(self, query: str) -> list:
+        return (await self.asearch_many([query]))[0]
+
+    def latency_stats(self) -> dict:
+        return {name: stats.summary() for name, stats in self.latency.items()}
+
+    def routing_stats(self) -> dict:
+        """Average shards a query was sent to (below the shard count only with product-line shards)."""
+        return {
+            "shards": len(self.shards),
+            "avg_shards_per_query": self.shard_requests / self.searches if self.searches else 0.0,
+        }
+
+    def cache_stats(self) -> dict:
+        return {"query embeddings (L1)": self.query_embeddings.stats(), "search results (L2)": self.results.stats()}
+
+
+def open_retriever(index_path: str, embeddings, k: int = 3):
+    """ShardedRetriever when the published build has shards, else the single-index ChunkStoreRetriever."""
+    if load_shards_header(resolve_index_dir(index_path)) is not None:
+        return ShardedRetriever(index_path, embeddings, k=k)
+    return ChunkStoreRetriever(index_path, embeddings, k=k)
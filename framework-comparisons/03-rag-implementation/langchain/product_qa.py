@@ -6,40 +6,52 @@ Demonstrates: 2-agent system (KB Agent retrieves from vector DB, Support Agent r
 """
 
 import os
+import sys
+import argparse
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+
+# Shared RAG helpers live next to build_index.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from kb_runtime import KBRuntime, Lazy, startup
 
 load_dotenv()
 
-# Initialize components
-llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7)
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+def _create_llm():
+    with startup.timed("import langchain_openai"):
+        from langchain_openai import ChatOpenAI
+    from llm_clients import registry
+    # Shares the pooled HTTP clients of the KB embedder (see llm_clients.py)
+    return ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7, http_client=registry.http_client(),
+                      http_async_client=registry.async_http_client())
+
+llm = Lazy("llm client (langchain)", _create_llm)
 
-# Load FAISS index
-index_path = os.path.join(os.path.dirname(__file__), "..", "faiss_index")
-vectorstore = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
-retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
+# Shared FAISS index written by build_index.py (run it once first), loaded on first use (see kb_runtime.py)
+kb = KBRuntime(os.path.join(os.path.dirname(__file__), "..", "faiss_index"), k=3)
 
 # Agent 1: KB Agent (RAG retrieval)
 def kb_agent_search(query: str) -> str:
     """Knowledge Base Agent: Retrieve product info from vector DB."""
-    docs = retriever.invoke(query)
-    context = "\n\n".join([doc.page_content for doc in docs])
-    sources = ", ".join({os.path.basename(doc.metadata.get('source', 'Unknown')) for doc in docs})
-    return f"Sources: {sources}\n\n{context}"
+    return kb.search(query)
 
 def main():
+    parser = argparse.ArgumentParser(description="LangChain customer support (2-agent RAG)")
+    parser.add_argument("--no-warmup", action="store_true", help="Load the KB index on first search, not in the background")
+    args = parser.parse_args()
+    if not args.no_warmup:
+        kb.warm_up()  # index loads while the LLM client is set up below
+    llm.get()
+
     print("📚 LangChain Customer Support (2-Agent RAG)\n" + "=" * 60)
 
     # Agent 2: Support Agent (customer-facing)
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import StrOutputParser
     support_prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a TechStore support agent. Use the KB info below to answer:\n\n{kb_result}"),
         ("human", "{query}")
     ])
-    support_agent = support_prompt | llm | StrOutputParser()
+    support_agent = support_prompt | llm.get() | StrOutputParser()
 
     # Customer queries
     queries = [
@@ -51,6 +63,12 @@ def main():
     for i, query in enumerate(queries, 1):
         print(f"\n{'='*60}\n🧑 Customer Query {i}: {query}\n{'='*60}")
 
+        # Step 0: Reuse the answer to a near-identical earlier question (same index version)
+        cached, cache_key = kb.cached_answer(query)
+        if cached is not None:
+            print(f"⚡ [Answer Cache] Reusing the answer to a similar question\n💬 Support Agent: {cached}\n")
+            continue
+
         # Step 1: KB Agent retrieves
         print("🔍 [KB Agent] Searching knowledge base...")
         kb_result = kb_agent_search(query)
@@ -59,7 +77,11 @@ def main():
         # Step 2: Support Agent responds
         print("💬 [Support Agent] Response:")
         response = support_agent.invoke({"kb_result": kb_result, "query": query})
+        kb.store_answer(cache_key, response)
         print(f"{response}\n")
 
+    print(kb.report())
+    print("🚀 Startup time by component:\n" + startup.report())
+
 if __name__ == "__main__":
     main()
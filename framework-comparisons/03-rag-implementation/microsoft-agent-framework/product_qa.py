@@ -3,34 +3,66 @@
 """
 Microsoft Agent Framework Customer Support - RAG with Multi-Agent Workflow
 Demonstrates: 2-agent system (KB Agent retrieves from vector DB, Support Agent responds to customer)
+Async: KB search and LLM calls are awaited on one event loop; customer queries run in order so the
+answer cache can serve repeats
 """
 
 import os
+import sys
+import asyncio
+import argparse
 from dotenv import load_dotenv
-from openai import OpenAI
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
+
+# Shared RAG helpers live next to build_index.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from kb_runtime import KBRuntime, Lazy, startup
 
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+def _create_client():
+    with startup.timed("import openai"):
+        from llm_clients import async_openai_client
+    return async_openai_client()
+
+# Initialize async OpenAI client on first use
+client = Lazy("llm client (openai)", _create_client)
 
-# Load pre-built FAISS index (shared across all frameworks)
-index_path = os.path.join(os.path.dirname(__file__), "..", "faiss_index")
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-vectorstore = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
-retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
+# Shared FAISS index written by build_index.py (run it once first), loaded on first use (see kb_runtime.py)
+kb = KBRuntime(os.path.join(os.path.dirname(__file__), "..", "faiss_index"), k=3)
 
 # Agent 1: KB Agent (vector search)
-def kb_agent_search(query: str) -> str:
-    """Knowledge Base Agent: Search product knowledge base using vector search."""
-    docs = retriever.invoke(query)
-    context = "\n\n".join([doc.page_content for doc in docs])
-    sources = ", ".join({os.path.basename(doc.metadata.get('source', 'Unknown')) for doc in docs})
-    return f"Sources: {sources}\n\n{context}"
-
-def main():
+async def kb_agent_search(query: str) -> str:
+    """Knowledge Base Agent (async): Search product knowledge base using vector search."""
+    return await kb.asearch(query)
+
+async def support_conversation(query: str) -> tuple:
+    """One customer query end to end. Returns (answer, served from the answer cache)."""
+    # Step 0: Reuse the answer to a near-identical earlier question (same index version)
+    cached, cache_key = await kb.acached_answer(query)
+    if cached is not None:
+        return cached, True
+
+    # Step 1: KB Agent retrieves
+    kb_result = await kb_agent_search(query)
+
+    # Step 2: Support Agent responds
+    messages = [
+        {"role": "system", "content": "You are a TechStore support agent. Use the KB info to answer."},
+        {"role": "user", "content": f"KB Info:\n{kb_result}\n\nCustomer: {query}"}
+    ]
+    response = await client.get().chat.completions.create(model="gpt-3.5-turbo", messages=messages, temperature=0.7)
+    answer = response.choices[0].message.content
+    kb.store_answer(cache_key, answer)
+    return answer, False
+
+async def main():
+    parser = argparse.ArgumentParser(description="Microsoft Agent Framework customer support (2-agent RAG)")
+    parser.add_argument("--no-warmup", action="store_true", help="Load the KB index on first search, not in the background")
+    args = parser.parse_args()
+    if not args.no_warmup:
+        kb.warm_up()  # index loads while the LLM client is set up below
+    client.get()
+
     print("📚 Microsoft Agent Framework Customer Support (2-Agent RAG)\n" + "=" * 60)
 
     queries = [
@@ -39,19 +71,16 @@ def main():
         "Which phone has the best AI features?"
     ]
 
+    # One after another, so a repeated question is served from the answer cache of an earlier one
     for i, query in enumerate(queries, 1):
         print(f"\n{'='*60}\n🧑 Customer Query {i}: {query}\n{'='*60}")
+        answer, cached = await support_conversation(query)
+        if cached:
+            print("⚡ [Answer Cache] Reusing the answer to a similar question")
+        print(f"💬 Support Agent: {answer}\n")
 
-        # Step 1: KB Agent retrieves
-        kb_result = kb_agent_search(query)
-
-        # Step 2: Support Agent responds
-        messages = [
-            {"role": "system", "content": "You are a TechStore support agent. Use the KB info to answer."},
-            {"role": "user", "content": f"KB Info:\n{kb_result}\n\nCustomer: {query}"}
-        ]
-        response = client.chat.completions.create(model="gpt-3.5-turbo", messages=messages, temperature=0.7)
-        print(f"💬 Support Agent: {response.choices[0].message.content}\n")
+    print(kb.report())
+    print("🚀 Startup time by component:\n" + startup.report())
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
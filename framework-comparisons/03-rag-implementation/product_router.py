@@ -0,0 +1,151 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Product Routing for RAG Examples
+Most support queries name a product. Chunks are tagged with the products they cover at build
+time, and a query that names a product (or brand) only considers those products' chunks: the
+main search index (same index type, compression and memory map as unrouted queries) is searched
+with an IDSelectorBitmap over the products' rows, and the BM25 path gets the same rows as a mask.
+
+Layout (faiss_index/partitions/):
+    partitions.json                  product -> brand + chunk count, plus the catalog size
+    <product>.rows.npy               chunk rows of the product
+"""
+
+import os
+import re
+import json
+import shutil
+import threading
+import numpy as np
+import faiss
+
+PARTITIONS_DIR = "partitions"
+PARTITIONS_FILE = "partitions.json"
+
+# product id -> (brand, query/text patterns)
+PRODUCTS = {
+    "iphone-15-pro": ("apple", [r"iphone\s*15\s*pro"]),
+    "galaxy-s24-ultra": ("samsung", [r"galaxy\s*s24", r"\bs24\s*ultra"]),
+    "pixel-8-pro": ("google", [r"pixel\s*8"]),
+}
+BRANDS = {
+    "apple": [r"\bapple\b", r"\biphone"],
+    "samsung": [r"\bsamsung\b", r"\bgalaxy\b"],
+    "google": [r"\bgoogle\b", r"\bpixel\b"],
+}
+
+_PRODUCT_PATTERNS = {product: re.compile("|".join(patterns), re.IGNORECASE)
+                     for product, (_, patterns) in PRODUCTS.items()}
+_BRAND_PATTERNS = {brand: re.compile("|".join(patterns), re.IGNORECASE) for brand, patterns in BRANDS.items()}
+
+
+def detect_products(text: str) -> list:
+    """Catalog products named in text, in catalog order."""
+    return [product for product, pattern in _PRODUCT_PATTERNS.items() if pattern.search(text)]
+
+
+def route_query(query: str) -> list:
+    """Products a query is about: named products, else every product of a named brand, else []."""
+    products = detect_products(query)
+    if products:
+        return products
+    brands = [brand for brand, pattern in _BRAND_PATTERNS.items() if pattern.search(query)]
+    return [product for product, (brand, _) in PRODUCTS.items() if brand in brands]
+
+
+def product_metadata(file_title: str, text: str) -> dict:
+    """Build-time chunk metadata: products of the file (from its title) plus products the chunk names."""
+    products = detect_products(file_title)
+    products += [product for product in detect_products(text) if product not in products]
+    brands = sorted({PRODUCTS[product][0] for product in products})
+    return {"products": ",".join(products), "brand": ",".join(brands)}
+
+
+def write_partitions(index_path: str, store):
+    """Write the chunk rows of each product (ids in the search index, rows in the chunk store)."""
+    rows_by_product = {product: [] for product in PRODUCTS}
+    products_column = store.columns.get("products")
+    for row in range(len(store) if products_column is not None else 0):
+        for product in filter(None, products_column[row].split(",")):
+            if product in rows_by_product:
+                rows_by_product[product].append(row)
+
+    path = os.path.join(index_path, PARTITIONS_DIR)
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    partitions = {}
+    for product, rows in rows_by_product.items():
+        if not rows:
+            continue
+        np.save(os.path.join(tmp_path, f"{product}.rows.npy"), np.asarray(rows, dtype=np.int64))
+        partitions[product] = {"brand": PRODUCTS[product][0], "chunks": len(rows)}
+    with open(os.path.join(tmp_path, PARTITIONS_FILE), "w") as f:
+        json.dump({"total": len(store), "products": partitions}, f, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return partitions
+
+
+class ProductRouter:
+    """Routes a query to the chunks of the products it names."""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, PARTITIONS_FILE), "r") as f:
+            header = json.load(f)
+        self.total = header["total"]
+        self.chunks = {product: info["chunks"] for product, info in header["products"].items()}
+        self.rows = {product: np.load(os.path.join(path, f"{product}.rows.npy"), mmap_mode="r")
+                     for product in self.chunks}
+        self._masks = {}
+        self._selectors = {}
+        self._lock = threading.Lock()
+        self.routed = 0
+        self.unrouted = 0
+        self.searched_chunks = 0  # chunks scanned by routed queries
+
+    @classmethod
+    def load(cls, index_path: str):
+        """Router of an index directory, or None if the build predates product partitions."""
+        path = os.path.join(index_path, PARTITIONS_DIR)
+        return cls(path) if os.path.exists(os.path.join(path, PARTITIONS_FILE)) else None
+
+    def route(self, query: str) -> tuple:
+        """Products to search for query; () means search the whole index."""
+        route = tuple(product for product in route_query(query) if product in self.chunks)
+        with self._lock:
+            if route:
+                self.routed += 1
+                self.searched_chunks += sum(self.chunks[product] for product in route)
+            else:
+                self.unrouted += 1
+        return route
+
+    def mask(self, route: tuple) -> np.ndarray:
+        """Boolean row mask of the route's chunks (BM25 path, and the bitmap of selector())."""
+        mask = self._masks.get(route)
+        if mask is None:
+            mask = np.zeros(self.total, dtype=bool)
+            for product in route:
+                mask[self.rows[product]] = True
+            self._masks[route] = mask
+        return mask
+
+    def selector(self, route: tuple):
+        """IDSelectorBitmap over the route's rows, so index.search only returns the route's chunks."""
+        selector = self._selectors.get(route)
+        if selector is None:
+            bitmap = np.packbits(self.mask(route), bitorder="little")
+            # The selector points into bitmap: keep both alive together
+            selector = self._selectors[route] = (faiss.IDSelectorBitmap(self.total, faiss.swig_ptr(bitmap)), bitmap)
+        return selector[0]
+
+    def stats(self) -> dict:
+        routed_share = self.searched_chunks / (self.routed * self.total) if self.routed and self.total else 0.0
+        return {
+            "routed": self.routed,
+            "unrouted": self.unrouted,
+            "avg_share_searched": routed_share,  # share of the catalog a routed query scans
+        }
@@ -0,0 +1,32 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Shared fixtures for the RAG helper tests: a small offline-embedded index (no network, no API key).
+
+Run from 03-rag-implementation:
+    python -m pytest tests
+"""
+
+import os
+import sys
+import pytest
+
+# The helpers are flat modules next to build_index.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from index_factory import IndexSpec  # noqa: E402
+from benchmarks.retrieval import build  # noqa: E402
+from benchmarks.offline_embedder import OfflineEmbeddings  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def embedder():
+    return OfflineEmbeddings(dimensions=64)
+
+
+@pytest.fixture(scope="session")
+def catalog_index(tmp_path_factory, embedder):
+    """faiss_index/-style directory of 300 synthetic catalog chunks."""
+    path = str(tmp_path_factory.mktemp("kb-index"))
+    build(path, 300, embedder, IndexSpec("flat-l2"))
+    return path
@@ -0,0 +1,32 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import pytest
+from bm25_index import BM25Index, write_bm25_index, reciprocal_rank_fusion, tokenize
+
+
+def test_rrf_rewards_agreement_between_rankings():
+    vector = [(1, 0.10), (2, 0.20), (3, 0.30)]
+    keyword = [(3, 9.0), (4, 8.0)]
+    fused = reciprocal_rank_fusion([vector, keyword], k=3)
+    # Row 3 is in both lists; only ranks count, not the (incomparable) raw scores
+    assert [row for row, _ in fused] == [3, 1, 2]
+    assert fused[0][1] == pytest.approx(1 / 63 + 1 / 61)
+    assert len(reciprocal_rank_fusion([vector, keyword], k=10)) == 4
+
+
+def test_number_units_match_either_spelling():
+    assert set(tokenize("50MP camera")) >= {"50mp", "50", "mp", "camera"}
+
+
+def test_bm25_ranks_rare_terms_first(tmp_path):
+    texts = [
+        "Battery: 5000 mAh with fast charging.",
+        "Camera: 50MP main sensor, battery 4000 mAh.",
+        "Display: 6.1 inch OLED.",
+    ]
+    write_bm25_index(str(tmp_path / "bm25"), texts)
+    index = BM25Index(str(tmp_path / "bm25"))
+    assert len(index) == 3
+    assert [row for row, _ in index.search("50 MP camera", k=3)] == [1]
+    rows = [row for row, _ in index.search("battery fast charging", k=3)]
+    assert rows == [0, 1]
@@ -0,0 +1,29 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import pytest
+from langchain_core.documents import Document
+from chunk_store import ChunkStore, write_chunk_store, check_index_dir, CHUNKS_DIR, LEGACY_DOCSTORE_FILE
+
+
+def test_chunk_store_round_trip(tmp_path):
+    documents = [
+        Document(page_content="Battery: 5000 mAh", metadata={"source": "a.txt", "chunk_index": 0}),
+        Document(page_content="Camera: 48 MP ✓", metadata={"source": "b.txt", "chunk_index": 3}),
+    ]
+    write_chunk_store(str(tmp_path / CHUNKS_DIR), ["id-a", "id-b"], documents)
+    store = ChunkStore(str(tmp_path / CHUNKS_DIR))
+    assert len(store) == 2
+    doc = store.document(1)
+    assert (doc.id, doc.page_content) == ("id-b", "Camera: 48 MP ✓")
+    assert doc.metadata == {"source": "b.txt", "chunk_index": 3}
+    check_index_dir(str(tmp_path))
+
+
+def test_legacy_pickle_index_asks_for_a_rebuild(tmp_path):
+    # Layout of builds before the chunk store: index.faiss + pickled docstore
+    (tmp_path / "index.faiss").write_bytes(b"")
+    (tmp_path / LEGACY_DOCSTORE_FILE).write_bytes(b"")
+    with pytest.raises(FileNotFoundError, match="older build_index.py"):
+        check_index_dir(str(tmp_path))
+    with pytest.raises(FileNotFoundError, match="Run `python build_index.py` first"):
+        check_index_dir(str(tmp_path / "missing"))
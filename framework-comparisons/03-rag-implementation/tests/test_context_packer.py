@@ -0,0 +1,45 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import pytest
+import tiktoken
+from langchain_core.documents import Document
+from context_packer import ContextPacker
+
+
+class WordEncoding:
+    """Offline stand-in for cl100k_base: one token per word."""
+
+    def encode_ordinary(self, text: str) -> list:
+        return text.split()
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch):
+    monkeypatch.setattr(tiktoken, "get_encoding", lambda name: WordEncoding())
+
+
+def chunk(source: str, index: int, text: str) -> Document:
+    return Document(page_content=text, metadata={"source": source, "chunk_index": index})
+
+
+def test_adjacent_chunks_are_merged_and_duplicate_lines_dropped():
+    docs = [
+        chunk("pixel.txt", 1, "Battery: 4575 mAh with fast charging\nCamera: 50 MP main sensor"),
+        chunk("comparison.md", 0, "Comparison sheet\n- battery: 4575 mAh with fast charging"),
+        chunk("pixel.txt", 0, "Pixel 8 specifications\nBattery: 4575 mAh with fast charging"),
+    ]
+    context, used = ContextPacker(token_budget=100).pack(docs)
+    assert context == ("Pixel 8 specifications\nBattery: 4575 mAh with fast charging\nCamera: 50 MP main sensor"
+                       "\n\nComparison sheet")
+    assert len(used) == 3
+
+
+def test_context_stays_within_the_token_budget():
+    docs = [chunk(f"phone-{i}.txt", 0, "\n".join(f"spec line {i} {j}" for j in range(5))) for i in range(4)]
+    packer = ContextPacker(token_budget=10)
+    context, used = packer.pack(docs)
+    # Each line costs 4 words + 1 separator: two lines fit, the rest of the ranking is dropped
+    assert context == "spec line 0 0\nspec line 0 1"
+    assert used == docs[:1]
+    stats = packer.stats()
+    assert stats["tokens_out"] <= 10 < stats["tokens_in"]
@@ -0,0 +1,47 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import embedding_cache
+from langchain_core.embeddings import Embeddings
+from embedding_cache import EmbeddingCache, CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    model = "counting"
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts: list) -> list:
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> list:
+        return self.embed_documents([text])[0]
+
+
+def test_eviction_drops_least_recently_used(tmp_path, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: clock[0])
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite"), max_entries=10)
+    for i in range(10):
+        clock[0] = float(i)
+        cache.put_many({f"k{i}": [float(i)]})
+    clock[0] = 10.0
+    assert cache.get_many(["k0"]) == {"k0": [0.0]}  # k0 is now the most recently used
+
+    clock[0] = 11.0
+    cache.put_many({"k10": [10.0]})
+    # Over the bound: trimmed to 90% by dropping the two least recently used entries
+    assert cache.stats()["entries"] == 9
+    assert cache.stats()["evictions"] == 2
+    assert set(cache.get_many([f"k{i}" for i in range(11)])) == {"k0"} | {f"k{i}" for i in range(3, 11)}
+
+
+def test_cached_embeddings_only_embed_misses(tmp_path):
+    embedder = CountingEmbeddings()
+    cached = CachedEmbeddings(embedder, EmbeddingCache(str(tmp_path / "cache.sqlite")))
+    first = cached.embed_documents(["battery", "camera", "battery"])
+    assert embedder.embedded == ["battery", "camera"]
+    assert cached.embed_documents(["camera", "battery"]) == [first[1], first[0]]
+    assert embedder.embedded == ["battery", "camera"]
+    assert cached.cache.stats()["hits"] == 2
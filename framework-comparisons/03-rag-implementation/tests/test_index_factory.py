@@ -0,0 +1,19 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import os
+import numpy as np
+import faiss
+from index_factory import IndexSpec, SEARCH_INDEX_FILE, write_search_index
+
+
+def test_int8_storage_writes_a_scalar_quantized_index_and_reports_its_file_size(tmp_path):
+    vectors = np.random.default_rng(0).normal(size=(500, 32)).astype(np.float32)
+    canonical = faiss.IndexFlatL2(32)
+    canonical.add(vectors)
+    info = write_search_index(str(tmp_path), canonical, IndexSpec("flat-l2", storage="int8"))
+    search_file = os.path.join(str(tmp_path), SEARCH_INDEX_FILE)
+    assert isinstance(faiss.read_index(search_file), faiss.IndexScalarQuantizer)
+    report = info["compression"]
+    assert report["search_mb"] == os.path.getsize(search_file) / 1e6
+    assert report["saved_ratio"] > 0.7  # 1 byte instead of 4 per dimension
+    assert report["recall_at_k_reranked"] == 1.0
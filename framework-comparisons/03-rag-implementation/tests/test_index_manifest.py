@@ -0,0 +1,38 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import os
+from index_manifest import IndexManifest, chunk_ids
+
+
+def test_chunk_ids_are_stable_and_unique():
+    ids = chunk_ids("phones.txt", ["battery", "camera", "battery"])
+    assert len(set(ids)) == 3
+    assert ids[2] == f"{ids[0]}-1"
+    # An unchanged chunk keeps its id when the rest of the file changes
+    assert chunk_ids("phones.txt", ["display", "camera"])[1] == ids[1]
+    assert chunk_ids("tablets.txt", ["camera"])[0] != ids[1]
+
+
+def test_file_changed_ignores_touched_but_identical_files(tmp_path):
+    path = tmp_path / "phones.txt"
+    path.write_text("battery: 5000 mAh")
+    manifest = IndexManifest()
+    assert manifest.file_changed("phones.txt", str(path))
+    manifest.record("phones.txt", str(path), ["a"])
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert not manifest.file_changed("phones.txt", str(path))
+
+    path.write_text("battery: 4000 mAh")
+    assert manifest.file_changed("phones.txt", str(path))
+
+
+def test_manifest_round_trip(tmp_path):
+    manifest = IndexManifest(settings={"chunk_size": 500})
+    manifest.files["phones.txt"] = {"hash": "h", "size": 1, "mtime_ns": 2, "chunks": ["a", "b"]}
+    manifest.save(str(tmp_path))
+    loaded = IndexManifest.load(str(tmp_path))
+    assert loaded.settings == {"chunk_size": 500}
+    assert loaded.all_chunk_ids() == ["a", "b"]
+    assert IndexManifest.load(str(tmp_path / "missing")) is None
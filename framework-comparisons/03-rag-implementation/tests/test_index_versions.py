@@ -0,0 +1,50 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import os
+
+from index_versions import (VERSIONS_DIR, current_version, resolve_index_dir, new_version_dir, publish,
+                            prune_versions)
+
+
+def _version(root, name: str) -> str:
+    path = os.path.join(root, VERSIONS_DIR, name)
+    os.makedirs(path)
+    return path
+
+
+def test_unversioned_directory_is_read_in_place(tmp_path):
+    assert current_version(str(tmp_path)) is None
+    assert resolve_index_dir(str(tmp_path)) == str(tmp_path)
+
+
+def test_publish_swaps_the_current_pointer(tmp_path):
+    root = str(tmp_path)
+    first = new_version_dir(root)
+    with open(os.path.join(first, "index_info.json"), "w") as f:
+        f.write("{}")
+    publish(root, first)
+    assert resolve_index_dir(root) == first
+    second = new_version_dir(root, copy_from=first)
+    assert os.path.exists(os.path.join(second, "index_info.json"))  # incremental builds start from a copy
+    assert publish(root, second) == os.path.basename(second)
+    assert resolve_index_dir(root) == second
+    assert not os.path.exists(os.path.join(root, "current.tmp"))
+
+
+def test_prune_keeps_the_newest_versions(tmp_path):
+    root = str(tmp_path)
+    for name in ("20260101T000000-a", "20260102T000000-b", "20260103T000000-c", "20260104T000000-d"):
+        _version(root, name)
+    publish(root, os.path.join(root, VERSIONS_DIR, "20260104T000000-d"), keep=2)
+    assert sorted(os.listdir(os.path.join(root, VERSIONS_DIR))) == ["20260103T000000-c", "20260104T000000-d"]
+
+
+def test_prune_never_deletes_the_published_version(tmp_path):
+    root = str(tmp_path)
+    oldest = _version(root, "20260101T000000-a")
+    publish(root, oldest)
+    for name in ("20260102T000000-b", "20260103T000000-c"):
+        _version(root, name)
+    prune_versions(root, keep=1)
+    assert sorted(os.listdir(os.path.join(root, VERSIONS_DIR))) == ["20260101T000000-a", "20260103T000000-c"]
+    assert resolve_index_dir(root) == oldest
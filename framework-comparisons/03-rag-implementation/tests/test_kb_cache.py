@@ -0,0 +1,33 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import kb_cache
+from kb_cache import LRUTTLCache, normalize_query
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(kb_cache.time, "monotonic", lambda: clock[0])
+    cache = LRUTTLCache(max_entries=8, ttl_seconds=60)
+    cache.put("q", "answer")
+    clock[0] = 159.0
+    assert cache.get("q") == "answer"
+    clock[0] = 161.0
+    assert cache.get("q") is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUTTLCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # b is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_normalize_query():
+    assert normalize_query("  What's the  Battery life?? ") == normalize_query("what's the battery life")
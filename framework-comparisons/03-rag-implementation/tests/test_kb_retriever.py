@@ -0,0 +1,90 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import os
+import time
+import numpy as np
+import faiss
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from chunk_store import write_chunk_store, INDEX_FILE, CHUNKS_DIR
+from index_factory import IndexSpec, write_search_index
+from bm25_index import write_bm25_index, BM25_DIR
+from kb_retriever import ChunkStoreRetriever
+from index_versions import new_version_dir, publish
+
+KEYWORD_CHUNK = "Every phone ships with a two year extended warranty option."
+
+
+class FixedEmbeddings(Embeddings):
+    """Every query embeds to the same vector: the first unit axis."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed_documents(self, texts: list) -> list:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list:
+        return [1.0] + [0.0] * (self.dim - 1)
+
+
+def write_index(path: str, vectors: np.ndarray, texts: list, spec: IndexSpec = None):
+    documents = [Document(page_content=text, metadata={"source": f"doc-{i}.txt"}) for i, text in enumerate(texts)]
+    canonical = faiss.IndexFlatL2(vectors.shape[1])
+    canonical.add(vectors)
+    faiss.write_index(canonical, os.path.join(path, INDEX_FILE))
+    write_chunk_store(os.path.join(path, CHUNKS_DIR), [f"doc-{i}" for i in range(len(texts))], documents)
+    write_bm25_index(os.path.join(path, BM25_DIR), texts)
+    write_search_index(path, canonical, spec or IndexSpec("flat-l2"))
+
+
+def filler_index(path: str, dim: int = 8, spec: IndexSpec = None):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(30, dim)).astype(np.float32)
+    write_index(path, vectors, [f"Filler spec sheet number {i}." for i in range(30)], spec)
+
+
+def test_keyword_only_hit_survives_mmr(tmp_path):
+    # 30 filler chunks close to the query vector, and one chunk only BM25 can find (orthogonal vector)
+    dim = 8
+    rng = np.random.default_rng(0)
+    vectors = np.zeros((31, dim), dtype=np.float32)
+    vectors[:30, 0] = 1.0
+    vectors[:30, 1:] = rng.normal(scale=0.1, size=(30, dim - 1))
+    vectors[30, 1] = 1.0
+    texts = [f"Filler spec sheet number {i} about displays and cameras." for i in range(30)] + [KEYWORD_CHUNK]
+    write_index(str(tmp_path), vectors, texts)
+
+    retriever = ChunkStoreRetriever(str(tmp_path), FixedEmbeddings(dim), k=3, cache_size=0)
+    docs = retriever.invoke("two year extended warranty")
+    # Top of the fused ranking (BM25 rank 1 + vector rank 31), so MMR must keep it first
+    assert docs[0].page_content == KEYWORD_CHUNK
+
+
+def test_reload_follows_the_published_directory(tmp_path):
+    root = str(tmp_path)
+    first = new_version_dir(root)
+    filler_index(first)
+    publish(root, first)
+    retriever = ChunkStoreRetriever(root, FixedEmbeddings(8), reload_check_seconds=0)
+    # A copied build keeps index_info.json unchanged; the new directory alone must trigger the swap
+    second = new_version_dir(root, copy_from=first)
+    publish(root, second, keep=1)
+    for _ in range(100):
+        if retriever.version == os.path.basename(second):
+            break
+        time.sleep(0.05)
+    assert retriever.version == os.path.basename(second)
+    assert len(retriever.invoke("filler")) == 3
+
+
+def test_pruned_version_keeps_serving_until_the_swap(tmp_path):
+    root = str(tmp_path)
+    first = new_version_dir(root)
+    filler_index(first, spec=IndexSpec("hnsw"))  # MMR needs index.faiss next to the HNSW search index
+    publish(root, first)
+    retriever = ChunkStoreRetriever(root, FixedEmbeddings(8), hybrid=False, reload_check_seconds=3600)
+    for _ in range(2):
+        publish(root, new_version_dir(root, copy_from=first), keep=1)
+    assert not os.path.exists(first)
+    assert len(retriever.invoke("filler")) == 3
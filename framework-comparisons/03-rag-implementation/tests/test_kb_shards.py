@@ -0,0 +1,51 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import shutil
+from types import SimpleNamespace
+from langchain_core.documents import Document
+from index_factory import IndexSpec
+from kb_retriever import ChunkStoreRetriever
+from kb_shards import ShardedRetriever, write_shards, open_retriever
+from benchmarks.catalog import product_name
+
+
+def test_sharded_query_end_to_end(tmp_path, catalog_index, embedder):
+    path = str(tmp_path / "index")
+    shutil.copytree(catalog_index, path)
+    status = write_shards(path, IndexSpec("flat-l2"), "hash", 2)
+    assert set(status.values()) == {"rebuilt"}
+
+    retriever = open_retriever(path, embedder, k=3)
+    assert isinstance(retriever, ShardedRetriever)
+    try:
+        query = f"What is the main camera resolution of the {product_name(3)}?"
+        docs = retriever.invoke(query)
+        assert len({doc.id for doc in docs}) == 3
+        assert all(doc.page_content for doc in docs)
+        assert len(retriever) == len(ChunkStoreRetriever(path, embedder))
+        assert retriever.shard_requests == 2  # hash shards: every query goes to both
+    finally:
+        retriever.close()
+
+
+def test_product_shards_ignore_the_shard_count(tmp_path, catalog_index):
+    path = str(tmp_path / "index")
+    shutil.copytree(catalog_index, path)
+    write_shards(path, IndexSpec("flat-l2"), "product", 2)
+    status = write_shards(path, IndexSpec("flat-l2"), "product", 4)
+    assert set(status.values()) == {"unchanged"}
+
+
+def test_hybrid_merge_does_not_compare_bm25_scores_across_shards():
+    # Shard "a" scores BM25 on a different scale; rescaling it must not change the merged order
+    merger = SimpleNamespace(mmr=False)
+
+    def shards(scale: float) -> list:
+        documents = {name: [Document(page_content=f"chunk {i}", id=f"{name}{i}") for i in range(3)] for name in "ab"}
+        return [("a", {"vector": [(0, 3.0), (1, 4.0), (2, 5.0)], "bm25": [(2, 9.0 * scale), (1, 8.0 * scale)],
+                       "documents": documents["a"]}),
+                ("b", {"vector": [(0, 1.0), (1, 2.0), (2, 6.0)], "bm25": [(2, 3.0), (1, 2.5)],
+                       "documents": documents["b"]})]
+
+    merged = [doc.id for doc in ShardedRetriever._merge(merger, shards(1.0), 6, 6, False)]
+    assert [doc.id for doc in ShardedRetriever._merge(merger, shards(0.01), 6, 6, False)] == merged
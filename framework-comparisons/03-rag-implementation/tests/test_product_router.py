@@ -0,0 +1,51 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import os
+import numpy as np
+import faiss
+import pytest
+from langchain_core.documents import Document
+from chunk_store import ChunkStore, write_chunk_store, INDEX_FILE, CHUNKS_DIR
+from index_factory import IndexSpec, write_search_index
+from product_router import PRODUCTS, write_partitions, route_query, product_metadata
+from kb_retriever import ChunkStoreRetriever
+from test_kb_retriever import FixedEmbeddings
+
+TITLES = {"iphone-15-pro": "iPhone 15 Pro", "galaxy-s24-ultra": "Galaxy S24 Ultra", "pixel-8-pro": "Pixel 8 Pro"}
+
+
+def write_catalog(path: str, spec: IndexSpec, dim: int = 16, per_product: int = 100):
+    # Every chunk sits close to the query vector, so an unfiltered search would mix all products
+    rng = np.random.default_rng(0)
+    documents = []
+    for product in PRODUCTS:
+        for i in range(per_product):
+            text = f"{TITLES[product]} spec line {i}"
+            documents.append(Document(page_content=text, metadata={"source": f"{product}.txt",
+                                                                    **product_metadata(TITLES[product], text)}))
+    vectors = rng.normal(scale=0.1, size=(len(documents), dim)).astype(np.float32)
+    vectors[:, 0] += 1.0
+    canonical = faiss.IndexFlatL2(dim)
+    canonical.add(vectors)
+    faiss.write_index(canonical, os.path.join(path, INDEX_FILE))
+    write_chunk_store(os.path.join(path, CHUNKS_DIR), [f"doc-{i}" for i in range(len(documents))], documents)
+    write_partitions(path, ChunkStore(os.path.join(path, CHUNKS_DIR)))
+    write_search_index(path, canonical, spec)
+
+
+def test_route_query_by_product_and_brand():
+    assert route_query("Battery of the iPhone 15 Pro?") == ["iphone-15-pro"]
+    assert route_query("Any Samsung phones?") == ["galaxy-s24-ultra"]
+    assert route_query("Which phone is cheapest?") == []
+
+
+@pytest.mark.parametrize("spec", [IndexSpec("flat-l2"), IndexSpec("hnsw"), IndexSpec("ivf-flat", nlist=8, nprobe=8),
+                                  IndexSpec("flat-ip", storage="int8", oversample=4)],
+                         ids=lambda spec: spec.label())
+def test_routed_query_searches_only_the_products_rows_of_the_main_index(tmp_path, spec):
+    write_catalog(str(tmp_path), spec)
+    retriever = ChunkStoreRetriever(str(tmp_path), FixedEmbeddings(16), k=5, hybrid=False, mmr=False, cache_size=0)
+    docs = retriever.invoke("How long does the Pixel 8 Pro battery last?")
+    assert len(docs) == 5
+    assert {doc.metadata["products"] for doc in docs} == {"pixel-8-pro"}
+    assert retriever.routing_stats()["routed"] == 1
@@ -0,0 +1,14 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import requests
+import tiktoken
+from token_counting import WordCountEncoding, load_encoding
+
+
+def test_falls_back_to_word_count_when_the_encoding_cannot_be_downloaded(monkeypatch):
+    def offline(name):
+        raise requests.exceptions.ConnectionError("Failed to resolve 'openaipublic.blob.core.windows.net'")
+    monkeypatch.setattr(tiktoken, "get_encoding", offline)
+    encoding = load_encoding()
+    assert isinstance(encoding, WordCountEncoding)
+    assert encoding.encode_ordinary_batch(["two words", "and three more"]) == [["two", "words"], ["and", "three", "more"]]
@@ -0,0 +1,33 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Token Counting for RAG Examples
+tiktoken's cl100k_base, used by the ingestion pipeline (embedding batch sizes) and the context
+packer (context budget). The encoding is downloaded on first use; when it is not cached and
+cannot be fetched (offline runs, benchmarks), whitespace-separated words are counted instead.
+"""
+
+import tiktoken
+
+ENCODING_NAME = "cl100k_base"
+
+
+class WordCountEncoding:
+    """Offline stand-in for a tiktoken encoding: one token per whitespace-separated word."""
+
+    name = "words"
+
+    def encode_ordinary(self, text: str) -> list:
+        return text.split()
+
+    def encode_ordinary_batch(self, texts: list) -> list:
+        return [text.split() for text in texts]
+
+
+def load_encoding(name: str = ENCODING_NAME):
+    """The tiktoken encoding, or WordCountEncoding when it cannot be downloaded."""
+    try:
+        return tiktoken.get_encoding(name)
+    except OSError:  # requests' ConnectionError/Timeout are IOErrors
+        print(f"⚠️  tiktoken encoding {name} unavailable offline, counting words instead")
+        return WordCountEncoding()
@@ -6,14 +6,18 @@ Demonstrates: 2-agent system with short-term, long-term (persistent), and summar
 """
 
 import os
+import sys
 import json
 from dotenv import load_dotenv
-from openai import OpenAI
+
+# Shared LLM client registry lives in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import openai_client, format_pool_stats
 
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Shared pooled OpenAI client (see llm_clients.py)
+client = openai_client()
 
 # Agent 1: Memory Manager (persistent long-term storage)
 PROFILE_FILE = os.path.join(os.path.dirname(__file__), "customer_profile.json")
@@ -91,6 +95,7 @@ def main():
     # Show memories
     print(f"🧠 Short-term: {len(short_term_memory)} messages")
     print(f"💾 Permanent: {PROFILE_FILE} - {customer_profile['preferences']}\n")
+    print("🔌 LLM connection pool:\n" + format_pool_stats())
 
 if __name__ == "__main__":
     main()
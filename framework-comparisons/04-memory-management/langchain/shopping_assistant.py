@@ -6,6 +6,7 @@ Demonstrates: 2-agent system with short-term, long-term (persistent), and summar
 """
 
 import os
+import sys
 import json
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
@@ -13,10 +14,15 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.messages import HumanMessage, AIMessage
 
+# Shared LLM client registry lives in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import registry, format_pool_stats
+
 load_dotenv()
 
-# Initialize LLM
-llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7)
+# Initialize LLM on the shared pooled HTTP clients (see llm_clients.py)
+llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7, http_client=registry.http_client(),
+                 http_async_client=registry.async_http_client())
 
 # Agent 1: Memory Manager (persistent long-term storage)
 PROFILE_FILE = os.path.join(os.path.dirname(__file__), "customer_profile.json")
@@ -113,6 +119,7 @@ def main():
     print(f"File: {PROFILE_FILE}")
     print(f"Current preferences: {customer_profile['preferences']}")
     print("ℹ️  This profile will be loaded when you run the program again.\n")
+    print("🔌 LLM connection pool:\n" + format_pool_stats())
 
 if __name__ == "__main__":
     main()
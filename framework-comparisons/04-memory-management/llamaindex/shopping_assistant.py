@@ -6,15 +6,21 @@ Demonstrates: 2-agent system with short-term, long-term (persistent), and summar
 """
 
 import os
+import sys
 import json
 from dotenv import load_dotenv
 from llama_index.core.llms import ChatMessage, MessageRole
 from llama_index.llms.openai import OpenAI
 
+# Shared LLM client registry lives in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from llm_clients import registry, format_pool_stats
+
 load_dotenv()
 
-# Initialize LLM
-llm = OpenAI(model="gpt-3.5-turbo", temperature=0.7)
+# Initialize LLM on the shared pooled HTTP clients (see llm_clients.py)
+llm = OpenAI(model="gpt-3.5-turbo", temperature=0.7, http_client=registry.http_client(),
+             async_http_client=registry.async_http_client())
 
 # Agent 1: Memory Manager (persistent long-term storage)
 PROFILE_FILE = os.path.join(os.path.dirname(__file__), "customer_profile.json")
@@ -91,6 +97,7 @@ def main():
     # Show memories
     print(f"🧠 Short-term: {len(short_term_memory)} messages")
     print(f"💾 Permanent: {PROFILE_FILE} - {customer_profile['preferences']}\n")
+    print("🔌 LLM connection pool:\n" + format_pool_stats())
 
 if __name__ == "__main__":
     main()
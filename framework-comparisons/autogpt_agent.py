@@ -0,0 +1,225 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Shared Agent Loop for the AutoGPT-style Agents
+chat() loops (LLM call, tools, LLM call, ...) until the model answers, bounded by max steps and a
+wall-clock deadline that is also checked while a response streams in and while tools run. All
+tool calls of one response run concurrently on a bounded thread pool. LLM latency, tool latency
+and tokens are recorded per step, and the history is windowed to a token budget.
+
+If a step fails (API error, interrupted stream), the turn is dropped from the history before the
+error propagates, so an assistant tool call is never left without its tool results.
+
+Usage (scripts add framework-comparisons/ to sys.path):
+    from autogpt_agent import AutoGPTAgent
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from llm_clients import openai_client
+from conversation_window import (ConversationWindow, render_messages, HISTORY_TOKEN_BUDGET, SUMMARY_MAX_TOKENS,
+                                 SUMMARY_PROMPT)
+
+MAX_TOOL_WORKERS = 8  # tool calls executed at once
+MAX_STEPS = 5  # LLM calls per user message
+DEADLINE_SECONDS = 60.0  # wall-clock budget per user message
+
+
+class DeadlineExceeded(Exception):
+    """The deadline passed while a response was streaming in."""
+
+
+class AutoGPTAgent:
+    """AutoGPT-style tool-calling agent over a command registry (execute_command, get_commands_schema)."""
+
+    def __init__(self, api_key: str, system_prompt: str, commands, model: str = "gpt-3.5-turbo",
+                 max_tool_workers: int = MAX_TOOL_WORKERS, max_steps: int = MAX_STEPS,
+                 deadline_seconds: float = DEADLINE_SECONDS, history_tokens: int = HISTORY_TOKEN_BUDGET):
+        self.client = openai_client(api_key)  # shared pooled client
+        self.model = model
+        self.commands = commands
+        self.history = ConversationWindow(system_prompt, self.summarize_history, self.model,
+                                          token_budget=history_tokens)
+        self.max_steps = max_steps
+        self.deadline_seconds = deadline_seconds
+        self.last_steps = []  # per-step stats of the last chat() call
+        self.stop_reason = None
+        self.tool_pool = ThreadPoolExecutor(max_workers=max_tool_workers, thread_name_prefix="autogpt-tool")
+
+    def summarize_history(self, summary: str, messages: list) -> str:
+        """Fold turns evicted from the history window into the running summary (one short completion)."""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": f"Summary so far:\n{summary or '(none)'}\n\n"
+                                            f"Messages to add:\n{render_messages(messages)}"}
+            ],
+            max_tokens=SUMMARY_MAX_TOKENS
+        )
+        return response.choices[0].message.content or summary
+
+    def run_tool_call(self, tool_call: dict) -> str:
+        """Execute one tool call (bad arguments come back as an error the model can read)."""
+        name = tool_call["function"]["name"]
+        try:
+            args = json.loads(tool_call["function"]["arguments"] or "{}")
+        except json.JSONDecodeError as e:
+            return f"Invalid arguments for {name}: {e}"
+        print(f"→ Calling {name} with {args}")
+        try:
+            return self.commands.execute_command(name, **args)
+        except TypeError as e:
+            return f"Invalid arguments for {name}: {e}"
+
+    def run_tool_calls(self, tool_calls: list, deadline: float) -> list:
+        """Execute all tool calls of one response concurrently; results are in tool_calls order.
+
+        Calls still running at the deadline get a timeout result, so every call has an answer.
+        """
+        futures = [self.tool_pool.submit(self.run_tool_call, tool_call) for tool_call in tool_calls]
+        done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        results = []
+        for tool_call, future in zip(tool_calls, futures):
+            if future in done:
+                results.append(future.result())
+            else:
+                future.cancel()
+                results.append(f"{tool_call['function']['name']} did not finish before the deadline")
+        return results
+
+    def complete(self, messages: list, tool_choice: str, deadline: float, on_token=None) -> tuple:
+        """One completion -> (content, tool calls as history dicts, usage).
+
+        With on_token, the response is streamed: answer tokens go to on_token as they arrive and
+        tool call fragments are reassembled by index. Once a response shows a tool call it is a
+        tool step, not the answer, and its content is kept out of on_token. A stream still running
+        at the deadline is closed and raises DeadlineExceeded.
+        """
+        request = dict(model=self.model, messages=messages, tools=self.commands.get_commands_schema(),
+                       tool_choice=tool_choice, timeout=deadline - time.monotonic())
+        if on_token is None:
+            response = self.client.chat.completions.create(**request)
+            message = response.choices[0].message
+            tool_calls = [
+                {
+                    "id": tool_call.id,
+                    "type": "function",
+                    "function": {"name": tool_call.function.name, "arguments": tool_call.function.arguments}
+                }
+                for tool_call in message.tool_calls or []
+            ]
+            return message.content, tool_calls, response.usage
+
+        stream = self.client.chat.completions.create(**request, stream=True, stream_options={"include_usage": True})
+        content, calls, usage = [], {}, None
+        with stream:
+            for chunk in stream:
+                # The request timeout bounds each read, not the whole stream
+                if time.monotonic() > deadline:
+                    raise DeadlineExceeded()
+                if chunk.usage:
+                    usage = chunk.usage  # last chunk, no choices
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content.append(delta.content)
+                    if not (calls or delta.tool_calls):
+                        on_token(delta.content)
+                for fragment in delta.tool_calls or []:
+                    call = calls.setdefault(fragment.index, {"id": None, "type": "function",
+                                                             "function": {"name": "", "arguments": ""}})
+                    if fragment.id:
+                        call["id"] = fragment.id
+                    if fragment.function and fragment.function.name:
+                        call["function"]["name"] += fragment.function.name
+                    if fragment.function and fragment.function.arguments:
+                        call["function"]["arguments"] += fragment.function.arguments
+        return "".join(content) or None, [calls[index] for index in sorted(calls)], usage
+
+    def chat(self, user_message: str, max_steps: int = None, deadline_seconds: float = None, on_token=None) -> str:
+        """Process a user message: call tools until the model answers, max_steps LLM calls or the deadline.
+
+        on_token receives answer tokens as they stream in (None: wait for complete responses).
+        """
+        max_steps = max_steps or self.max_steps
+        deadline = time.monotonic() + (deadline_seconds or self.deadline_seconds)
+
+        self.last_steps = []
+        self.stop_reason = "max_steps"  # unless the model answers or the deadline passes first
+        content = None
+        try:
+            # Every append may fold the oldest turns into the summary (an LLM call that can fail too)
+            self.history.start_turn(user_message)
+            for step in range(1, max_steps + 1):
+                if time.monotonic() >= deadline:
+                    self.stop_reason = "deadline"
+                    break
+                record = {"step": step, "llm_ms": 0.0, "tool_ms": 0.0, "tool_calls": 0,
+                          "prompt_tokens": 0, "completion_tokens": 0}
+                self.last_steps.append(record)
+
+                # The last step may not call tools: the model has to answer with what it has
+                tool_choice = "none" if step == max_steps else "auto"
+                start = time.perf_counter()
+                try:
+                    message_content, tool_calls, usage = self.complete(self.history.messages(), tool_choice,
+                                                                       deadline, on_token=on_token)
+                except DeadlineExceeded:
+                    self.stop_reason = "deadline"
+                    break
+                finally:
+                    record["llm_ms"] = (time.perf_counter() - start) * 1000
+                if usage:
+                    record["prompt_tokens"] = usage.prompt_tokens
+                    record["completion_tokens"] = usage.completion_tokens
+
+                if not tool_calls:
+                    content = message_content
+                    # A forced answer on the last step means the step budget ran out
+                    self.stop_reason = "answered" if tool_choice == "auto" else "max_steps"
+                    break
+
+                # Execute every call at once (possibly several, e.g. one per city) and add the results in call order
+                self.history.append({
+                    "role": "assistant",
+                    "content": message_content,
+                    "tool_calls": tool_calls
+                })
+                start = time.perf_counter()
+                results = self.run_tool_calls(tool_calls, deadline)
+                record["tool_ms"] = (time.perf_counter() - start) * 1000
+                record["tool_calls"] = len(tool_calls)
+                for tool_call, result in zip(tool_calls, results):
+                    self.history.append({
+                        "role": "tool",
+                        "tool_call_id": tool_call["id"],
+                        "content": result
+                    })
+
+            if content is None:
+                content = f"Stopped after {len(self.last_steps)} steps ({self.stop_reason}) without a final answer."
+            self.history.append({
+                "role": "assistant",
+                "content": content
+            })
+        except BaseException:
+            # Never keep a half-finished turn (e.g. tool calls without results): the next request would be rejected
+            self.history.discard_turn()
+            raise
+        return content
+
+    def step_report(self) -> str:
+        """Per-step LLM/tool latency and tokens of the last chat() call."""
+        lines = [
+            f"   step {s['step']}: LLM {s['llm_ms']:.0f} ms, tools {s['tool_ms']:.0f} ms ({s['tool_calls']} calls), "
+            f"tokens {s['prompt_tokens']} in / {s['completion_tokens']} out"
+            for s in self.last_steps
+        ]
+        total_ms = sum(s["llm_ms"] + s["tool_ms"] for s in self.last_steps)
+        lines.append(f"   {len(self.last_steps)} steps, {total_ms:.0f} ms, stopped: {self.stop_reason}")
+        lines.append(self.history.report())
+        return "\n".join(lines)
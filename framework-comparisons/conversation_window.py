@@ -0,0 +1,110 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Shared Conversation Window for the AutoGPT-style Agents
+Keeps an agent's chat history within a token budget: the system prompt is pinned, recent turns are
+re-sent as-is and older turns are folded into a running summary by the agent's summarize callback.
+
+Usage (scripts add framework-comparisons/ to sys.path):
+    from conversation_window import ConversationWindow, render_messages, SUMMARY_PROMPT
+"""
+
+import tiktoken
+
+HISTORY_TOKEN_BUDGET = 2000  # tokens of recent turns re-sent with every completion
+MESSAGE_OVERHEAD_TOKENS = 4  # role and separators per chat message
+SUMMARY_MAX_TOKENS = 200
+SUMMARY_PROMPT = ("Summarize this conversation for an assistant that will continue it. Keep facts, "
+                  "tool results and user preferences that may matter later. Reply with the summary only.")
+
+
+class ConversationWindow:
+    """Token-budgeted conversation history: the system prompt is pinned, the newest turns are kept
+    within token_budget and older turns are folded into a running summary.
+
+    A turn is a user message plus everything the agent appended for it (assistant tool calls, tool
+    results, answer) and is evicted whole, so a tool call is never separated from its result.
+    The budget is enforced on every append, so large tool results fold older turns mid-turn.
+    Token counts are computed once per message, when it is appended.
+    """
+
+    def __init__(self, system_prompt: str, summarize, model: str, token_budget: int = HISTORY_TOKEN_BUDGET):
+        self.system_prompt = system_prompt
+        self.summarize = summarize  # (summary so far, evicted messages) -> new summary
+        self.token_budget = token_budget
+        try:
+            self.encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.turns = []  # [[message, ...], ...] oldest first
+        self.turn_tokens = []
+        self.tokens = 0  # tokens of the turns in the window
+        self.summary = ""
+        self.folded_turns = 0
+
+    def count(self, message: dict) -> int:
+        """Approximate prompt tokens of one message (content, tool calls and per-message overhead)."""
+        text = message.get("content") or ""
+        for tool_call in message.get("tool_calls", []):
+            text += tool_call["function"]["name"] + tool_call["function"]["arguments"]
+        return len(self.encoding.encode_ordinary(text)) + MESSAGE_OVERHEAD_TOKENS
+
+    def start_turn(self, user_message: str):
+        """Open a turn for a new user message, folding the oldest turns if the window is over budget."""
+        self.turns.append([])
+        self.turn_tokens.append(0)
+        self.append({"role": "user", "content": user_message})
+
+    def append(self, message: dict):
+        """Add a message to the current turn, folding the oldest turns if the window is over budget."""
+        tokens = self.count(message)
+        self.turns[-1].append(message)
+        self.turn_tokens[-1] += tokens
+        self.tokens += tokens
+        self.fit()
+
+    def discard_turn(self):
+        """Drop the current turn (a failed chat() call), user message included."""
+        if self.turns:
+            self.turns.pop()
+            self.tokens -= self.turn_tokens.pop()
+
+    def fit(self):
+        """Fold the oldest whole turns (never the current one) into the summary until the window fits.
+
+        The turns are summarized in one call and only removed once it succeeds, so a failed
+        summary leaves the window as it was.
+        """
+        count, tokens = 0, self.tokens
+        while tokens > self.token_budget and count < len(self.turns) - 1:
+            tokens -= self.turn_tokens[count]
+            count += 1
+        if not count:
+            return
+        self.summary = self.summarize(self.summary, [message for turn in self.turns[:count] for message in turn])
+        del self.turns[:count]
+        del self.turn_tokens[:count]
+        self.tokens = tokens
+        self.folded_turns += count
+
+    def messages(self) -> list:
+        """Messages to send: system prompt (+ summary of folded turns), then the window."""
+        system = self.system_prompt
+        if self.summary:
+            system += f"\n\nSummary of the earlier conversation:\n{self.summary}"
+        return [{"role": "system", "content": system}] + [message for turn in self.turns for message in turn]
+
+    def report(self) -> str:
+        return (f"   History: {len(self.turns)} turns / {self.tokens} tokens in window (budget {self.token_budget}), "
+                f"{self.folded_turns} turns folded into a {len(self.encoding.encode_ordinary(self.summary))}-token summary")
+
+
+def render_messages(messages: list) -> str:
+    """Plain-text transcript of history messages for the summarizer."""
+    lines = []
+    for message in messages:
+        for tool_call in message.get("tool_calls", []):
+            lines.append(f"assistant called {tool_call['function']['name']}({tool_call['function']['arguments']})")
+        if message.get("content"):
+            lines.append(f"{message['role']}: {message['content']}")
+    return "\n".join(lines)
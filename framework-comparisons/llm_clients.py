@@ -0,0 +1,185 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Shared LLM Clients for the Framework Examples
+One process-wide registry of OpenAI clients: every agent in a script gets the same OpenAI /
+AsyncOpenAI client, on one pooled keep-alive HTTP client, so concurrent agents share connections
+and only the first request pays for the TCP + TLS handshake.
+
+Pool limits (environment):
+    LLM_MAX_CONNECTIONS      connections open at once per client         (default 20)
+    LLM_MAX_KEEPALIVE        idle connections kept for reuse               (default 20)
+    LLM_KEEPALIVE_SECONDS    how long an idle connection is kept           (default 30)
+
+Every request is traced, so stats() reports how many requests reused a pooled connection, how
+many had to open (and TLS-handshake) a new one and how many never got a connection.
+
+The async HTTP client binds its connections to the event loop that first uses it: scripts create
+their async clients inside one asyncio.run().
+
+Framework clients share the same pools: LangChain ChatOpenAI(http_client=registry.http_client(),
+http_async_client=registry.async_http_client()), LlamaIndex OpenAI / OpenAIEmbedding(http_client=...,
+async_http_client=...) and Microsoft Agent Framework OpenAIChatClient(async_client=async_openai_client()).
+CrewAI (LiteLLM) and Google ADK (Gemini) open their own connections and are not counted here.
+
+Usage (scripts add framework-comparisons/ to sys.path):
+    from llm_clients import openai_client, async_openai_client, format_pool_stats
+"""
+
+import os
+import threading
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_KEEPALIVE_SECONDS = 30.0
+
+
+class PoolStats:
+    """Requests vs. new connections of one HTTP client (fed by httpcore trace events).
+
+    A request counts as reused once its headers went out on a connection it did not open itself;
+    requests that never got a connection (refused, timed out) count as neither.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.sent = 0
+        self.reused = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self._lock = threading.Lock()
+
+    def _tracer(self):
+        """Trace callback for one request: remembers whether that request opened a connection."""
+        opened = []
+
+        def trace(event_name: str, info: dict):
+            if event_name == "connection.connect_tcp.complete":
+                opened.append(True)
+                with self._lock:
+                    self.connections += 1
+            elif event_name == "connection.start_tls.complete":
+                with self._lock:
+                    self.tls_handshakes += 1
+            elif event_name.endswith(".send_request_headers.complete"):
+                with self._lock:
+                    self.sent += 1
+                    self.reused += not opened
+        return trace
+
+    def on_request(self, request):
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._tracer()
+
+    async def aon_request(self, request):
+        # httpx's async transport only accepts a coroutine function as the trace callback
+        with self._lock:
+            self.requests += 1
+        trace = self._tracer()
+
+        async def atrace(event_name: str, info: dict):
+            trace(event_name, info)
+        request.extensions["trace"] = atrace
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            requests, sent, reused = self.requests, self.sent, self.reused
+            connections, handshakes = self.connections, self.tls_handshakes
+        return {
+            "requests": requests,
+            "failed": requests - sent,
+            "connections": connections,
+            "tls_handshakes": handshakes,
+            "reused": reused,
+            "reuse_ratio": reused / requests if requests else 0.0,
+        }
+
+
+class LLMClientRegistry:
+    """Process-wide OpenAI clients keyed by (api_key, base_url), on shared pooled HTTP clients."""
+
+    def __init__(self, max_connections: int = None, max_keepalive: int = None, keepalive_seconds: float = None):
+        self.max_connections = max_connections or int(os.getenv("LLM_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+        self.max_keepalive = max_keepalive or int(os.getenv("LLM_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE))
+        self.keepalive_seconds = keepalive_seconds or float(os.getenv("LLM_KEEPALIVE_SECONDS",
+                                                                      DEFAULT_KEEPALIVE_SECONDS))
+        self.sync_stats = PoolStats()
+        self.async_stats = PoolStats()
+        self._http = None
+        self._async_http = None
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _limits(self):
+        import httpx
+        return httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_keepalive,
+                            keepalive_expiry=self.keepalive_seconds)
+
+    def http_client(self):
+        """Shared pooled httpx.Client (also for SDKs that accept one, e.g. OpenAIEmbeddings(http_client=...))."""
+        with self._lock:
+            if self._http is None:
+                import httpx
+                self._http = httpx.Client(limits=self._limits(), timeout=httpx.Timeout(60.0, connect=10.0),
+                                          event_hooks={"request": [self.sync_stats.on_request]})
+            return self._http
+
+    def async_http_client(self):
+        """Shared pooled httpx.AsyncClient."""
+        with self._lock:
+            if self._async_http is None:
+                import httpx
+                self._async_http = httpx.AsyncClient(limits=self._limits(), timeout=httpx.Timeout(60.0, connect=10.0),
+                                                     event_hooks={"request": [self.async_stats.aon_request]})
+            return self._async_http
+
+    def openai(self, api_key: str = None, base_url: str = None):
+        """Shared OpenAI client (api_key defaults to OPENAI_API_KEY)."""
+        key = ("sync", api_key or os.getenv("OPENAI_API_KEY"), base_url)
+        with self._lock:
+            client = self._clients.get(key)
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI(api_key=key[1], base_url=base_url, http_client=self.http_client())
+            with self._lock:
+                client = self._clients.setdefault(key, client)
+        return client
+
+    def async_openai(self, api_key: str = None, base_url: str = None):
+        """Shared AsyncOpenAI client (api_key defaults to OPENAI_API_KEY)."""
+        key = ("async", api_key or os.getenv("OPENAI_API_KEY"), base_url)
+        with self._lock:
+            client = self._clients.get(key)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=key[1], base_url=base_url, http_client=self.async_http_client())
+            with self._lock:
+                client = self._clients.setdefault(key, client)
+        return client
+
+    def stats(self) -> dict:
+        return {"sync": self.sync_stats.snapshot(), "async": self.async_stats.snapshot()}
+
+
+registry = LLMClientRegistry()
+
+
+def openai_client(api_key: str = None, base_url: str = None):
+    return registry.openai(api_key, base_url)
+
+
+def async_openai_client(api_key: str = None, base_url: str = None):
+    return registry.async_openai(api_key, base_url)
+
+
+def format_pool_stats(stats: dict = None) -> str:
+    """One line per client that sent requests: requests, new connections, reuse ratio."""
+    stats = stats or registry.stats()
+    lines = [
+        f"   {name:<6} {s['requests']} requests, {s['connections']} connections opened "
+        f"({s['tls_handshakes']} TLS handshakes), {s['reuse_ratio']:.0%} reused a pooled connection"
+        + (f", {s['failed']} failed" if s["failed"] else "")
+        for name, s in stats.items() if s["requests"]
+    ]
+    return "\n".join(lines) or "   no LLM requests"
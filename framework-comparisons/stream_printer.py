@@ -0,0 +1,33 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Shared Stream Printer for the Framework Examples
+Prints an agent's streamed tokens as they arrive and reports time to first token, so every
+framework's streaming is measured the same way.
+
+Usage (scripts add framework-comparisons/ to sys.path):
+    from stream_printer import StreamPrinter
+"""
+
+import time
+
+
+class StreamPrinter:
+    """Prints streamed tokens as they arrive and records time to first token."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_token_ms = None
+
+    def __call__(self, token: str):
+        if not token:
+            return
+        if self.first_token_ms is None:
+            self.first_token_ms = (time.perf_counter() - self.start) * 1000
+            print("\nResponse: ", end="")
+        print(token, end="", flush=True)
+
+    def report(self) -> str:
+        total_ms = (time.perf_counter() - self.start) * 1000
+        first_token_ms = self.first_token_ms if self.first_token_ms is not None else total_ms
+        return f"⏱️  Time to first token: {first_token_ms:.0f} ms, total: {total_ms:.0f} ms"
@@ -0,0 +1,28 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+"""
+Shared setup for the tests of the helpers in framework-comparisons/ (no network, no API key).
+
+Run from framework-comparisons:
+    python -m pytest tests
+"""
+
+import os
+import sys
+import pytest
+import tiktoken
+
+# The shared helpers are flat modules in framework-comparisons/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+class WordEncoding:
+    """Offline stand-in for the model's tiktoken encoding: one token per word."""
+
+    def encode_ordinary(self, text: str) -> list:
+        return text.split()
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch):
+    monkeypatch.setattr(tiktoken, "encoding_for_model", lambda model: WordEncoding())
@@ -0,0 +1,129 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import time
+from types import SimpleNamespace
+import pytest
+from autogpt_agent import AutoGPTAgent
+
+
+class Commands:
+    """Command registry with a fast and a slow command."""
+
+    def execute_command(self, command_name: str, **kwargs) -> str:
+        if command_name == "slow":
+            time.sleep(0.5)
+        return f"{command_name} done"
+
+    def get_commands_schema(self) -> list:
+        return []
+
+
+class FakeStream:
+    def __init__(self, chunks: list, delay: float):
+        self.chunks = chunks
+        self.delay = delay
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+    def __iter__(self):
+        for i, chunk in enumerate(self.chunks):
+            if i:
+                time.sleep(self.delay)
+            yield chunk
+
+
+class FakeCompletions:
+    """Returns (or raises) the scripted responses in order and records the requests."""
+
+    def __init__(self, script: list):
+        self.script = script
+        self.requests = []
+
+    def create(self, **request):
+        self.requests.append(request)
+        response = self.script.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def answer(content: str):
+    message = SimpleNamespace(content=content, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def calls(*names: str):
+    tool_calls = [SimpleNamespace(id=f"call-{i}", function=SimpleNamespace(name=name, arguments="{}"))
+                  for i, name in enumerate(names)]
+    message = SimpleNamespace(content=None, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_agent(script: list, **options) -> AutoGPTAgent:
+    agent = AutoGPTAgent("test-key", "You are helpful.", Commands(), **options)
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(script)))
+    return agent
+
+
+def test_answer_after_tool_calls():
+    agent = make_agent([calls("fast", "fast"), answer("All done.")])
+    assert agent.chat("go") == "All done."
+    assert agent.stop_reason == "answered"
+    assert [m["role"] for m in agent.history.messages()] == ["system", "user", "assistant", "tool", "tool",
+                                                            "assistant"]
+
+
+def test_forced_answer_on_the_last_step_reports_max_steps():
+    agent = make_agent([calls("fast"), answer("Best effort.")], max_steps=2)
+    assert agent.chat("go") == "Best effort."
+    assert agent.stop_reason == "max_steps"
+    assert [r["tool_choice"] for r in agent.client.chat.completions.requests] == ["auto", "none"]
+
+
+def test_failed_step_drops_the_turn():
+    agent = make_agent([answer("Hi."), calls("fast"), RuntimeError("API down")])
+    agent.chat("hello")
+    with pytest.raises(RuntimeError):
+        agent.chat("go")
+    # No assistant tool call is left without its results
+    assert [m["role"] for m in agent.history.messages()] == ["system", "user", "assistant"]
+
+
+def content_chunk(text: str):
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=text, tool_calls=None))])
+
+
+def test_deadline_cuts_off_a_stream():
+    stream = FakeStream([content_chunk("Hello"), content_chunk(" world")], delay=0.2)
+    agent = make_agent([stream], deadline_seconds=0.1)
+    tokens = []
+    response = agent.chat("go", on_token=tokens.append)
+    assert tokens == ["Hello"]
+    assert stream.closed
+    assert agent.stop_reason == "deadline"
+    assert response.startswith("Stopped after 1 steps (deadline)")
+
+
+def test_tools_running_at_the_deadline_get_a_timeout_result():
+    agent = make_agent([calls("fast", "slow")], deadline_seconds=0.2)
+    agent.chat("go")
+    assert agent.stop_reason == "deadline"
+    results = [m["content"] for m in agent.history.messages() if m["role"] == "tool"]
+    assert results == ["fast done", "slow did not finish before the deadline"]
+
+
+def test_only_the_answer_step_streams():
+    call = SimpleNamespace(index=0, id="call-0", function=SimpleNamespace(name="fast", arguments="{}"))
+    tool_step = FakeStream([SimpleNamespace(usage=None, choices=[SimpleNamespace(
+                               delta=SimpleNamespace(content=None, tool_calls=[call]))]),
+                           content_chunk("Checking now.")], delay=0)
+    answer_step = FakeStream([content_chunk("Sunny"), content_chunk(" today.")], delay=0)
+    agent = make_agent([tool_step, answer_step])
+    tokens = []
+    assert agent.chat("go", on_token=tokens.append) == "Sunny today."
+    assert tokens == ["Sunny", " today."]
@@ -0,0 +1,79 @@
+# Muneeb Ahmad | https://github.com/muneebsa/agentic-frameworks-lab | MIT License | Educational purposes only
+
+import pytest
+from conversation_window import ConversationWindow, MESSAGE_OVERHEAD_TOKENS, render_messages
+
+
+def make_window(budget: int, calls: list) -> ConversationWindow:
+    def summarize(summary: str, evicted: list) -> str:
+        calls.append(render_messages(evicted))
+        return (summary + " " + render_messages(evicted)).strip()
+    return ConversationWindow("You are helpful.", summarize, "gpt-4o-mini", token_budget=budget)
+
+
+def test_turns_within_budget_are_kept():
+    calls = []
+    window = make_window(100, calls)
+    window.start_turn("hello there")
+    window.append({"role": "assistant", "content": "hi"})
+    window.start_turn("weather in Miami")
+    assert window.tokens == 2 + 1 + 3 + 3 * MESSAGE_OVERHEAD_TOKENS
+    assert calls == []
+    assert [m["role"] for m in window.messages()] == ["system", "user", "assistant", "user"]
+
+
+def test_oldest_turns_are_folded_into_the_summary_when_over_budget():
+    calls = []
+    window = make_window(20, calls)
+    window.start_turn("one two three four")
+    window.append({"role": "assistant", "content": "five six seven eight"})
+    window.start_turn("nine ten eleven twelve")  # 3 x (4 words + 4 overhead) = 24 > 20
+    assert window.folded_turns == 1
+    assert window.tokens == 8 <= window.token_budget
+    assert calls == ["user: one two three four\nassistant: five six seven eight"]
+    system = window.messages()[0]["content"]
+    assert "Summary of the earlier conversation" in system and "five six seven eight" in system
+
+
+def test_the_current_turn_is_never_evicted():
+    calls = []
+    window = make_window(5, calls)
+    window.start_turn("a very long question that exceeds the budget on its own")
+    assert window.folded_turns == 0 and len(window.turns) == 1
+    assert calls == []
+
+
+def test_tool_calls_stay_with_their_turn():
+    window = make_window(1000, [])
+    window.start_turn("weather in Seattle")
+    call = {"id": "c1", "function": {"name": "get_weather", "arguments": '{"city": "Seattle"}'}}
+    window.append({"role": "assistant", "content": None, "tool_calls": [call]})
+    window.append({"role": "tool", "tool_call_id": "c1", "content": "58F Rainy"})
+    assert len(window.turns) == 1 and len(window.turns[0]) == 3
+    assert window.count(window.turns[0][1]) == 2 + MESSAGE_OVERHEAD_TOKENS  # get_weather{"city": "Seattle"}
+
+
+def test_tool_results_over_budget_fold_older_turns():
+    calls = []
+    window = make_window(30, calls)
+    window.start_turn("weather in Miami")
+    window.append({"role": "assistant", "content": "85F Sunny"})
+    window.start_turn("weather in Seattle")
+    window.append({"role": "tool", "tool_call_id": "c1", "content": " ".join(["rain"] * 20)})
+    assert window.folded_turns == 1 and len(window.turns) == 1
+    assert calls == ["user: weather in Miami\nassistant: 85F Sunny"]
+
+
+def test_failed_summary_keeps_the_turns():
+    def summarize(summary: str, evicted: list) -> str:
+        raise RuntimeError("summary request failed")
+    window = ConversationWindow("You are helpful.", summarize, "gpt-4o-mini", token_budget=20)
+    window.start_turn("weather in Miami")
+    window.append({"role": "assistant", "content": "85F Sunny"})
+    tokens = window.tokens
+    with pytest.raises(RuntimeError):
+        window.start_turn("weather in Seattle and anywhere else along the coast")
+    assert len(window.turns) == 2 and window.folded_turns == 0
+    assert window.turns[0][0]["content"] == "weather in Miami"
+    window.discard_turn()
+    assert window.tokens == tokens